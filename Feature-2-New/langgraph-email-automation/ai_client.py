@@ -0,0 +1,467 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Async AI Classification Client
+Keep-alive, concurrency-limited Groq client for classifying many emails at once
+"""
+
+import json
+import time
+import asyncio
+import threading
+from typing import Dict, List, Optional
+
+import httpx
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+
+GROQ_CHAT_URL = "https://api.groq.com/openai/v1/chat/completions"
+GEMINI_URL = "https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+
+VALID_CATEGORIES = {'security', 'access', 'hardware', 'software', 'network', 'general'}
+VALID_PRIORITIES = {'high', 'medium', 'low'}
+VALID_ROUTES = {
+    'SOFTWARE_SECURITY_OFFICER', 'IT_HELPDESK_MANAGER', 'HR_COORDINATOR',
+    'PROCUREMENT_OFFICER', 'NETWORK_ADMIN'
+}
+
+SYSTEM_PROMPT = "You are an expert IT ticket analyzer. Respond only with valid JSON."
+
+
+def build_classification_prompt(email_data: Dict) -> str:
+    """Prompt asking the model to categorise a single email"""
+    return f"""
+            Analyze this IT support email and provide structured categorization:
+
+            From: {email_data['sender']}
+            Subject: {email_data['subject']}
+            Body: {email_data['body']}
+
+            Classify this email and respond with ONLY valid JSON:
+            {{
+                "category": "security|access|hardware|software|network|general",
+                "priority": "high|medium|low",
+                "route_to": "SOFTWARE_SECURITY_OFFICER|IT_HELPDESK_MANAGER|HR_COORDINATOR|PROCUREMENT_OFFICER|NETWORK_ADMIN",
+                "issue_type": "brief description of the issue",
+                "urgency_reason": "explanation for priority level"
+            }}
+
+            Routing Rules:
+            - Security issues, password resets → SOFTWARE_SECURITY_OFFICER (HIGH)
+            - New employee setup, departures → HR_COORDINATOR (MEDIUM)
+            - Hardware problems, software issues → IT_HELPDESK_MANAGER (MEDIUM/HIGH)
+            - Network/VPN problems → NETWORK_ADMIN (HIGH)
+            - Software purchases, licenses → PROCUREMENT_OFFICER (LOW)
+            """
+
+
+def build_batch_classification_prompt(emails: List[Dict], ids: List[str], max_body_chars: int) -> str:
+    """Prompt asking the model to categorise several emails in one answer"""
+    blocks = []
+    for email_id, email_data in zip(ids, emails):
+        body = email_data['body'][:max_body_chars]
+        blocks.append(
+            f"[{email_id}]\nFrom: {email_data['sender']}\nSubject: {email_data['subject']}\nBody: {body}"
+        )
+    joined = "\n\n".join(blocks)
+    return f"""
+            Analyze each of these IT support emails and provide structured categorization.
+
+            {joined}
+
+            Respond with ONLY a valid JSON array containing one object per email, in any order:
+            [
+                {{
+                    "id": "the email id in square brackets above",
+                    "category": "security|access|hardware|software|network|general",
+                    "priority": "high|medium|low",
+                    "route_to": "SOFTWARE_SECURITY_OFFICER|IT_HELPDESK_MANAGER|HR_COORDINATOR|PROCUREMENT_OFFICER|NETWORK_ADMIN",
+                    "issue_type": "brief description of the issue",
+                    "urgency_reason": "explanation for priority level"
+                }}
+            ]
+
+            Routing Rules:
+            - Security issues, password resets → SOFTWARE_SECURITY_OFFICER (HIGH)
+            - New employee setup, departures → HR_COORDINATOR (MEDIUM)
+            - Hardware problems, software issues → IT_HELPDESK_MANAGER (MEDIUM/HIGH)
+            - Network/VPN problems → NETWORK_ADMIN (HIGH)
+            - Software purchases, licenses → PROCUREMENT_OFFICER (LOW)
+            """
+
+
+def strip_code_fence(ai_response: str) -> str:
+    """Remove ```json fences the model sometimes wraps around its answer"""
+    ai_response = ai_response.strip()
+    if ai_response.startswith("```json"):
+        ai_response = ai_response[7:-3]
+    elif ai_response.startswith("```"):
+        ai_response = ai_response[3:-3]
+    return ai_response.strip()
+
+
+def validate_analysis(analysis) -> Optional[Dict]:
+    """Return a normalised analysis dict, or None if the model's answer is unusable"""
+    if not isinstance(analysis, dict):
+        return None
+    category = str(analysis.get('category', '')).lower()
+    priority = str(analysis.get('priority', '')).lower()
+    route_to = str(analysis.get('route_to', '')).upper()
+    if category not in VALID_CATEGORIES or priority not in VALID_PRIORITIES or route_to not in VALID_ROUTES:
+        return None
+    return {
+        'category': category,
+        'priority': priority,
+        'route_to': route_to,
+        'issue_type': analysis.get('issue_type') or 'IT support request',
+        'urgency_reason': analysis.get('urgency_reason') or 'Classified by AI'
+    }
+
+
+class AsyncClassificationClient:
+    """Async Groq client with a shared keep-alive pool, a concurrency cap and per-request deadlines
+
+    The client owns a private event loop on a daemon thread so synchronous callers
+    (the ingest pipeline, the CLI loop) can use it without an event loop of their own,
+    and the connection pool survives between cycles.
+    """
+
+    def __init__(self, api_key: str, model: str = "llama-3.1-70b-versatile",
+                 max_concurrency: int = 8, max_connections: int = 16,
+                 request_timeout: float = 15.0, request_deadline: float = 20.0,
+                 batch_size: int = 1, batch_max_tokens: int = 2000,
+                 tokens_per_item: int = 150, batch_body_chars: int = 1500,
+                 secondary_api_key: Optional[str] = None, secondary_model: str = "gemini-1.5-flash",
+                 hedge_enabled: bool = False, hedge_percentile: float = 95.0,
+                 hedge_min_delay: float = 1.0, hedge_default_delay: float = 3.0,
+                 breaker_options: Optional[Dict] = None):
+        self.api_key = api_key
+        self.model = model
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_connections = max(self.max_concurrency, max_connections)
+        self.request_timeout = request_timeout
+        self.request_deadline = request_deadline
+
+        # Batched mode: K emails per prompt, K capped so the answer fits the token budget
+        self.batch_max_tokens = batch_max_tokens
+        self.tokens_per_item = max(1, tokens_per_item)
+        self.batch_size = max(1, min(batch_size, batch_max_tokens // self.tokens_per_item))
+        self.batch_body_chars = batch_body_chars
+
+        # Secondary provider (Google Gemini) used for hedging and while Groq's circuit is open
+        self.secondary_api_key = secondary_api_key
+        self.secondary_model = secondary_model
+        self.hedge_enabled = hedge_enabled and bool(secondary_api_key)
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_delay = hedge_min_delay
+        self.hedge_default_delay = hedge_default_delay
+        self.breaker = CircuitBreaker('groq', **(breaker_options or {}))
+        self.secondary_breaker = CircuitBreaker('gemini', **(breaker_options or {}))
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            'requests': 0,
+            'successes': 0,
+            'failures': 0,
+            'deadline_exceeded': 0,
+            'batch_requests': 0,
+            'batch_items': 0,
+            'batch_item_failures': 0,
+            'circuit_rejections': 0,
+            'hedged_requests': 0,
+            'hedge_wins': 0,
+            'secondary_requests': 0,
+            'in_flight': 0,
+            'avg_latency_ms': None
+        }
+
+    # ------------------------------------------------------------------
+    # Event loop plumbing
+    # ------------------------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop and self._thread and self._thread.is_alive():
+                return self._loop
+            self._loop = asyncio.new_event_loop()
+            ready = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(self._loop)
+                self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                self._client = httpx.AsyncClient(
+                    timeout=self.request_timeout,
+                    limits=httpx.Limits(
+                        max_connections=self.max_connections,
+                        max_keepalive_connections=self.max_connections
+                    ),
+                    headers={"Content-Type": "application/json"}
+                )
+                ready.set()
+                self._loop.run_forever()
+
+            self._thread = threading.Thread(target=_run, name='ai-client-loop', daemon=True)
+            self._thread.start()
+            ready.wait()
+            return self._loop
+
+    def run(self, coro, timeout: Optional[float] = None):
+        """Run a coroutine on the client's loop from synchronous code"""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+    def close(self):
+        """Close pooled connections and stop the loop thread"""
+        with self._start_lock:
+            loop, self._loop = self._loop, None
+            client, self._client = self._client, None
+            thread = self._thread
+        if not loop:
+            return
+        if client:
+            try:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(5)
+            except Exception as e:
+                print(f"⚠️ Could not close AI client connections: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread and thread is not threading.current_thread():
+            thread.join(5)
+            if not thread.is_alive():
+                loop.close()
+
+    def _record(self, key: str, latency_ms: Optional[float] = None):
+        with self._stats_lock:
+            self.stats[key] += 1
+            if latency_ms is not None:
+                previous = self.stats['avg_latency_ms']
+                self.stats['avg_latency_ms'] = round(
+                    latency_ms if previous is None else previous * 0.8 + latency_ms * 0.2, 1
+                )
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    async def _post_groq(self, prompt: str, max_tokens: int) -> str:
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.1,
+            "max_tokens": max_tokens
+        }
+        response = await self._client.post(
+            GROQ_CHAT_URL, json=payload, headers={"Authorization": f"Bearer {self.api_key}"}
+        )
+        response.raise_for_status()
+        return response.json()["choices"][0]["message"]["content"]
+
+    async def _post_gemini(self, prompt: str, max_tokens: int) -> str:
+        payload = {
+            "contents": [{"parts": [{"text": f"{SYSTEM_PROMPT}\n\n{prompt}"}]}],
+            "generationConfig": {"temperature": 0.1, "maxOutputTokens": max_tokens}
+        }
+        response = await self._client.post(
+            GEMINI_URL.format(model=self.secondary_model),
+            json=payload,
+            params={"key": self.secondary_api_key}
+        )
+        response.raise_for_status()
+        return response.json()["candidates"][0]["content"]["parts"][0]["text"]
+
+    async def _call_provider(self, provider: str, prompt: str, max_tokens: int,
+                             in_flight: Optional[Dict[str, float]] = None) -> str:
+        """One provider call under the concurrency cap, reported to that provider's breaker
+
+        While the request is out it is listed in `in_flight`, so if the caller's deadline
+        cancels it the failure can be charged to this provider rather than another.
+        """
+        breaker = self.breaker if provider == 'groq' else self.secondary_breaker
+        send = self._post_groq if provider == 'groq' else self._post_gemini
+        started = time.perf_counter()
+        try:
+            async with self._semaphore:
+                with self._stats_lock:
+                    self.stats['in_flight'] += 1
+                if in_flight is not None:
+                    # Listed once actually sent (waiting for the semaphore is our congestion, not theirs)
+                    in_flight[provider] = time.perf_counter()
+                try:
+                    content = await send(prompt, max_tokens)
+                except Exception:
+                    # Reported below; a cancelled request (CancelledError) stays listed for the caller
+                    if in_flight is not None:
+                        in_flight.pop(provider, None)
+                    raise
+                finally:
+                    with self._stats_lock:
+                        self.stats['in_flight'] -= 1
+                if in_flight is not None:
+                    in_flight.pop(provider, None)
+        except asyncio.CancelledError:
+            # Lost a hedge race - not the provider's fault
+            breaker.release_probe()
+            raise
+        except Exception:
+            breaker.record_failure((time.perf_counter() - started) * 1000)
+            raise
+        breaker.record_success((time.perf_counter() - started) * 1000)
+        return content
+
+    def _hedge_delay(self) -> float:
+        """Wait this long for the primary before racing the secondary (recent pXX latency)"""
+        percentile_ms = self.breaker.latency_percentile(self.hedge_percentile)
+        if percentile_ms is None:
+            return self.hedge_default_delay
+        return max(self.hedge_min_delay, percentile_ms / 1000)
+
+    async def _hedged(self, prompt: str, max_tokens: int, in_flight: Optional[Dict[str, float]] = None) -> str:
+        """Primary call, plus a secondary call if the primary runs past the tail-latency threshold"""
+        primary = asyncio.ensure_future(self._call_provider('groq', prompt, max_tokens, in_flight))
+        tasks = [primary]
+        try:
+            if not self.hedge_enabled:
+                return await primary
+
+            done, _ = await asyncio.wait({primary}, timeout=self._hedge_delay())
+            if done or not self.secondary_breaker.allow_request():
+                return await primary
+
+            self._record('hedged_requests')
+            secondary = asyncio.ensure_future(self._call_provider('gemini', prompt, max_tokens, in_flight))
+            tasks.append(secondary)
+            pending = {primary, secondary}
+            last_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is secondary:
+                            self._record('hedge_wins')
+                        return task.result()
+                    last_error = task.exception()
+            raise last_error
+        finally:
+            # Cancel the loser (or everything, if the request deadline fired)
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def chat(self, prompt: str, max_tokens: int = 300) -> str:
+        """One chat completion, bounded by the circuit breakers, concurrency cap and request deadline"""
+        # Providers whose request is still out; a blown deadline is charged to them only
+        in_flight: Dict[str, float] = {}
+        if self.breaker.allow_request():
+            call = self._hedged(prompt, max_tokens, in_flight)
+        elif self.secondary_api_key and self.secondary_breaker.allow_request():
+            # Primary circuit open: go straight to the secondary provider
+            self._record('secondary_requests')
+            call = self._call_provider('gemini', prompt, max_tokens, in_flight)
+        else:
+            self._record('circuit_rejections')
+            raise CircuitOpenError("AI provider circuit open - using fallback classifier")
+
+        self._record('requests')
+        started = time.perf_counter()
+        try:
+            content = await asyncio.wait_for(call, timeout=self.request_deadline)
+        except asyncio.TimeoutError:
+            # The cancelled calls didn't report themselves, so count the blown deadline here,
+            # against whichever provider(s) actually had a request outstanding
+            now = time.perf_counter()
+            for provider, sent_at in list(in_flight.items()):
+                breaker = self.breaker if provider == 'groq' else self.secondary_breaker
+                breaker.record_failure((now - sent_at) * 1000)
+            self._record('deadline_exceeded')
+            self._record('failures')
+            raise
+        except Exception:
+            self._record('failures')
+            raise
+        self._record('successes', (time.perf_counter() - started) * 1000)
+        return content
+
+    async def classify(self, email_data: Dict) -> Optional[Dict]:
+        """Classify one email; None if the call failed or the answer was unusable"""
+        try:
+            content = await self.chat(build_classification_prompt(email_data))
+            return validate_analysis(json.loads(strip_code_fence(content)))
+        except CircuitOpenError:
+            return None
+        except Exception as e:
+            print(f"❌ AI analysis failed: {e}")
+            return None
+
+    async def classify_batch(self, emails: List[Dict]) -> List[Optional[Dict]]:
+        """Classify K emails with one prompt; entries that fail validation are retried one at a time"""
+        if len(emails) == 1:
+            return [await self.classify(emails[0])]
+
+        ids = [f"email-{index + 1}" for index in range(len(emails))]
+        results: Dict[str, Dict] = {}
+        self._record('batch_requests')
+        try:
+            content = await self.chat(
+                build_batch_classification_prompt(emails, ids, self.batch_body_chars),
+                max_tokens=min(self.batch_max_tokens, self.tokens_per_item * len(emails) + 50)
+            )
+            parsed = json.loads(strip_code_fence(content))
+            if isinstance(parsed, dict):
+                parsed = parsed.get('results', [])
+            for entry in parsed if isinstance(parsed, list) else []:
+                if isinstance(entry, dict) and entry.get('id') in ids:
+                    analysis = validate_analysis(entry)
+                    if analysis:
+                        results[entry['id']] = analysis
+        except CircuitOpenError:
+            # Don't retry item by item against an open circuit
+            return [None] * len(emails)
+        except Exception as e:
+            print(f"❌ Batched AI analysis failed: {e}")
+
+        with self._stats_lock:
+            self.stats['batch_items'] += len(emails)
+            self.stats['batch_item_failures'] += len(emails) - len(results)
+
+        # Re-classify only the missing/invalid entries individually
+        failed = [index for index, email_id in enumerate(ids) if email_id not in results]
+        retried = await asyncio.gather(*(self.classify(emails[index]) for index in failed))
+        retried_by_index = dict(zip(failed, retried))
+        return [results.get(email_id, retried_by_index.get(index)) for index, email_id in enumerate(ids)]
+
+    async def classify_all(self, emails: List[Dict]) -> List[Optional[Dict]]:
+        """Classify many emails concurrently (results in input order)"""
+        if self.batch_size <= 1:
+            return list(await asyncio.gather(*(self.classify(email_data) for email_data in emails)))
+
+        groups = [emails[i:i + self.batch_size] for i in range(0, len(emails), self.batch_size)]
+        grouped = await asyncio.gather(*(self.classify_batch(group) for group in groups))
+        return [analysis for group in grouped for analysis in group]
+
+    def classify_many(self, emails: List[Dict]) -> List[Optional[Dict]]:
+        """Synchronous entry point: a batch of N costs about one LLM latency"""
+        if not emails:
+            return []
+        return self.run(self.classify_all(emails))
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        stats.update({
+            'max_concurrency': self.max_concurrency,
+            'max_connections': self.max_connections,
+            'request_deadline_s': self.request_deadline,
+            'batch_size': self.batch_size,
+            'batch_max_tokens': self.batch_max_tokens,
+            'hedging': self.hedge_enabled,
+            'circuit': self.breaker.get_status(),
+            'secondary_circuit': self.secondary_breaker.get_status() if self.secondary_api_key else None
+        })
+        return stats
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Backlog Drainer
+Works through the whole unprocessed set in oldest-first chunks under a per-cycle time budget
+"""
+
+import time
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+# finish(remaining_seconds) -> (results, UIDs still in flight per backlog key)
+Finish = Callable[[float], Tuple[List[Dict], Dict[Optional[str], List[int]]]]
+
+
+class ChunkNotAccepted(Exception):
+    """Raised by process_chunk when the pipeline stayed full for the rest of the budget; the chunk stays queued"""
+
+
+class BacklogDrainer:
+    """Chunked, time-budgeted draining of the new-mail backlog"""
+
+    def __init__(self, chunk_size: int = 25, cycle_budget_seconds: float = 20.0):
+        self.chunk_size = max(1, chunk_size)
+        self.cycle_budget_seconds = cycle_budget_seconds
+
+        self._lock = threading.Lock()
+        self.queue_depth = 0
+        self.queue_depths: Dict[Optional[str], int] = {}
+        # Submitted UIDs a pipeline had not finished when the budget ran out (still being worked on)
+        self.carry_over: Dict[Optional[str], List[int]] = {}
+        self.throughput_per_sec: Optional[float] = None
+        self.stats = {
+            'cycles': 0,
+            'chunks_processed': 0,
+            'messages_processed': 0,
+            'budget_exhausted_cycles': 0,
+            'carried_over': 0,
+            'last_cycle_at': None,
+            'last_cycle_seconds': None
+        }
+
+    def _record_chunk(self, count: int, seconds: float):
+        if count <= 0 or seconds <= 0:
+            return
+        rate = count / seconds
+        with self._lock:
+            # EWMA so the drain estimate follows current LLM/SMTP speed
+            self.throughput_per_sec = rate if self.throughput_per_sec is None else (
+                self.throughput_per_sec * 0.7 + rate * 0.3
+            )
+            self.stats['chunks_processed'] += 1
+            self.stats['messages_processed'] += count
+
+    def drain(self, find_backlog: Callable[[], List[int]],
+              process_chunk: Callable[[List[int]], List[Dict]],
+              finish: Optional[Finish] = None) -> List[Dict]:
+        """Process backlog chunks, oldest first, until it is empty or the budget is spent
+
+        With `finish`, process_chunk only hands chunks to a pipeline (returning nothing) and
+        finish(remaining_seconds) waits at most the rest of the budget for their results, returning
+        (results, unfinished UIDs per key). Unfinished UIDs are carried over: they count towards the
+        queue depth and are left out of the next cycle's backlog while the pipeline still owns them.
+        """
+        return self.drain_many(
+            lambda: {None: find_backlog()},
+            lambda _, chunk: process_chunk(chunk),
+            finish=finish
+        )
+
+    def _set_depths(self, unsubmitted: Dict[Optional[str], int]):
+        depths = dict(unsubmitted)
+        for key, uids in self.carry_over.items():
+            depths[key] = depths.get(key, 0) + len(uids)
+        self.queue_depths = depths
+        self.queue_depth = sum(depths.values())
+
+    def drain_many(self, find_backlogs: Callable[[], Dict[Optional[str], List[int]]],
+                   process_chunk: Callable[[Optional[str], List[int]], List[Dict]],
+                   finish: Optional[Finish] = None) -> List[Dict]:
+        """Drain several backlogs (one per mailbox) round-robin, one chunk each per turn,
+        so a mailbox with a deep backlog cannot starve the others of the cycle budget"""
+        started = time.monotonic()
+        with self._lock:
+            carried = {key: set(uids) for key, uids in self.carry_over.items()}
+            carried_before = sum(len(uids) for uids in carried.values())
+        backlogs = {}
+        for key, uids in find_backlogs().items():
+            uids = sorted(uid for uid in uids if uid not in carried.get(key, ()))
+            if uids:
+                backlogs[key] = uids
+        unsubmitted = {key: len(uids) for key, uids in backlogs.items()}
+        with self._lock:
+            self._set_depths(unsubmitted)
+            self.stats['cycles'] += 1
+
+        results: List[Dict] = []
+        submitted = 0
+        budget_spent = False
+        while backlogs:
+            if time.monotonic() - started >= self.cycle_budget_seconds:
+                budget_spent = True
+                break
+
+            key = next(iter(backlogs))
+            backlog = backlogs.pop(key)
+            chunk, backlog = backlog[:self.chunk_size], backlog[self.chunk_size:]
+            if backlog:
+                # Back of the rotation
+                backlogs[key] = backlog
+            chunk_started = time.monotonic()
+            try:
+                results.extend(process_chunk(key, chunk))
+            except ChunkNotAccepted:
+                # Nothing else fits this cycle; the chunk still counts as unsubmitted backlog
+                budget_spent = True
+                break
+            submitted += len(chunk)
+            if finish is None:
+                self._record_chunk(len(chunk), time.monotonic() - chunk_started)
+            unsubmitted[key] = len(backlog)
+            with self._lock:
+                self._set_depths(unsubmitted)
+
+        if finish is not None:
+            # Bounded by what is left of the budget; whatever is still in flight carries over
+            remaining = max(0.0, self.cycle_budget_seconds - (time.monotonic() - started))
+            finished, carry_over = finish(remaining)
+            results.extend(finished)
+            carried_now = sum(len(uids) for uids in carry_over.values())
+            self._record_chunk(submitted + carried_before - carried_now, time.monotonic() - started)
+            with self._lock:
+                self.carry_over = {key: sorted(uids) for key, uids in carry_over.items() if uids}
+                self._set_depths(unsubmitted)
+                self.stats['carried_over'] += carried_now
+            budget_spent = budget_spent or carried_now > 0
+
+        with self._lock:
+            if budget_spent:
+                self.stats['budget_exhausted_cycles'] += 1
+            remaining_emails = self.queue_depth
+            self.stats['last_cycle_at'] = datetime.now().isoformat()
+            self.stats['last_cycle_seconds'] = round(time.monotonic() - started, 2)
+        if budget_spent:
+            print(f"⏳ Cycle budget spent, {remaining_emails} emails left for the next cycle")
+        return results
+
+    def has_backlog(self) -> bool:
+        with self._lock:
+            return self.queue_depth > 0
+
+    def get_status(self) -> Dict:
+        """Queue depth and estimated drain time for the health endpoint"""
+        with self._lock:
+            status = dict(self.stats)
+            estimate = None
+            if self.queue_depth and self.throughput_per_sec:
+                estimate = round(self.queue_depth / self.throughput_per_sec, 1)
+            status.update({
+                'queue_depth': self.queue_depth,
+                'carry_over': sum(len(uids) for uids in self.carry_over.values()),
+                'chunk_size': self.chunk_size,
+                'cycle_budget_seconds': self.cycle_budget_seconds,
+                'throughput_per_sec': round(self.throughput_per_sec, 2) if self.throughput_per_sec else None,
+                'estimated_drain_seconds': 0 if not self.queue_depth else estimate
+            })
+            by_mailbox = {key: depth for key, depth in self.queue_depths.items() if key is not None}
+            if by_mailbox:
+                status['queue_depth_by_mailbox'] = by_mailbox
+        return status
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Circuit Breaker
+Rolling error-rate / slow-call breaker so a failing AI provider is skipped immediately
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a provider whose circuit is open"""
+
+
+class CircuitBreaker:
+    """Closed → open on high error/slow-call rate → half-open probe → closed"""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, window_size: int = 20, min_calls: int = 5,
+                 failure_rate_threshold: float = 0.5, slow_call_ms: float = 8000.0,
+                 slow_call_rate_threshold: float = 0.8, open_seconds: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_ms = slow_call_ms
+        self.slow_call_rate_threshold = slow_call_rate_threshold
+        self.open_seconds = open_seconds
+        self.half_open_max_calls = half_open_max_calls
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        self._half_open_in_flight = 0
+        # (succeeded, latency_ms) for the last window_size calls
+        self._window: deque = deque(maxlen=window_size)
+        self._latencies: deque = deque(maxlen=200)
+        self.stats = {
+            'opened': 0,
+            'rejected': 0,
+            'probes': 0
+        }
+
+    def _current_state(self) -> str:
+        # Called with the lock held
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._state = self.HALF_OPEN
+            self._half_open_in_flight = 0
+        return self._state
+
+    def _trip(self):
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self.stats['opened'] += 1
+        print(f"⚡ Circuit '{self.name}' opened - skipping this provider for {self.open_seconds:.0f}s")
+
+    def allow_request(self) -> bool:
+        """True if a call may go out now (half-open admits a limited number of probes)"""
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and self._half_open_in_flight < self.half_open_max_calls:
+                self._half_open_in_flight += 1
+                self.stats['probes'] += 1
+                return True
+            self.stats['rejected'] += 1
+            return False
+
+    def record_success(self, latency_ms: float):
+        with self._lock:
+            self._latencies.append(latency_ms)
+            if self._current_state() == self.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                if latency_ms < self.slow_call_ms:
+                    self._state = self.CLOSED
+                    self._window.clear()
+                    print(f"✅ Circuit '{self.name}' closed - provider recovered")
+                else:
+                    self._trip()
+                return
+            self._window.append((True, latency_ms))
+            self._evaluate()
+
+    def record_failure(self, latency_ms: Optional[float] = None):
+        with self._lock:
+            if self._current_state() == self.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+                self._trip()
+                return
+            self._window.append((False, latency_ms if latency_ms is not None else self.slow_call_ms))
+            self._evaluate()
+
+    def release_probe(self):
+        """A half-open probe was cancelled before it finished"""
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                self._half_open_in_flight = max(0, self._half_open_in_flight - 1)
+
+    def _evaluate(self):
+        # Called with the lock held
+        if self._state != self.CLOSED or len(self._window) < self.min_calls:
+            return
+        calls = len(self._window)
+        failures = sum(1 for ok, _ in self._window if not ok)
+        slow = sum(1 for _, latency in self._window if latency >= self.slow_call_ms)
+        if failures / calls >= self.failure_rate_threshold or slow / calls >= self.slow_call_rate_threshold:
+            self._trip()
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """Recent successful-call latency at the given percentile (None until enough samples)"""
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.min_calls:
+            return None
+        index = min(len(samples) - 1, int(round(percentile / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            state = self._current_state()
+            calls = len(self._window)
+            failures = sum(1 for ok, _ in self._window if not ok)
+            status = dict(self.stats)
+            status.update({
+                'state': state,
+                'window_calls': calls,
+                'failure_rate': round(failures / calls, 3) if calls else None,
+                'open_remaining_s': round(max(0.0, self.open_seconds - (time.monotonic() - self._opened_at)), 1)
+                if state == self.OPEN else 0
+            })
+        p95 = self.latency_percentile(95)
+        status['p95_latency_ms'] = round(p95, 1) if p95 is not None else None
+        return status
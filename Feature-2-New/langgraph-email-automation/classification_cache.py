@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Classification Cache
+Content-hash LRU/TTL cache so near-identical emails cost one model call
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Reply/forward markers: everything after them is quoted history
+_QUOTE_MARKERS = re.compile(
+    r'^(?:on .{0,200}wrote:|-{2,}\s*original message\s*-{2,}|-{2,}\s*forwarded message\s*-{2,}|from:\s.+|sent from my .+)$',
+    re.IGNORECASE
+)
+_SIGNATURE_MARKERS = re.compile(r'^(?:--|__+|regards,?|best regards,?|thanks,?|thank you,?|cheers,?)$', re.IGNORECASE)
+_SUBJECT_PREFIX = re.compile(r'^(?:\s*(?:re|fw|fwd|aw|sv)\s*(?:\[\d+\])?\s*:\s*)+', re.IGNORECASE)
+_NOISE = re.compile(r'[^a-z0-9 ]+')
+_SPACES = re.compile(r'\s+')
+
+
+def normalize_email_text(subject: str, body: str) -> str:
+    """Strip reply prefixes, quoted replies and signatures, then collapse case/punctuation"""
+    subject = _SUBJECT_PREFIX.sub('', subject or '')
+
+    kept = []
+    for line in (body or '').splitlines():
+        stripped = line.strip()
+        if stripped.startswith('>'):
+            continue
+        if _QUOTE_MARKERS.match(stripped) or _SIGNATURE_MARKERS.match(stripped):
+            break
+        kept.append(stripped)
+
+    text = f"{subject} {' '.join(kept)}".lower()
+    text = _NOISE.sub(' ', text)
+    return _SPACES.sub(' ', text).strip()
+
+
+def content_key(email_data: Dict) -> str:
+    """Stable hash of the normalised subject + body"""
+    normalized = normalize_email_text(email_data.get('subject', ''), email_data.get('body', ''))
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class ClassificationCache:
+    """LRU cache with TTL expiry and optional JSON persistence"""
+
+    def __init__(self, max_entries: int = 5000, ttl_seconds: float = 86400.0,
+                 persist_path: Optional[str] = None):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self.persist_path = persist_path
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Serialises snapshot + write so an older snapshot can never replace a newer file
+        self._save_lock = threading.Lock()
+        self._dirty = False
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+
+        if persist_path:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.persist_path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not load classification cache {self.persist_path}: {e}")
+            return
+
+        now = time.time()
+        for key, entry in saved.items():
+            if now - entry.get('stored_at', 0) < self.ttl_seconds:
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        print(f"🗂️ Loaded {len(self._entries)} cached classifications")
+
+    def save(self):
+        """Write the cache to disk (no-op without persist_path or when unchanged)"""
+        if not self.persist_path:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                snapshot = dict(self._entries)
+                self._dirty = False
+            directory = os.path.dirname(self.persist_path) or '.'
+            tmp_path = None
+            try:
+                os.makedirs(directory, exist_ok=True)
+                # Unique temp file in the target directory, so os.replace stays atomic
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory,
+                                                 prefix='.classification_cache.', suffix='.tmp',
+                                                 delete=False) as f:
+                    tmp_path = f.name
+                    json.dump(snapshot, f)
+                os.replace(tmp_path, self.persist_path)
+            except Exception:
+                with self._lock:
+                    self._dirty = True  # Retry on the next save
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+    def get(self, email_data: Dict) -> Optional[Dict]:
+        key = content_key(email_data)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.time() - entry['stored_at'] >= self.ttl_seconds:
+                del self._entries[key]
+                self.stats['expirations'] += 1
+                self._dirty = True
+                entry = None
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return dict(entry['analysis'])
+
+    def put(self, email_data: Dict, analysis: Dict):
+        key = content_key(email_data)
+        with self._lock:
+            self._entries[key] = {'analysis': dict(analysis), 'stored_at': time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats['evictions'] += 1
+            self._dirty = True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            lookups = stats['hits'] + stats['misses']
+            stats.update({
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'hit_rate': round(stats['hits'] / lookups, 3) if lookups else None,
+                'persistent': bool(self.persist_path)
+            })
+        return stats
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Duplicate Detector
+Shingle + MinHash signatures with an LSH index over recent open tickets
+"""
+
+import time
+import zlib
+import random
+import threading
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from classification_cache import normalize_email_text
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def shingles(text: str, size: int = 3) -> Set[int]:
+    """Hashed word n-grams of already-normalised text"""
+    words = text.split()
+    if len(words) < size:
+        return {zlib.crc32(' '.join(words).encode('utf-8'))} if words else set()
+    return {zlib.crc32(' '.join(words[i:i + size]).encode('utf-8')) for i in range(len(words) - size + 1)}
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """Bands x rows whose LSH threshold (1/b)^(1/r) sits closest to the similarity threshold"""
+    options = [(num_perm // rows, rows) for rows in range(1, num_perm + 1) if num_perm % rows == 0]
+    return min(options, key=lambda option: abs((1 / option[0]) ** (1 / option[1]) - threshold))
+
+
+class DuplicateDetector:
+    """Finds an open ticket whose text is near-identical to a new email (Jaccard >= threshold)"""
+
+    def __init__(self, threshold: float = 0.8, window_seconds: float = 7200.0,
+                 num_perm: int = 64, shingle_size: int = 3, body_chars: int = 500, seed: int = 1):
+        self.threshold = threshold
+        self.window_seconds = window_seconds
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.body_chars = body_chars
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+
+        rng = random.Random(seed)
+        self._perms = [(rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+                       for _ in range(num_perm)]
+
+        self._lock = threading.Lock()
+        # band index -> band hash -> keys
+        self._buckets: List[Dict[int, Set[str]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[str, Tuple[int, ...]] = {}
+        # (inserted_at, key) in insertion order, for expiring the window
+        self._inserted: deque = deque()
+        self._inserted_at: Dict[str, float] = {}
+        self.stats = {
+            'checked': 0,
+            'duplicates': 0,
+            'candidates_compared': 0
+        }
+
+    # ------------------------------------------------------------------
+    # Signatures
+    # ------------------------------------------------------------------
+
+    def signature(self, subject: str, body: str) -> Optional[Tuple[int, ...]]:
+        text = normalize_email_text(subject, (body or '')[:self.body_chars])
+        hashed = shingles(text, self.shingle_size)
+        if not hashed:
+            return None
+        return tuple(
+            min(((a * value + b) % _MERSENNE_PRIME) & _MAX_HASH for value in hashed)
+            for a, b in self._perms
+        )
+
+    def _band_keys(self, signature: Tuple[int, ...]):
+        for band in range(self.bands):
+            yield band, hash(signature[band * self.rows:(band + 1) * self.rows])
+
+    @staticmethod
+    def similarity(first: Tuple[int, ...], second: Tuple[int, ...]) -> float:
+        return sum(1 for a, b in zip(first, second) if a == b) / len(first)
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _expire(self, now: float):
+        # Called with the lock held
+        while self._inserted and now - self._inserted[0][0] > self.window_seconds:
+            inserted_at, key = self._inserted.popleft()
+            if self._inserted_at.get(key) == inserted_at:
+                self._remove(key)
+
+    def _remove(self, key: str):
+        # Called with the lock held
+        signature = self._signatures.pop(key, None)
+        self._inserted_at.pop(key, None)
+        if signature is None:
+            return
+        for band, band_hash in self._band_keys(signature):
+            keys = self._buckets[band].get(band_hash)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._buckets[band][band_hash]
+
+    def _add(self, key: str, signature: Tuple[int, ...], now: float):
+        # Called with the lock held
+        self._remove(key)
+        self._signatures[key] = signature
+        self._inserted_at[key] = now
+        self._inserted.append((now, key))
+        for band, band_hash in self._band_keys(signature):
+            self._buckets[band].setdefault(band_hash, set()).add(key)
+
+    def add(self, key: str, signature: Optional[Tuple[int, ...]], inserted_at: Optional[float] = None):
+        if signature is None:
+            return
+        now = inserted_at if inserted_at is not None else time.time()
+        with self._lock:
+            self._add(key, signature, now)
+
+    def remove(self, key: str):
+        with self._lock:
+            self._remove(key)
+
+    def rename(self, old_key: str, new_key: str):
+        """Re-key an entry (a provisional in-chunk key becomes the created ticket id)"""
+        with self._lock:
+            signature = self._signatures.get(old_key)
+            inserted_at = self._inserted_at.get(old_key)
+            self._remove(old_key)
+        if signature is not None:
+            self.add(new_key, signature, inserted_at)
+
+    def _find(self, signature: Tuple[int, ...]) -> Optional[str]:
+        # Called with the lock held
+        self._expire(time.time())
+        self.stats['checked'] += 1
+        candidates: Set[str] = set()
+        for band, band_hash in self._band_keys(signature):
+            candidates |= self._buckets[band].get(band_hash, set())
+
+        best_key, best_score = None, 0.0
+        for key in candidates:
+            score = self.similarity(signature, self._signatures[key])
+            if score >= self.threshold and score > best_score:
+                best_key, best_score = key, score
+        self.stats['candidates_compared'] += len(candidates)
+        if best_key:
+            self.stats['duplicates'] += 1
+        return best_key
+
+    def find(self, signature: Optional[Tuple[int, ...]]) -> Optional[str]:
+        """Best indexed key at or above the threshold; only keys sharing an LSH band are compared"""
+        if signature is None:
+            return None
+        with self._lock:
+            return self._find(signature)
+
+    def find_or_add(self, key: str, signature: Optional[Tuple[int, ...]]) -> Optional[str]:
+        """Match, or index under `key` when nothing matches - atomic, so concurrent parsers never both lead"""
+        if signature is None:
+            return None
+        with self._lock:
+            match = self._find(signature)
+            if match is None:
+                self._add(key, signature, time.time())
+            return match
+
+    def clear(self):
+        with self._lock:
+            for band in self._buckets:
+                band.clear()
+            self._signatures.clear()
+            self._inserted.clear()
+            self._inserted_at.clear()
+
+    def on_event(self, event_type: str, data: Dict):
+        """Ticket store listener: resolved tickets stop collecting duplicates"""
+        if event_type == 'tickets_cleared':
+            self.clear()
+        elif event_type == 'ticket_updated' and data.get('status') == 'resolved':
+            self.remove(data['ticket_id'])
+        elif event_type == 'tickets_reloaded':
+            # Store resync: drop tickets that were resolved or cleared meanwhile; in-flight pending: keys stay
+            open_ids = {ticket['ticket_id'] for ticket in data['tickets'] if ticket.get('status') != 'resolved'}
+            with self._lock:
+                for key in [key for key in self._signatures if not key.startswith('pending:') and key not in open_ids]:
+                    self._remove(key)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['indexed'] = len(self._signatures)
+        stats.update({
+            'threshold': self.threshold,
+            'window_seconds': self.window_seconds,
+            'bands': self.bands,
+            'rows': self.rows
+        })
+        return stats
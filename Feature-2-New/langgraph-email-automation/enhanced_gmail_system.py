@@ -7,18 +7,39 @@ Monitors Gmail inbox in real-time and creates tickets automatically
 import os
 import sys
 import time
-import imaplib
-import smtplib
-import email
-import json
 import uuid
-import requests
+import functools
+import threading
+import imaplib
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict, List, Optional
 from dotenv import load_dotenv
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
+from imap_pool import IMAPConnectionError
+from imap_idle import InboxWatcher
+from uid_sync import UIDSyncState, StoreSyncState
+from imap_fetch import fetch_messages, mark_seen
+from mime_parser import MimeParserPool
+from backlog_drainer import BacklogDrainer, ChunkNotAccepted
+from ingest_pipeline import PipelineBatch, PipelineStage, StagedPipeline
+from ai_client import AsyncClassificationClient
+from classification_cache import ClassificationCache
+from rule_engine import RuleEngine, DEFAULT_RULES_FILE
+from local_model import LocalTicketModel
+from tiered_classifier import TieredClassifier
+from notification_outbox import NotificationOutbox
+from notification_digest import NotificationDigest
+from ticket_store import SQLiteTicketStore
+from ticket_events import TicketEventBus
+from ticket_stats import TicketStats
+from duplicate_detector import DuplicateDetector
+from ingest_worker import IngestWorker
+from ingest_coordinator import IngestCoordinator
+from mailboxes import DEFAULT_MAILBOX, Mailbox, MailboxWatcher, load_mailbox_configs
+from ingest_leases import LeaseManager
+
 # Load environment variables
 load_dotenv()
 
@@ -33,11 +54,96 @@ class EnhancedGmailTicketSystem:
         self.groq_api_key = os.getenv('GROQ_API_KEY')
         self.google_api_key = os.getenv('GOOGLE_API_KEY')
         
+        # Local state (sync marks, caches, ticket store)
+        self.data_dir = os.getenv('TICKET_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data'))
+        
+        # Async classification client (keep-alive pool, bounded concurrency, per-request deadline,
+        # circuit breaker, optional hedging to Gemini)
+        self.ai_client = AsyncClassificationClient(
+            self.groq_api_key,
+            max_concurrency=int(os.getenv('AI_MAX_CONCURRENCY', '8')),
+            request_timeout=float(os.getenv('AI_REQUEST_TIMEOUT_SECONDS', '15')),
+            request_deadline=float(os.getenv('AI_REQUEST_DEADLINE_SECONDS', '20')),
+            batch_size=int(os.getenv('AI_BATCH_SIZE', '8')),
+            batch_max_tokens=int(os.getenv('AI_BATCH_MAX_TOKENS', '2000')),
+            secondary_api_key=self.google_api_key,
+            hedge_enabled=os.getenv('AI_HEDGE_ENABLED', 'false').lower() == 'true',
+            hedge_percentile=float(os.getenv('AI_HEDGE_PERCENTILE', '95')),
+            breaker_options={
+                'failure_rate_threshold': float(os.getenv('AI_BREAKER_FAILURE_RATE', '0.5')),
+                'slow_call_ms': float(os.getenv('AI_BREAKER_SLOW_CALL_MS', '8000')),
+                'open_seconds': float(os.getenv('AI_BREAKER_OPEN_SECONDS', '30'))
+            }
+        )
+        
         # Gmail servers
         self.imap_server = 'imap.gmail.com'
         self.smtp_server = 'smtp.gmail.com'
         
-        # Staff routing
+        # Staff notifications go through a background outbox over one reused SMTP session
+        self.notification_outbox = NotificationOutbox(
+            self.smtp_server,
+            int(os.getenv('SMTP_PORT', '465')),
+            self.email_address,
+            self.app_password,
+            on_result=self._on_notification_result,
+            max_attempts=int(os.getenv('SMTP_MAX_ATTEMPTS', '5'))
+        )
+        
+        # Coalesce notifications per recipient/priority so incident waves don't flood staff inboxes
+        self.notification_digest = NotificationDigest(
+            self.notification_outbox.enqueue,
+            self._build_notification,
+            self._build_digest,
+            windows={
+                'high': float(os.getenv('NOTIFY_WINDOW_HIGH_SECONDS', '0')),
+                'medium': float(os.getenv('NOTIFY_WINDOW_MEDIUM_SECONDS', '300')),
+                'low': float(os.getenv('NOTIFY_WINDOW_LOW_SECONDS', '900'))
+            },
+            max_per_hour=float(os.getenv('NOTIFY_MAX_PER_RECIPIENT_HOUR', '20')),
+            burst=int(os.getenv('NOTIFY_RECIPIENT_BURST', '5'))
+        )
+        
+        # Batched fetch limits (one FETCH per batch, text part capped so attachments are never downloaded)
+        self.fetch_batch_size = int(os.getenv('IMAP_FETCH_BATCH_SIZE', '100'))
+        self.max_body_bytes = int(os.getenv('IMAP_BODY_MAX_BYTES', '16384'))
+        
+        # MIME decoding (charsets, HTML-only mail, full-message fallbacks) on worker processes
+        self.mime_parser = MimeParserPool(
+            workers=int(os.getenv('MIME_PARSER_WORKERS', str(min(4, os.cpu_count() or 1)))),
+            min_pool_batch=int(os.getenv('MIME_POOL_MIN_BATCH', '8')),
+            max_body_chars=self.max_body_bytes
+        )
+        
+        # Compiled rule engine; confident matches skip the LLM entirely
+        self.rule_engine = RuleEngine(os.getenv('CLASSIFICATION_RULES_FILE', DEFAULT_RULES_FILE))
+        self.rule_confidence_threshold = float(os.getenv('RULE_CONFIDENCE_THRESHOLD', '0.8'))
+        
+        # Content-hash classification cache (duplicates and repeat reminders skip the LLM)
+        cache_file = os.getenv('CLASSIFICATION_CACHE_FILE', os.path.join(self.data_dir, 'classification_cache.json'))
+        self.classification_cache = ClassificationCache(
+            max_entries=int(os.getenv('CLASSIFICATION_CACHE_SIZE', '5000')),
+            ttl_seconds=float(os.getenv('CLASSIFICATION_CACHE_TTL_SECONDS', '86400')),
+            persist_path=cache_file or None
+        )
+        
+        # Tiered classification: rules → cache → local model → LLM
+        self.classifier = TieredClassifier(
+            self.rule_engine,
+            self.classification_cache,
+            self.ai_client.classify_many,
+            local_model=LocalTicketModel.load(os.getenv('LOCAL_MODEL_FILE', os.path.join(self.data_dir, 'local_model.pkl'))),
+            rule_threshold=self.rule_confidence_threshold,
+            local_model_threshold=float(os.getenv('LOCAL_MODEL_CONFIDENCE_THRESHOLD', '0.75'))
+        )
+        
+        # Whole-backlog draining: oldest first, in chunks, within a per-cycle time budget
+        self.backlog_drainer = BacklogDrainer(
+            chunk_size=int(os.getenv('INGEST_CHUNK_SIZE', '25')),
+            cycle_budget_seconds=float(os.getenv('INGEST_CYCLE_BUDGET_SECONDS', '20'))
+        )
+        
+        # Staff routing (per-mailbox tables override individual roles)
         self.staff_routing = {
             'SOFTWARE_SECURITY_OFFICER': os.getenv('SOFTWARE_SECURITY_OFFICER', 'security@company.com'),
             'IT_HELPDESK_MANAGER': os.getenv('IT_HELPDESK_MANAGER', 'itmanager@company.com'),
@@ -46,22 +152,152 @@ class EnhancedGmailTicketSystem:
             'NETWORK_ADMIN': os.getenv('NETWORK_ADMIN', 'network@company.com')
         }
         
-        # System state
-        self.tickets = []
-        self.processed_email_ids = set()
+        # Durable ticket storage (SQLite/WAL); ingest writes on a worker thread while the API reads
+        self.ticket_store = SQLiteTicketStore(
+            os.getenv('TICKET_DB_FILE', os.path.join(self.data_dir, 'tickets.db'))
+        )
+        
+        # Scale-out: several processes share TICKET_DB_FILE, each mailbox is ingested by whichever
+        # process holds its lease, and sync marks live in the store so a new owner resumes correctly
+        self.scale_out = os.getenv('INGEST_LEASES_ENABLED', 'false').lower() == 'true'
+        sync_state = UIDSyncState(os.path.join(self.data_dir, 'imap_sync_state.json'))
+        if self.scale_out:
+            sync_state = StoreSyncState(self.ticket_store, fallback=sync_state)
+        
+        # Monitored mailboxes: MAILBOXES_FILE for several, else the MY_EMAIL inbox. Each has its own
+        # pooled IMAP sessions and persisted UIDVALIDITY + high-water mark (shared state)
+        self.mailboxes = self._load_mailboxes(sync_state)
+        self.primary_mailbox = next(iter(self.mailboxes.values()))
+        self.imap_pool = self.primary_mailbox.imap_pool
+        self.uid_sync = self.primary_mailbox.uid_sync
+        for mailbox in self.mailboxes.values():
+            # NOOP idle sessions so the first fetch after a quiet spell doesn't pay a reconnect
+            mailbox.imap_pool.start_keepalive()
+        
+        # Every committed ticket change is pushed to connected dashboards
+        self.events = TicketEventBus()
+        self.ticket_store.add_listener(self.events.publish)
+        
+        # Dashboard counters/time-series kept current from the same events (no scans on read)
+        self.ticket_stats = TicketStats()
+        self.ticket_stats.seed(self.ticket_store.list_tickets())
+        self.ticket_store.add_listener(self.ticket_stats.on_event)
+        
+        # Near-duplicate emails (outage waves) attach to the open ticket they repeat, per mailbox
+        if os.getenv('DEDUP_ENABLED', 'true').lower() == 'true':
+            for mailbox in self.mailboxes.values():
+                mailbox.duplicate_detector = DuplicateDetector(
+                    threshold=float(os.getenv('DEDUP_THRESHOLD', '0.8')),
+                    window_seconds=float(os.getenv('DEDUP_WINDOW_SECONDS', '7200'))
+                )
+                self.ticket_store.add_listener(mailbox.duplicate_detector.on_event)
+            self._seed_duplicate_detectors()
+        self.duplicate_detector = self.primary_mailbox.duplicate_detector
+        
+        # Staged ingest: slow LLM or SMTP work queues up behind bounded queues instead of stalling IMAP
+        self.ingest_pipeline = self._build_ingest_pipeline()
+        self.ingest_pipeline.start()
+        # Batches submitted but not yet collected; ones still in flight when a cycle's budget runs out
+        # are collected (and their UIDs kept out of the backlog) by the next cycle
+        self._carried_batches: List[PipelineBatch] = []
+        
+        # Follow the other processes' writes and take this process's share of mailbox leases
+        self._ingest_active = False
+        self.lease_manager = None
+        self.inbox_watcher = None
+        if self.scale_out:
+            self.ticket_store.start_sync(float(os.getenv('STORE_SYNC_SECONDS', '1')))
+            self.lease_manager = LeaseManager(
+                self.ticket_store,
+                list(self.mailboxes),
+                ttl_seconds=float(os.getenv('INGEST_LEASE_TTL_SECONDS', '30')),
+                renew_interval=float(os.getenv('INGEST_LEASE_RENEW_SECONDS', '10')),
+                on_acquired=self._on_mailbox_acquired,
+                on_lost=self._on_mailbox_lost,
+                busy=lambda: self._ingest_active or bool(self._carried_batches)
+            )
+            for name, mailbox in self.mailboxes.items():
+                # Fencing: a process that lost the lease never moves the mailbox's mark again
+                mailbox.uid_sync.fence = functools.partial(self.lease_manager.holds, name)
+            self.lease_manager.start()
+        else:
+            # Notifications the last run queued but never delivered (scale-out resumes them per lease)
+            self._resume_notifications()
         self.stats = {
-            'total_tickets': 0,
-            'high_priority': 0,
-            'medium_priority': 0,
-            'low_priority': 0,
-            'tickets_by_category': {},
             'start_time': datetime.now()
         }
         
         print("🎯 Enhanced Gmail Ticket System Initialized")
-        print(f"📧 Monitoring: {self.email_address}")
+        print(f"📧 Monitoring: {', '.join(mailbox.email_address for mailbox in self.mailboxes.values())}")
         self._validate_configuration()
     
+    def _load_mailboxes(self, sync_state: UIDSyncState) -> Dict[str, Mailbox]:
+        """Build the monitored mailboxes from MAILBOXES_FILE, or the single MY_EMAIL inbox"""
+        configs = [{'name': DEFAULT_MAILBOX, 'email': self.email_address,
+                    'app_password': self.app_password, 'routing': {}}]
+        mailboxes_file = os.getenv('MAILBOXES_FILE')
+        if mailboxes_file:
+            configs = load_mailbox_configs(mailboxes_file)
+        
+        mailboxes = {}
+        for config in configs:
+            mailboxes[config['name']] = Mailbox(
+                config['name'],
+                config['email'],
+                config['app_password'],
+                dict(self.staff_routing, **config['routing']),
+                self.imap_server,
+                sync_state,
+                # Shared IMAP sessions (reused across polls instead of a TLS handshake + login each time)
+                pool_size=int(os.getenv('IMAP_POOL_SIZE', '2')),
+                keepalive_interval=float(os.getenv('IMAP_KEEPALIVE_SECONDS', '60')),
+                # A message that fails this often is skipped so the high-water mark can move past it
+                max_attempts=int(os.getenv('INGEST_MAX_ATTEMPTS', '3'))
+            )
+        return mailboxes
+    
+    def _on_mailbox_acquired(self, name: str):
+        """Lease callback: pick up where the previous owner stopped"""
+        mailbox = self.mailboxes[name]
+        mailbox.uid_sync.reload()
+        if mailbox.duplicate_detector:
+            mailbox.duplicate_detector.clear()
+            self._seed_duplicate_detectors(mailbox)
+        self._resume_notifications(mailbox)
+        if isinstance(self.inbox_watcher, MailboxWatcher):
+            # May wait for the mailbox's previous watcher to exit; keep the lease thread renewing
+            threading.Thread(target=self.inbox_watcher.resume, args=(name,), daemon=True).start()
+    
+    def _on_mailbox_lost(self, name: str):
+        """Lease callback: stop IDLE on a mailbox another process now ingests"""
+        if isinstance(self.inbox_watcher, MailboxWatcher):
+            self.inbox_watcher.pause(name)
+    
+    def _owns(self, mailbox: Mailbox) -> bool:
+        """Ingest fence: single-process mode owns everything, scale-out only what it holds a lease for"""
+        return self.lease_manager is None or self.lease_manager.holds(mailbox.name)
+    
+    def _resume_notifications(self, mailbox: Mailbox = None) -> int:
+        """Re-queue notifications left 'queued' by a process that is gone (its outbox died with it)"""
+        live = self.lease_manager.live_owners() if self.lease_manager else set()
+        resumed = 0
+        for ticket in self.ticket_store.list_tickets():
+            if ticket.get('notification_status') != 'queued':
+                continue
+            if mailbox is not None and self._mailbox_for(ticket) is not mailbox:
+                continue
+            if ticket.get('notification_owner') in live:
+                continue
+            if self.send_notification_to_staff(ticket):
+                resumed += 1
+        if resumed:
+            print(f"📨 Re-queued {resumed} undelivered notification(s)")
+        return resumed
+    
+    def _mailbox_for(self, data: Dict) -> Mailbox:
+        """Mailbox an email or ticket came from (older tickets carry no mailbox)"""
+        return self.mailboxes.get(data.get('mailbox'), self.primary_mailbox)
+    
     def _validate_configuration(self):
         """Validate system configuration"""
         issues = []
@@ -72,6 +308,10 @@ class EnhancedGmailTicketSystem:
             issues.append("❌ Gmail App Password should be 16 characters")
         else:
             print("✅ Gmail App Password: Set")
+        
+        for mailbox in self.mailboxes.values():
+            if mailbox.email_address != self.email_address and not mailbox.has_valid_password():
+                issues.append(f"❌ App Password missing or invalid for mailbox '{mailbox.name}' ({mailbox.email_address})")
             
         if not self.groq_api_key:
             issues.append("❌ GROQ API Key not set")
@@ -97,21 +337,18 @@ class EnhancedGmailTicketSystem:
         
         return True
     
-    def test_gmail_connection(self) -> bool:
-        """Test Gmail IMAP connection"""
+    def test_gmail_connection(self, mailbox: Mailbox = None) -> bool:
+        """Test Gmail IMAP connection (every mailbox unless one is given)"""
+        if mailbox is None:
+            return all([self.test_gmail_connection(mailbox) for mailbox in self.mailboxes.values()])
         try:
-            print(f"🔍 Testing Gmail connection for {self.email_address}...")
-            mail = imaplib.IMAP4_SSL(self.imap_server)
-            mail.login(self.email_address, self.app_password)
-            mail.select('inbox')
-            
-            # Test search
-            status, messages = mail.search(None, 'ALL')
+            print(f"🔍 Testing Gmail connection for {mailbox.email_address}...")
+            with mailbox.imap_pool.connection() as mail:
+                # Test search
+                status, messages = mail.search(None, 'ALL')
             if status == 'OK':
                 total_emails = len(messages[0].split())
                 print(f"✅ Gmail connection successful! Found {total_emails} emails in inbox")
-                mail.close()
-                mail.logout()
                 return True
             
         except Exception as e:
@@ -126,134 +363,15 @@ class EnhancedGmailTicketSystem:
     
     def analyze_email_with_ai(self, email_data: Dict) -> Dict:
         """Enhanced AI analysis with GROQ API"""
-        try:
-            prompt = f"""
-            Analyze this IT support email and provide structured categorization:
-            
-            From: {email_data['sender']}
-            Subject: {email_data['subject']}
-            Body: {email_data['body']}
-            
-            Classify this email and respond with ONLY valid JSON:
-            {{
-                "category": "security|access|hardware|software|network|general",
-                "priority": "high|medium|low", 
-                "route_to": "SOFTWARE_SECURITY_OFFICER|IT_HELPDESK_MANAGER|HR_COORDINATOR|PROCUREMENT_OFFICER|NETWORK_ADMIN",
-                "issue_type": "brief description of the issue",
-                "urgency_reason": "explanation for priority level"
-            }}
-            
-            Routing Rules:
-            - Security issues, password resets → SOFTWARE_SECURITY_OFFICER (HIGH)
-            - New employee setup, departures → HR_COORDINATOR (MEDIUM)
-            - Hardware problems, software issues → IT_HELPDESK_MANAGER (MEDIUM/HIGH)
-            - Network/VPN problems → NETWORK_ADMIN (HIGH)
-            - Software purchases, licenses → PROCUREMENT_OFFICER (LOW)
-            """
-            
-            headers = {
-                "Authorization": f"Bearer {self.groq_api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            data = {
-                "model": "llama-3.1-70b-versatile",
-                "messages": [
-                    {"role": "system", "content": "You are an expert IT ticket analyzer. Respond only with valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.1,
-                "max_tokens": 300
-            }
-            
-            response = requests.post(
-                "https://api.groq.com/openai/v1/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=15
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                ai_response = result["choices"][0]["message"]["content"].strip()
-                
-                # Clean JSON response
-                if ai_response.startswith("```json"):
-                    ai_response = ai_response[7:-3]
-                elif ai_response.startswith("```"):
-                    ai_response = ai_response[3:-3]
-                
-                analysis = json.loads(ai_response)
-                return analysis
-                
-        except Exception as e:
-            print(f"❌ AI analysis failed: {e}")
-        
-        # Fallback analysis
-        return self._fallback_analysis(email_data)
+        return self.analyze_emails_with_ai([email_data])[0]
+    
+    def analyze_emails_with_ai(self, emails: List[Dict]) -> List[Dict]:
+        """Classify a batch: rules, then cache, then local model, and the LLM only when none is confident"""
+        return self.classifier.classify_many(emails)
     
     def _fallback_analysis(self, email_data: Dict) -> Dict:
         """Fallback analysis when AI fails"""
-        text = f"{email_data['subject']} {email_data['body']}".lower()
-        
-        # Security keywords
-        if any(word in text for word in ['password', 'reset', 'security', 'breach', 'hack', 'unauthorized']):
-            return {
-                "category": "security",
-                "priority": "high",
-                "route_to": "SOFTWARE_SECURITY_OFFICER", 
-                "issue_type": "Security or access issue",
-                "urgency_reason": "Security-related issues require immediate attention"
-            }
-        
-        # HR/Onboarding keywords  
-        if any(word in text for word in ['new employee', 'onboarding', 'departure', 'leaving']):
-            return {
-                "category": "access",
-                "priority": "medium",
-                "route_to": "HR_COORDINATOR",
-                "issue_type": "Employee lifecycle management", 
-                "urgency_reason": "Standard employee onboarding/offboarding process"
-            }
-        
-        # Network keywords
-        if any(word in text for word in ['vpn', 'network', 'connectivity', 'internet', 'wifi']):
-            return {
-                "category": "network", 
-                "priority": "high",
-                "route_to": "NETWORK_ADMIN",
-                "issue_type": "Network connectivity issue",
-                "urgency_reason": "Network issues affect productivity"
-            }
-        
-        # Hardware keywords
-        if any(word in text for word in ['laptop', 'computer', 'hardware', 'screen', 'keyboard']):
-            return {
-                "category": "hardware",
-                "priority": "medium", 
-                "route_to": "IT_HELPDESK_MANAGER",
-                "issue_type": "Hardware support request",
-                "urgency_reason": "Hardware issues affect daily work"
-            }
-        
-        # Software/License keywords
-        if any(word in text for word in ['license', 'software', 'purchase', 'subscription']):
-            return {
-                "category": "software",
-                "priority": "low",
-                "route_to": "PROCUREMENT_OFFICER",
-                "issue_type": "Software or license request", 
-                "urgency_reason": "Standard procurement process"
-            }
-        
-        # Default fallback
-        return {
-            "category": "general",
-            "priority": "medium",
-            "route_to": "IT_HELPDESK_MANAGER", 
-            "issue_type": "General IT support request",
-            "urgency_reason": "Standard IT support ticket"
-        }
+        return self.rule_engine.classify(email_data)
     
     def create_ticket(self, email_data: Dict, analysis: Dict) -> Dict:
         """Create ticket from email analysis"""
@@ -279,32 +397,91 @@ class EnhancedGmailTicketSystem:
             "issue_type": analysis['issue_type'],
             "urgency_reason": analysis['urgency_reason'],
             "assigned_role": analysis['route_to'],
-            "assigned_to": self.staff_routing.get(analysis['route_to'], 'it.manager@company.com'),
+            "assigned_to": self._mailbox_for(email_data).staff_routing.get(analysis['route_to'], 'it.manager@company.com'),
+            "classified_by": analysis.get('tier', 'llm'),
             "status": "open",
             "created_at": datetime.now().isoformat(),
             "email_id": email_data.get('id', 'simulated'),
+            "mailbox": self._mailbox_for(email_data).name,
             "escalated": False,
             "notification_sent": False
         }
         
         return ticket
     
+    def _store_ticket(self, ticket: Dict, email_id: str = None):
+        """Persist a new ticket (and mark its email processed)"""
+        self.ticket_store.add(ticket, email_id)
+    
+    def _store_tickets(self, entries: List[tuple]):
+        """Persist a burst of (ticket, email_id) pairs in one transaction"""
+        self.ticket_store.add_many(entries)
+    
+    def _seed_duplicate_detectors(self, mailbox: Mailbox = None):
+        """Index open tickets still inside the duplicate window, each in its own mailbox's detector"""
+        for ticket in self.ticket_store.find(status='open'):
+            if mailbox is not None and self._mailbox_for(ticket) is not mailbox:
+                continue
+            detector = self._mailbox_for(ticket).duplicate_detector
+            try:
+                created = datetime.fromisoformat(ticket['created_at']).timestamp()
+            except (KeyError, ValueError):
+                continue
+            if created >= time.time() - detector.window_seconds:
+                signature = detector.signature(ticket['subject'], ticket['description'])
+                detector.add(ticket['ticket_id'], signature, created)
+    
+    def _attach_duplicate(self, parent_id: str, email_data: Dict):
+        """Record a repeat email on its parent ticket instead of opening a new one"""
+        entry = {
+            'email_id': email_data.get('id'),
+            'sender': email_data['sender'],
+            'subject': email_data['subject'],
+            'received_at': email_data.get('timestamp')
+        }
+        parent = self.ticket_store.update(
+            parent_id,
+            lambda ticket: {
+                'duplicate_count': ticket.get('duplicate_count', 0) + 1,
+                'duplicates': (ticket.get('duplicates') or [])[-49:] + [entry],
+                'last_duplicate_at': datetime.now().isoformat()
+            },
+            email_id=email_data.get('id')
+        )
+        if parent:
+            print(f"   🔗 Duplicate of {parent_id} ({parent['duplicate_count']} related emails): {email_data['subject'][:50]}")
+        return parent
+    
     def send_notification_to_staff(self, ticket: Dict) -> bool:
-        """Send email notification to assigned staff member"""
+        """Queue a notification to the assigned staff member (coalesced into digests by priority window)"""
         try:
-            smtp = smtplib.SMTP_SSL(self.smtp_server, 587)
-            smtp.login(self.email_address, self.app_password)
-            
-            # Create notification email
-            msg = MIMEMultipart()
-            msg['From'] = self.email_address
-            msg['To'] = ticket['assigned_to']
-            msg['Subject'] = f"🎫 [{ticket['priority'].upper()}] New IT Ticket: {ticket['ticket_id']}"
-            
-            # Create email body with solution suggestions
-            solutions = self._get_solution_suggestions(ticket)
-            
-            email_body = f"""
+            changes = {'notification_sent': False, 'notification_status': 'queued',
+                       'notification_owner': self.lease_manager.owner if self.lease_manager else None}
+            ticket.update(changes)
+            self.ticket_store.update(ticket['ticket_id'], changes)
+            return self.notification_digest.add(ticket)
+        except Exception as e:
+            print(f"❌ Failed to queue notification: {e}")
+            return False
+    
+    def _on_notification_result(self, key: str, sent: bool):
+        """Outbox callback: record the final delivery result on every ticket the email carried"""
+        changes = {'notification_sent': sent, 'notification_status': 'sent' if sent else 'failed'}
+        for ticket_id in self.notification_digest.ticket_ids_for(key):
+            self.ticket_store.update(ticket_id, changes)
+    
+    def _build_notification(self, ticket: Dict) -> MIMEMultipart:
+        """Build the staff notification email for a ticket"""
+        # Create notification email
+        msg = MIMEMultipart()
+        msg['From'] = self.email_address
+        msg['To'] = ticket['assigned_to']
+        msg['Subject'] = f"🎫 [{ticket['priority'].upper()}] New IT Ticket: {ticket['ticket_id']}"
+        
+        # Create email body with solution suggestions
+        solutions = self._get_solution_suggestions(ticket)
+        
+        email_body = f"""
 🎫 NEW IT SUPPORT TICKET ASSIGNED TO YOU
 
 Ticket Details:
@@ -334,18 +511,40 @@ Recommended Solutions:
 
 🤖 Feature-2 Gmail Ticket System
 """
-            
-            msg.attach(MIMEText(email_body, 'plain'))
-            
-            smtp.send_message(msg)
-            smtp.quit()
-            
-            print(f"✅ Notification sent to {ticket['assigned_to']} for ticket {ticket['ticket_id']}")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Failed to send notification: {e}")
-            return False
+        
+        msg.attach(MIMEText(email_body, 'plain'))
+        
+        return msg
+    
+    def _build_digest(self, recipient: str, priority: str, tickets: List[Dict]) -> MIMEMultipart:
+        """Build one summary email covering several tickets for the same recipient and priority"""
+        msg = MIMEMultipart()
+        msg['From'] = self.email_address
+        msg['To'] = recipient
+        msg['Subject'] = f"🎫 [{priority.upper()}] {len(tickets)} New IT Tickets (digest)"
+        
+        entries = []
+        for ticket in tickets:
+            entries.append(f"""📋 {ticket['ticket_id']} - {ticket['subject']}
+   👤 {ticket['sender_name']} ({ticket['sender_email']})
+   🔍 {ticket['issue_type']} | 📂 {ticket['category'].upper()} | ⏰ {ticket['created_at']}""")
+        ticket_list = "\n".join(entries)
+        
+        email_body = f"""
+🎫 {len(tickets)} NEW {priority.upper()} PRIORITY IT TICKETS ASSIGNED TO YOU
+
+Tickets:
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+{ticket_list}
+
+📊 Dashboard: http://localhost:8000 (full details and solution suggestions)
+
+🤖 Feature-2 Gmail Ticket System
+"""
+        
+        msg.attach(MIMEText(email_body, 'plain'))
+        
+        return msg
     
     def _get_solution_suggestions(self, ticket: Dict) -> str:
         """Generate solution suggestions based on ticket category"""
@@ -441,77 +640,109 @@ Recommended Solutions:
    - Escalate to specialist if needed
    - Document solution for knowledge base""")
     
-    def fetch_new_emails(self) -> List[Dict]:
-        """Fetch new emails from Gmail inbox"""
-        if not self.app_password or len(self.app_password) != 16:
-            print("❌ Invalid Gmail App Password configuration")
+    def find_new_email_uids(self, mailbox: Mailbox = None) -> List[int]:
+        """List UIDs above the persisted high-water mark (the current backlog), oldest first"""
+        mailbox = mailbox or self.primary_mailbox
+        if not mailbox.has_valid_password():
+            print(f"❌ Invalid Gmail App Password configuration for {mailbox.email_address}")
             return []
         
         try:
-            mail = imaplib.IMAP4_SSL(self.imap_server)
-            mail.login(self.email_address, self.app_password)
-            mail.select('inbox')
-            
-            # Search for recent unread emails
-            status, messages = mail.search(None, 'UNSEEN')
-            if status != 'OK':
-                return []
-            
-            email_ids = messages[0].split()
-            emails = []
+            with mailbox.imap_pool.connection() as mail:
+                # Cost depends on new mail, not mailbox size
+                email_uids = mailbox.uid_sync.find_new_uids(mail)
+            if email_uids:
+                print(f"📬 Found {len(email_uids)} new emails in {mailbox.email_address}")
+            return email_uids
             
-            print(f"📬 Found {len(email_ids)} unread emails")
-            
-            for email_id in email_ids[-10:]:  # Process last 10 emails
-                try:
-                    email_id_str = email_id.decode()
-                    if email_id_str in self.processed_email_ids:
-                        continue
-                    
-                    status, msg_data = mail.fetch(email_id, '(RFC822)')
-                    if status == 'OK':
-                        email_message = email.message_from_bytes(msg_data[0][1])
-                        
-                        # Extract email content
-                        sender = email_message.get('From', '')
-                        subject = email_message.get('Subject', '')
-                        body = self._get_email_body(email_message)
-                        
-                        # Filter valid employee emails
-                        if self._is_valid_email(sender, subject, body):
-                            email_data = {
-                                'id': email_id_str,
-                                'sender': sender,
-                                'subject': subject,
-                                'body': body,
-                                'timestamp': datetime.now().isoformat()
-                            }
-                            emails.append(email_data)
-                            
-                except Exception as e:
-                    print(f"❌ Error processing email: {e}")
+        except Exception as e:
+            print(f"❌ Error fetching emails: {e}")
+            return []
+    
+    def fetch_raw_messages(self, uids: List[int], mailbox: Mailbox = None) -> List[Dict]:
+        """IMAP side of a fetch: headers plus undecoded text part (or whole message) per unprocessed UID"""
+        mailbox = mailbox or self.primary_mailbox
+        try:
+            with mailbox.imap_pool.connection() as mail:
+                batch = sorted(uids)  # Oldest first so the high-water mark never skips a message
+                
+                pending_uids = []
+                for uid in batch:
+                    if self.ticket_store.is_processed(mailbox.email_id(uid)):
+                        mailbox.uid_sync.complete(uid)
+                    else:
+                        pending_uids.append(uid)
+                
+                # Headers + BODYSTRUCTURE for the whole set in one command, then only the text parts
+                messages = fetch_messages(
+                    mail,
+                    pending_uids,
+                    max_body_bytes=self.max_body_bytes,
+                    batch_size=self.fetch_batch_size,
+                    decode=False  # Decoding is CPU work for the parser pool, not this IMAP thread
+                )
+                
+                raw = []
+                for uid in pending_uids:
+                    try:
+                        message = messages.get(uid)
+                        if message is None or message['body'] is None:
+                            # Structure unreadable - fall back to the full message for this one
+                            message = self._fetch_full_message(mail, uid)
+                        if message:
+                            raw.append(dict(message, uid=uid, mailbox=mailbox.name))
+                        else:
+                            mailbox.uid_sync.complete(uid)
+                    except (imaplib.IMAP4.abort, OSError):
+                        raise
+                    except Exception as e:
+                        print(f"❌ Error processing email: {e}")
+                        mailbox.uid_sync.fail(uid, e)
             
-            mail.close()
-            mail.logout()
-            return emails
+            # BODY.PEEK leaves messages unread; the write stage flags them once their tickets are stored
+            return raw
             
+        except (IMAPConnectionError, imaplib.IMAP4.abort, OSError) as e:
+            # Connection trouble, not the messages: retry the whole chunk next cycle
+            print(f"❌ Error fetching emails: {e}")
+            return []
         except Exception as e:
+            # Something in this chunk breaks the fetch itself; count it against every UID in it
             print(f"❌ Error fetching emails: {e}")
+            for uid in uids:
+                if not self.ticket_store.is_processed(mailbox.email_id(uid)):
+                    mailbox.uid_sync.fail(uid, e)
             return []
     
-    def _get_email_body(self, email_message) -> str:
-        """Extract email body text"""
-        body = ""
-        
-        if email_message.is_multipart():
-            for part in email_message.walk():
-                if part.get_content_type() == "text/plain":
-                    body = part.get_payload(decode=True).decode('utf-8', errors='ignore')
-                    break
-        else:
-            body = email_message.get_payload(decode=True).decode('utf-8', errors='ignore')
+    def _parse_message(self, message: Dict) -> Optional[Dict]:
+        """Turn a fetched message into email data, or None (UID completed) if there is nothing to ticket"""
+        uid = message['uid']
+        mailbox = self._mailbox_for(message)
+        if message.get('parse_error'):
+            print(f"❌ Could not decode UID {uid}: {message['parse_error']}")
+            mailbox.uid_sync.fail(uid, message['parse_error'])
+            return None
+        if self._is_valid_email(message['sender'], message['subject'], message['body']):
+            return {
+                'id': mailbox.email_id(uid),
+                'uid': uid,
+                'mailbox': mailbox.name,
+                'sender': message['sender'],
+                'subject': message['subject'],
+                'body': message['body'],
+                'timestamp': datetime.now().isoformat()
+            }
         
-        return body.strip()
+        # Nothing to ticket for this message - let the high-water mark move past it
+        mailbox.uid_sync.complete(uid)
+        return None
+    
+    def _fetch_full_message(self, mail, uid: int) -> Optional[Dict]:
+        """Fetch a whole message when its BODYSTRUCTURE could not be used (parsed later by the MIME pool)"""
+        status, msg_data = mail.uid('FETCH', str(uid), '(BODY.PEEK[])')
+        if status != 'OK' or not msg_data or not isinstance(msg_data[0], tuple):
+            return None
+        return {'raw': msg_data[0][1]}
     
     def _is_valid_email(self, sender: str, subject: str, body: str) -> bool:
         """Check if email is valid employee request"""
@@ -526,56 +757,306 @@ Recommended Solutions:
         return True
     
     def process_new_emails(self) -> List[Dict]:
-        """Process new emails and create tickets"""
-        emails = self.fetch_new_emails()
-        new_tickets = []
+        """Drain every mailbox's backlog through the staged pipeline and return the tickets created"""
+        batch = PipelineBatch()
+        batch.context['uids'] = {}
+        deadline = time.monotonic() + self.backlog_drainer.cycle_budget_seconds
         
-        for email_data in emails:
+        def _find_backlogs() -> Dict[str, List[int]]:
+            # In scale-out mode only the mailboxes this process holds the lease for
+            return {
+                name: self.find_new_email_uids(mailbox)
+                for name, mailbox in self.mailboxes.items()
+                if self._owns(mailbox)
+            }
+        
+        def _submit(name: str, uids: List[int]) -> List[Dict]:
+            # Registered in order here, not in a fetch worker, so the high-water mark never skips a chunk
+            self.mailboxes[name].uid_sync.begin_batch(uids)
+            if batch not in self._carried_batches:
+                # Tracked from its first chunk, so it is collected later even if this cycle fails
+                self._carried_batches.append(batch)
+            if not self.ingest_pipeline.submit((name, uids), batch, timeout=max(0.0, deadline - time.monotonic())):
+                # Still pending in the UID sync, so the next cycle's search finds them again
+                raise ChunkNotAccepted(f"ingest pipeline full, {len(uids)} UIDs of {name} left for the next cycle")
+            with batch.lock:
+                batch.context['uids'].setdefault(name, []).extend(uids)
+            return []
+        
+        def _finish(remaining: float) -> tuple:
+            # Wait only for what is left of the cycle budget; unfinished batches carry over to the next cycle
+            deadline = time.monotonic() + remaining
+            new_tickets, carry_over, unfinished = [], {}, []
+            for pending in self._carried_batches:
+                pending.wait(max(0.0, deadline - time.monotonic()))
+                if pending.done():
+                    new_tickets.extend(pending.wait(0))
+                    self._release_followers(pending)
+                    continue
+                unfinished.append(pending)
+                with pending.lock:
+                    for name, uids in pending.context['uids'].items():
+                        carry_over.setdefault(name, []).extend(uids)
+            self._carried_batches = unfinished
+            return new_tickets, carry_over
+        
+        # Mailboxes take turns chunk by chunk, so one busy alias cannot starve the others
+        self._ingest_active = True
+        try:
+            return self.backlog_drainer.drain_many(_find_backlogs, _submit, finish=_finish)
+        finally:
+            self._ingest_active = False
+    
+    def _release_followers(self, batch: PipelineBatch):
+        """Repeats whose leader never became a ticket stay unprocessed and are retried next cycle"""
+        for leader_id in batch.context.get('followers', {}):
+            for mailbox in self.mailboxes.values():
+                if mailbox.duplicate_detector:
+                    mailbox.duplicate_detector.remove(f"pending:{leader_id}")
+    
+    def _build_ingest_pipeline(self) -> StagedPipeline:
+        """Fetcher → parser → classifier pool → ticket writer → notifier, each with its own workers"""
+        queue_size = int(os.getenv('INGEST_QUEUE_SIZE', '100'))
+        return StagedPipeline([
+            # Each fetch worker holds a pooled IMAP session, so keep this <= IMAP_POOL_SIZE
+            PipelineStage('fetch', self._fetch_stage,
+                          workers=int(os.getenv('INGEST_FETCH_WORKERS', '1')),
+                          queue_size=max(1, queue_size // self.backlog_drainer.chunk_size)),
+            PipelineStage('parse', self._parse_stage,
+                          workers=int(os.getenv('INGEST_PARSE_WORKERS', '1')),
+                          queue_size=queue_size, batch_size=self.backlog_drainer.chunk_size),
+            PipelineStage('classify', self._classify_stage,
+                          workers=int(os.getenv('INGEST_CLASSIFY_WORKERS', '4')),
+                          queue_size=queue_size, batch_size=self.ai_client.batch_size),
+            PipelineStage('write', self._write_stage,
+                          workers=int(os.getenv('INGEST_WRITE_WORKERS', '1')),
+                          queue_size=queue_size, batch_size=self.backlog_drainer.chunk_size),
+            PipelineStage('notify', self._notify_stage,
+                          workers=int(os.getenv('INGEST_NOTIFY_WORKERS', '1')),
+                          queue_size=queue_size)
+        ])
+    
+    def _fetch_stage(self, batch: PipelineBatch, chunks: List[tuple]) -> List[Dict]:
+        messages = []
+        for name, uids in chunks:
+            mailbox = self.mailboxes[name]
+            if not self._owns(mailbox):
+                print(f"🔒 Dropping {len(uids)} queued UIDs for {name}: mailbox lease no longer held")
+                continue
+            messages.extend(self.fetch_raw_messages(uids, mailbox))
+        return messages
+    
+    def _parse_stage(self, batch: PipelineBatch, messages: List[Dict]) -> List[Dict]:
+        """Decode (process pool for big batches), validate, then route repeats past the classifier"""
+        items = []
+        for message in self.mime_parser.parse_many(messages):
+            email_data = self._parse_message(message)
+            if email_data:
+                items.append({'email': email_data, 'duplicate_of': self._check_duplicate(email_data)})
+        return items
+    
+    def _check_duplicate(self, email_data: Dict) -> Optional[str]:
+        """Parent ticket id, 'pending:<email id>' for an earlier email still in flight, or None"""
+        detector = self._mailbox_for(email_data).duplicate_detector
+        if not detector:
+            return None
+        signature = detector.signature(email_data['subject'], email_data['body'])
+        # Provisional key so later emails can match this one before its ticket exists
+        return detector.find_or_add(f"pending:{email_data['id']}", signature)
+    
+    def _classify_stage(self, batch: PipelineBatch, items: List[Dict]) -> List[Dict]:
+        leaders = [item for item in items if not item['duplicate_of']]
+        if leaders:
+            emails = [item['email'] for item in leaders]
+            try:
+                analyses = self.analyze_emails_with_ai(emails)
+            except Exception as e:
+                print(f"⚠️ Classification failed, using rules: {e}")
+                analyses = [self._fallback_analysis(email_data) for email_data in emails]
+            for item, analysis in zip(leaders, analyses):
+                item['analysis'] = analysis
+        return items
+    
+    def _write_stage(self, batch: PipelineBatch, items: List[Dict]) -> List[Dict]:
+        """Create and store tickets in one transaction; repeats attach to their parent"""
+        created = []
+        for item in items:
+            if item['duplicate_of']:
+                continue
+            email_data = item['email']
             try:
                 print(f"\n📧 Processing: {email_data['subject'][:50]}...")
                 print(f"   From: {email_data['sender']}")
-                
-                # AI analysis
-                analysis = self.analyze_email_with_ai(email_data)
-                
-                # Create ticket
-                ticket = self.create_ticket(email_data, analysis)
-                
-                # Store ticket
-                self.tickets.append(ticket)
-                new_tickets.append(ticket)
-                self.processed_email_ids.add(email_data['id'])
-                
+                created.append((email_data, self.create_ticket(email_data, item['analysis'])))
+            except Exception as e:
+                print(f"   ❌ Error processing email: {e}")
+                self._forget_pending(batch, email_data)
+                if 'uid' in email_data:
+                    self._mailbox_for(email_data).uid_sync.fail(email_data['uid'], e)
+        
+        # Fence: tickets are only committed for mailboxes this process still owns
+        owned = {name for name, mailbox in self.mailboxes.items() if self._owns(mailbox)}
+        fenced = [email_data for email_data, _ in created if self._mailbox_for(email_data).name not in owned]
+        if fenced:
+            print(f"   🔒 Dropping {len(fenced)} ticket(s): mailbox lease no longer held")
+            for email_data in fenced:
+                self._forget_pending(batch, email_data)
+        created = [(email_data, ticket) for email_data, ticket in created if self._mailbox_for(email_data).name in owned]
+        items = [item for item in items if self._mailbox_for(item['email']).name in owned]
+        
+        try:
+            # UIDs only advance once their tickets are durable
+            self._store_tickets([(ticket, email_data['id']) for email_data, ticket in created])
+        except Exception:
+            for email_data, _ in created:
+                self._forget_pending(batch, email_data)
+            raise
+        
+        attach = []
+        with batch.lock:
+            leaders = batch.context.setdefault('leaders', {})
+            waiting = batch.context.setdefault('followers', {})
+            for email_data, ticket in created:
+                leaders[email_data['id']] = ticket['ticket_id']
+                attach.extend((repeat, ticket['ticket_id']) for repeat in waiting.pop(email_data['id'], []))
+            for item in items:
+                parent_id = item['duplicate_of']
+                if not parent_id:
+                    continue
+                if not parent_id.startswith('pending:'):
+                    attach.append((item['email'], parent_id))
+                    continue
+                # Repeat of an email still in flight: attach now if its ticket exists, else when it does
+                leader_id = parent_id[len('pending:'):]
+                if leader_id in leaders:
+                    attach.append((item['email'], leaders[leader_id]))
+                else:
+                    waiting.setdefault(leader_id, []).append(item['email'])
+        
+        for email_data, ticket in created:
+            detector = self._mailbox_for(email_data).duplicate_detector
+            if detector:
+                detector.rename(f"pending:{email_data['id']}", ticket['ticket_id'])
+        written = [email_data for email_data, _ in created]
+        for email_data, parent_id in attach:
+            if self._attach_duplicate(parent_id, email_data) and 'uid' in email_data:
+                self._mailbox_for(email_data).uid_sync.complete(email_data['uid'])
+                written.append(email_data)
+        for email_data, ticket in created:
+            if 'uid' in email_data:
+                self._mailbox_for(email_data).uid_sync.complete(email_data['uid'])
+        self._mark_seen(written)
+        return [ticket for _, ticket in created]
+    
+    def _mark_seen(self, emails: List[Dict]):
+        """Flag messages read once their tickets are stored, one STORE per mailbox"""
+        by_mailbox: Dict[str, List[int]] = {}
+        for email_data in emails:
+            if 'uid' in email_data:
+                by_mailbox.setdefault(self._mailbox_for(email_data).name, []).append(email_data['uid'])
+        for name, uids in by_mailbox.items():
+            try:
+                with self.mailboxes[name].imap_pool.connection() as mail:
+                    mark_seen(mail, uids)
+            except Exception as e:
+                # Only the unread flag is lost; the tickets and the high-water mark are already stored
+                print(f"⚠️ Could not mark {len(uids)} emails read in {name}: {e}")
+    
+    def _forget_pending(self, batch: PipelineBatch, email_data: Dict):
+        """A leader that produced no ticket: drop its provisional key; its repeats are retried next cycle"""
+        detector = self._mailbox_for(email_data).duplicate_detector
+        if detector:
+            detector.remove(f"pending:{email_data['id']}")
+        with batch.lock:
+            batch.context.setdefault('followers', {}).pop(email_data['id'], None)
+    
+    def _notify_stage(self, batch: PipelineBatch, tickets: List[Dict]) -> List[Dict]:
+        for ticket in tickets:
+            try:
                 # Send notification to assigned staff
-                notification_sent = self.send_notification_to_staff(ticket)
-                ticket['notification_sent'] = notification_sent
-                
-                # Update stats
-                self.stats['total_tickets'] += 1
-                self.stats[f"{ticket['priority']}_priority"] += 1
+                notification_queued = self.send_notification_to_staff(ticket)
                 
                 print(f"   ✅ Ticket created: {ticket['ticket_id']}")
                 print(f"   🎯 Priority: {ticket['priority'].upper()}")
                 print(f"   👤 Assigned to: {ticket['assigned_role']}")
-                print(f"   📧 Notification: {'Sent' if notification_sent else 'Failed'}")
+                print(f"   📧 Notification: {'Queued' if notification_queued else 'Failed'}")
                 
             except Exception as e:
                 print(f"   ❌ Error processing email: {e}")
+        return tickets
+    
+    def create_inbox_watcher(self, on_tickets=None, run_cycle=None):
+        """Build an IMAP IDLE watcher (one per mailbox) that runs an ingest cycle only when mail arrives"""
+        if run_cycle is None:
+            # Per-mailbox watcher threads wake independently; cycles must still be single-flight
+            run_cycle = IngestCoordinator(IngestWorker(), self.process_new_emails).run_blocking
+        
+        def _on_change() -> int:
+            new_tickets = run_cycle()
+            if on_tickets:
+                on_tickets(new_tickets)
+            return len(new_tickets)
+        
+        # Any mailbox waking up runs one cycle over all of them (concurrent wakes join the one in flight)
+        watchers = {
+            name: InboxWatcher(
+                mailbox.create_idle_pool(),
+                _on_change,
+                has_pending=self.backlog_drainer.has_backlog,
+                min_poll_interval=float(os.getenv('IMAP_MIN_POLL_SECONDS', '5')),
+                max_poll_interval=float(os.getenv('IMAP_MAX_POLL_SECONDS', '60'))
+            )
+            for name, mailbox in self.mailboxes.items()
+        }
+        if self.lease_manager:
+            # Scale-out: IDLE only on mailboxes this process holds; lease changes resume/pause them
+            self.inbox_watcher = MailboxWatcher(watchers, active=self.lease_manager.holds)
+        elif len(watchers) == 1:
+            self.inbox_watcher = next(iter(watchers.values()))
+        else:
+            self.inbox_watcher = MailboxWatcher(watchers)
+        return self.inbox_watcher
+    
+    def get_dashboard_data(self, filters: Dict = None, sort: str = 'created_at', order: str = 'desc',
+                           limit: int = 50, cursor: str = None, fields: List[str] = None) -> Dict:
+        """Get one page of tickets (filtered, sorted, optionally projected) plus stats for the dashboard API"""
+        tickets, next_cursor = self.ticket_store.query(filters, sort=sort, order=order, limit=limit, cursor=cursor)
+        if fields:
+            keep = set(fields) | {'ticket_id'}
+            tickets = [{key: value for key, value in ticket.items() if key in keep} for ticket in tickets]
         
-        return new_tickets
+        data = {
+            "tickets": tickets,
+            "page": {
+                "limit": limit,
+                "count": len(tickets),
+                "next_cursor": next_cursor
+            }
+        }
+        data.update(self.get_summary())
+        return data
     
-    def get_dashboard_data(self) -> Dict:
-        """Get data for dashboard API"""
+    def get_summary(self) -> Dict:
+        """Ticket counters and system info without any tickets"""
+        stats = self.ticket_stats.snapshot()
+        stats['start_time'] = self.stats['start_time']
+        total_processed = self.ticket_store.processed_count()
+        stats['classification_cache'] = self.classification_cache.get_stats()
+        stats['classification_tiers'] = self.classifier.get_stats()
         return {
-            "tickets": self.tickets,
-            "stats": self.stats,
+            "stats": stats,
             "system_info": {
-                "monitored_email": self.email_address,
-                "total_processed": len(self.processed_email_ids),
+                "monitored_email": ', '.join(mailbox.email_address for mailbox in self.mailboxes.values()),
+                "total_processed": total_processed,
+                "sync": self.uid_sync.get_status(),
                 "uptime": str(datetime.now() - self.stats['start_time']).split('.')[0]
             }
         }
     
+    def get_mailbox_status(self) -> Dict:
+        """Per-mailbox sync, IMAP pool and duplicate-index status for the health endpoint"""
+        return {name: mailbox.get_status() for name, mailbox in self.mailboxes.items()}
+    
     def simulate_employee_email(self, sender: str, subject: str, body: str) -> Dict:
         """Simulate an employee email for testing"""
         email_data = {
@@ -586,59 +1067,90 @@ Recommended Solutions:
             'timestamp': datetime.now().isoformat()
         }
         
-        analysis = self.analyze_email_with_ai(email_data)
-        ticket = self.create_ticket(email_data, analysis)
+        detector = self.duplicate_detector
+        signature, parent_id = None, None
+        if detector:
+            # Check and claim in one step (as on the ingest path), so a concurrent repeat sees this email
+            signature = detector.signature(subject, body)
+            parent_id = detector.find_or_add(f"pending:{email_data['id']}", signature)
+            if parent_id and not parent_id.startswith('pending:'):
+                parent = self._attach_duplicate(parent_id, email_data)
+                if parent:
+                    return parent
         
-        # Send notification for simulated tickets too
-        notification_sent = self.send_notification_to_staff(ticket)
-        ticket['notification_sent'] = notification_sent
+        try:
+            analysis = self.analyze_email_with_ai(email_data)
+            ticket = self.create_ticket(email_data, analysis)
+            
+            # Store ticket first so the outbox callback can find it
+            self._store_ticket(ticket)
+        except Exception:
+            if detector:
+                detector.remove(f"pending:{email_data['id']}")
+            raise
+        if detector:
+            if parent_id:
+                # Matched a ticket that is gone or still in flight, so nothing was claimed
+                detector.add(ticket['ticket_id'], signature)
+            else:
+                detector.rename(f"pending:{email_data['id']}", ticket['ticket_id'])
         
-        # Store ticket
-        self.tickets.append(ticket)
-        self.stats['total_tickets'] += 1
-        self.stats[f"{ticket['priority']}_priority"] += 1
+        # Send notification for simulated tickets too
+        self.send_notification_to_staff(ticket)
         
         return ticket
     
-    def resolve_ticket(self, ticket_id: str) -> bool:
-        """Mark a ticket as resolved"""
-        for ticket in self.tickets:
-            if ticket['ticket_id'] == ticket_id:
-                ticket['status'] = 'resolved'
-                ticket['resolved_at'] = datetime.now().isoformat()
-                print(f"✅ Ticket {ticket_id} marked as resolved")
-                return True
-        return False
+    def resolve_ticket(self, ticket_id: str) -> Optional[Dict]:
+        """Mark a ticket as resolved; returns the updated ticket (None if not found)"""
+        ticket = self.ticket_store.update(ticket_id, {
+            'status': 'resolved',
+            'resolved_at': datetime.now().isoformat()
+        })
+        if ticket:
+            print(f"✅ Ticket {ticket_id} marked as resolved")
+        return ticket
     
-    def escalate_ticket(self, ticket_id: str) -> bool:
-        """Escalate a ticket to higher priority"""
-        for ticket in self.tickets:
-            if ticket['ticket_id'] == ticket_id:
-                old_priority = ticket['priority']
-                if ticket['priority'] == 'low':
-                    ticket['priority'] = 'medium'
-                elif ticket['priority'] == 'medium':
-                    ticket['priority'] = 'high'
-                
-                ticket['escalated'] = True
-                ticket['escalated_at'] = datetime.now().isoformat()
-                print(f"⬆️ Ticket {ticket_id} escalated from {old_priority} to {ticket['priority']}")
-                return True
-        return False
+    def escalate_ticket(self, ticket_id: str) -> Optional[Dict]:
+        """Escalate a ticket to higher priority; returns the updated ticket (None if not found)"""
+        old_priorities = {}
+        
+        def _escalate(current: Dict) -> Dict:
+            old_priorities['priority'] = current['priority']
+            return {
+                'priority': {'low': 'medium', 'medium': 'high'}.get(current['priority'], current['priority']),
+                'escalated': True,
+                'escalated_at': datetime.now().isoformat()
+            }
+        
+        ticket = self.ticket_store.update(ticket_id, _escalate)
+        if ticket:
+            print(f"⬆️ Ticket {ticket_id} escalated from {old_priorities['priority']} to {ticket['priority']}")
+        return ticket
+    
+    def shutdown(self):
+        """Stop ingest and its parser processes, send held digests and queued notifications, hand off leases and log out pooled IMAP sessions"""
+        self.ingest_pipeline.stop()
+        # Spawned parser processes would otherwise outlive a dashboard restart or reload
+        self.mime_parser.shutdown(wait=True)
+        # The classifier's loop thread and its pooled HTTPS connections
+        self.ai_client.close()
+        # Held digest buckets go out now rather than dying with the process
+        self.notification_digest.stop()
+        # Whatever is still undelivered keeps notification_status='queued' and is re-queued on restart
+        undelivered = self.notification_outbox.stop(float(os.getenv('NOTIFY_SHUTDOWN_DRAIN_SECONDS', '10')))
+        if undelivered:
+            print(f"⚠️ {undelivered} notification(s) left queued for the next start")
+        if self.lease_manager:
+            self.lease_manager.stop()
+        for mailbox in self.mailboxes.values():
+            mailbox.imap_pool.close_all()
     
     def clear_all_tickets(self) -> int:
         """Clear all tickets and reset system"""
-        count = len(self.tickets)
-        self.tickets.clear()
-        self.processed_email_ids.clear()
+        count = self.ticket_store.clear()
         
         # Reset stats
         self.stats = {
-            'total_tickets': 0,
-            'high_priority': 0,
-            'medium_priority': 0,
-            'low_priority': 0,
-            'tickets_by_category': {},
             'start_time': datetime.now()
         }
         
@@ -668,18 +1180,20 @@ if __name__ == "__main__":
     print("🎯 Send test emails to see automatic ticket creation")
     print("📊 Use the web dashboard at http://localhost:8000")
     
+    def report_new_tickets(new_tickets: List[Dict]):
+        if new_tickets:
+            print(f"🎫 Created {len(new_tickets)} new tickets!")
+        else:
+            print("📭 No new emails found")
+    
+    watcher = system.create_inbox_watcher(on_tickets=report_new_tickets)
+    
     try:
-        while True:
-            print(f"\n🔍 [{datetime.now().strftime('%H:%M:%S')}] Checking for new emails...")
-            new_tickets = system.process_new_emails()
-            
-            if new_tickets:
-                print(f"🎫 Created {len(new_tickets)} new tickets!")
-            else:
-                print("📭 No new emails found")
-            
-            time.sleep(30)  # Check every 30 seconds
+        # Blocks in IMAP IDLE until the server reports new mail (adaptive polling if unsupported)
+        watcher.run()
             
     except KeyboardInterrupt:
+        watcher.stop()
+        system.shutdown()
         print(f"\n🛑 System stopped")
-        print(f"📊 Total tickets processed: {system.stats['total_tickets']}")
\ No newline at end of file
+        print(f"📊 Total tickets processed: {system.ticket_store.count()}")
\ No newline at end of file
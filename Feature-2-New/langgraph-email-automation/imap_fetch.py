@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Batched IMAP Fetch
+Fetches headers + BODYSTRUCTURE for a UID set in one command, then only the text part
+"""
+
+import re
+import email
+from email import policy
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from mime_parser import parse_fetched
+
+HEADER_FIELDS = 'FROM SUBJECT MESSAGE-ID DATE'
+
+_TOKEN_RE = re.compile(
+    rb'\(|\)|"(?:[^"\\]|\\.)*"|\{\d+\}|[^\s()"\[\]]+(?:\[[^\]]*\])?(?:<\d+>)?'
+)
+
+
+class _Literal(bytes):
+    """Marks a literal payload so it isn't mistaken for an atom"""
+
+
+def _tokenize(response: List) -> List:
+    """Flatten an imaplib FETCH response (bytes and (prefix, literal) tuples) into tokens"""
+    tokens = []
+    for item in response:
+        if item is None:
+            continue
+        if isinstance(item, tuple):
+            prefix, literal = item[0], item[1]
+            prefix_tokens = _TOKEN_RE.findall(prefix)
+            # The prefix ends with {n}; the literal bytes take its place
+            if prefix_tokens and prefix_tokens[-1].startswith(b'{'):
+                prefix_tokens.pop()
+            tokens.extend(prefix_tokens)
+            tokens.append(_Literal(literal))
+        else:
+            tokens.extend(_TOKEN_RE.findall(item))
+    return tokens
+
+
+def _parse_tokens(tokens: List, pos: int = 0) -> Tuple[List, int]:
+    """Parse parenthesised lists into nested Python lists"""
+    result = []
+    while pos < len(tokens):
+        token = tokens[pos]
+        if token == b'(':
+            nested, pos = _parse_tokens(tokens, pos + 1)
+            result.append(nested)
+            continue
+        if token == b')':
+            return result, pos + 1
+        if isinstance(token, _Literal):
+            result.append(bytes(token))
+        elif token.startswith(b'"'):
+            result.append(re.sub(rb'\\(.)', rb'\1', token[1:-1]))
+        elif token.upper() == b'NIL':
+            result.append(None)
+        else:
+            result.append(token)
+        pos += 1
+    return result, pos
+
+
+def parse_fetch_response(response: List) -> Dict[int, Dict[str, object]]:
+    """Turn a multi-message FETCH response into {uid: {ITEM: value}}"""
+    parsed, _ = _parse_tokens(_tokenize(response))
+    messages = {}
+    # Top level is: <seq> (<key> <value> <key> <value> ...) <seq> (...) ...
+    for i in range(0, len(parsed) - 1, 2):
+        items = parsed[i + 1]
+        if not isinstance(items, list):
+            continue
+        fields = {}
+        for j in range(0, len(items) - 1, 2):
+            key = items[j]
+            if isinstance(key, bytes):
+                fields[key.decode(errors='ignore').upper()] = items[j + 1]
+        uid = fields.get('UID')
+        if uid is not None:
+            messages[int(uid)] = fields
+    return messages
+
+
+def _text(value) -> str:
+    return value.decode(errors='ignore') if isinstance(value, bytes) else ''
+
+
+def _params(value) -> Dict[str, str]:
+    if not isinstance(value, list):
+        return {}
+    return {_text(value[i]).lower(): _text(value[i + 1]) for i in range(0, len(value) - 1, 2)}
+
+
+def find_text_part(structure, prefix: str = '', subtype: str = 'plain') -> Optional[Dict[str, str]]:
+    """Locate the first inline text/<subtype> part; returns its section, encoding and charset"""
+    if not isinstance(structure, list) or not structure:
+        return None
+
+    if isinstance(structure[0], list):
+        # Multipart: children come first, then the subtype string
+        for index, child in enumerate(structure):
+            if not isinstance(child, list):
+                break
+            section = f"{prefix}.{index + 1}" if prefix else str(index + 1)
+            found = find_text_part(child, section, subtype)
+            if found:
+                return found
+        return None
+
+    main_type = _text(structure[0]).lower()
+    sub_type = _text(structure[1]).lower() if len(structure) > 1 else ''
+    if main_type != 'text':
+        # message/rfc822 attachments and binary parts are never fetched
+        return None
+
+    # Extension data: [..., size, lines, md5, disposition, ...]
+    disposition = structure[9] if len(structure) > 9 else None
+    if isinstance(disposition, list) and _text(disposition[0]).lower() == 'attachment':
+        return None
+
+    # A single-part message is section 1; only accept the wanted subtype inside multiparts
+    if prefix and sub_type != subtype:
+        return None
+    return {
+        'section': prefix or '1',
+        'subtype': sub_type,
+        'encoding': _text(structure[5]).lower() if len(structure) > 5 else '7bit',
+        # No declared charset is left to the decoder to detect rather than assumed
+        'charset': _params(structure[2] if len(structure) > 2 else None).get('charset')
+    }
+
+
+def _chunks(items: List[int], size: int) -> Iterable[List[int]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _uid_set(uids: Iterable[int]) -> str:
+    return ','.join(str(uid) for uid in uids)
+
+
+def fetch_messages(mail, uids: List[int], max_body_bytes: int = 16384,
+                   batch_size: int = 100, decode: bool = True) -> Dict[int, Dict]:
+    """Fetch sender/subject/body for many UIDs with two round trips per batch
+
+    Returns {uid: {'sender', 'subject', 'message_id', 'date', 'body'}}. Messages
+    whose structure could not be read are returned with body=None so the caller
+    can fall back to a full fetch. With decode=False the text part is left as
+    'payload' bytes plus its 'part' description for mime_parser to decode later.
+    """
+    results: Dict[int, Dict] = {}
+
+    for batch in _chunks(list(uids), batch_size):
+        status, response = mail.uid(
+            'FETCH', _uid_set(batch),
+            f'(UID BODYSTRUCTURE BODY.PEEK[HEADER.FIELDS ({HEADER_FIELDS})])'
+        )
+        if status != 'OK':
+            continue
+
+        # Group text sections so each distinct section is fetched once for all UIDs
+        sections: Dict[str, List[int]] = {}
+        parts: Dict[int, Dict] = {}
+        for uid, fields in parse_fetch_response(response).items():
+            header_bytes = next(
+                (value for key, value in fields.items() if key.startswith('BODY[HEADER')), b''
+            ) or b''
+            headers = email.message_from_bytes(header_bytes, policy=policy.default)
+            results[uid] = {
+                'sender': str(headers.get('From', '') or ''),
+                'subject': str(headers.get('Subject', '') or ''),
+                'message_id': str(headers.get('Message-ID', '') or ''),
+                'date': str(headers.get('Date', '') or ''),
+                'body': None
+            }
+            # text/plain when there is one, else the HTML part (converted to text when decoded)
+            part = find_text_part(fields.get('BODYSTRUCTURE')) or find_text_part(fields.get('BODYSTRUCTURE'), subtype='html')
+            if part:
+                parts[uid] = part
+                sections.setdefault(part['section'], []).append(uid)
+            elif isinstance(fields.get('BODYSTRUCTURE'), list):
+                # Parsed fine but there is no text part
+                results[uid]['body'] = ''
+
+        for section, section_uids in sections.items():
+            status, response = mail.uid(
+                'FETCH', _uid_set(section_uids),
+                f'(UID BODY.PEEK[{section}]<0.{max_body_bytes}>)'
+            )
+            if status != 'OK':
+                continue
+            for uid, fields in parse_fetch_response(response).items():
+                payload = next(
+                    (value for key, value in fields.items() if key.startswith(f'BODY[{section}]')), None
+                )
+                if uid in parts and isinstance(payload, bytes):
+                    if decode:
+                        results[uid]['body'] = parse_fetched({'payload': payload, 'part': parts[uid]})['body']
+                    else:
+                        results[uid].update({'body': '', 'payload': payload, 'part': parts[uid]})
+
+    return results
+
+
+def mark_seen(mail, uids: List[int]):
+    """Flag processed messages as read in one STORE (PEEK fetches leave them unread)"""
+    if uids:
+        mail.uid('STORE', _uid_set(uids), '+FLAGS', '(\\Seen)')
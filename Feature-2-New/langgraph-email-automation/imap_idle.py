@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Feature-2: IMAP IDLE Inbox Watcher
+Push-style inbox monitoring (RFC 2177) with adaptive polling fallback
+"""
+
+import time
+import select
+import imaplib
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from imap_pool import IMAPConnectionPool, IMAPConnectionError
+
+
+class IdleNotSupported(Exception):
+    """Raised when the server does not advertise or accept IDLE"""
+
+
+class InboxWatcher:
+    """Wakes the ingest pipeline only when the mailbox reports new mail"""
+
+    def __init__(self, pool: IMAPConnectionPool, on_change: Callable[[], int],
+                 has_pending: Optional[Callable[[], bool]] = None, idle_timeout: float = 1500.0, read_slice: float = 1.0,
+                 min_poll_interval: float = 5.0, max_poll_interval: float = 60.0, done_timeout: float = 10.0):
+        """
+        pool: dedicated single-connection pool (IDLE holds its session for the whole wait)
+        on_change: callback that runs one ingest cycle and returns the number of new tickets
+        has_pending: when it returns True, run another cycle right away instead of idling
+        idle_timeout: re-issue IDLE before the server's 29 minute limit (RFC 2177)
+        done_timeout: how long to wait for the IDLE completion after DONE before dropping the session
+        """
+        self.pool = pool
+        self.on_change = on_change
+        self.has_pending = has_pending
+        self.idle_timeout = idle_timeout
+        self.read_slice = read_slice
+        self.done_timeout = done_timeout
+        self.min_poll_interval = min_poll_interval
+        self.max_poll_interval = max_poll_interval
+
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.idle_supported: Optional[bool] = None
+        self.poll_interval = min_poll_interval
+        self.stats = {
+            'mode': 'stopped',
+            'wakeups': 0,
+            'idle_sessions': 0,
+            'polls': 0,
+            'last_wakeup_at': None,
+            'last_error': None
+        }
+
+    # ------------------------------------------------------------------
+    # IDLE protocol
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _buffered(mail) -> bool:
+        """True if response bytes already sit in imaplib's read buffer (select() cannot see those)"""
+        sock = mail.socket()
+        previous_timeout = sock.gettimeout()
+        sock.setblocking(False)
+        try:
+            return bool(mail.file.peek(1))
+        except OSError:
+            # Nothing available without blocking (BlockingIOError / SSLWantReadError)
+            return False
+        finally:
+            sock.settimeout(previous_timeout)
+
+    def _line_ready(self, mail, timeout: float) -> bool:
+        """Wait up to `timeout` for a response line
+
+        Never via a socket timeout: once a read on imaplib's socket file times out,
+        every later read fails with "cannot read from timed out object".
+        """
+        if self._buffered(mail):
+            return True
+        readable, _, _ = select.select([mail.socket()], [], [], max(0.0, timeout))
+        return bool(readable)
+
+    def _wait_for_changes(self, mail) -> bool:
+        """Run one IDLE command; True if EXISTS/RECENT was seen, False on timeout/stop"""
+        if 'IDLE' not in getattr(mail, 'capabilities', ()):
+            raise IdleNotSupported("Server does not advertise IDLE")
+
+        tag = mail._new_tag()
+        mail.send(tag + b' IDLE\r\n')
+        response = mail.readline()
+        if not response.startswith(b'+'):
+            raise IdleNotSupported(f"IDLE rejected: {response.decode(errors='ignore').strip()}")
+        self.stats['idle_sessions'] += 1
+
+        changed = False
+        deadline = time.monotonic() + self.idle_timeout
+        try:
+            while not self._stop_event.is_set() and time.monotonic() < deadline:
+                if not self._line_ready(mail, min(self.read_slice, deadline - time.monotonic())):
+                    continue
+                line = mail.readline()
+                if not line:
+                    raise imaplib.IMAP4.abort("Connection closed during IDLE")
+                # Untagged "* <n> EXISTS" / "* <n> RECENT" mean new mail arrived
+                if line.startswith(b'*') and (b'EXISTS' in line or b'RECENT' in line):
+                    changed = True
+                    break
+        finally:
+            mail.send(b'DONE\r\n')
+            # Drain until the tagged completion of the IDLE command
+            done_deadline = time.monotonic() + self.done_timeout
+            while True:
+                if not self._line_ready(mail, done_deadline - time.monotonic()):
+                    raise imaplib.IMAP4.abort("No completion for IDLE after DONE")
+                line = mail.readline()
+                if not line or line.startswith(tag):
+                    break
+                if line.startswith(b'*') and (b'EXISTS' in line or b'RECENT' in line):
+                    changed = True
+        return changed
+
+    # ------------------------------------------------------------------
+    # Main loop
+    # ------------------------------------------------------------------
+
+    def _wake(self) -> int:
+        self.stats['wakeups'] += 1
+        self.stats['last_wakeup_at'] = datetime.now().isoformat()
+        try:
+            return self.on_change() or 0
+        except Exception as e:
+            self.stats['last_error'] = str(e)
+            print(f"❌ Inbox watcher callback failed: {e}")
+            return 0
+
+    def _poll_once(self):
+        """Adaptive polling: back off while the inbox is quiet, reset on new mail"""
+        self.stats['mode'] = 'polling'
+        self.stats['polls'] += 1
+        found = self._wake()
+        if found:
+            self.poll_interval = self.min_poll_interval
+        else:
+            self.poll_interval = min(self.max_poll_interval, self.poll_interval * 2)
+        self._stop_event.wait(self.poll_interval)
+
+    def run(self):
+        """Blocking watch loop; returns after stop() is called"""
+        print("👀 Inbox watcher started")
+
+        # Catch up on anything that arrived while we weren't watching
+        self._wake()
+
+        while not self._stop_event.is_set():
+            if self.has_pending and self.has_pending():
+                # Previous cycle ran out of budget; keep draining before waiting for new mail
+                self._wake()
+                continue
+
+            if self.idle_supported is False:
+                self._poll_once()
+                continue
+
+            try:
+                with self.pool.connection() as mail:
+                    self.stats['mode'] = 'idle'
+                    changed = self._wait_for_changes(mail)
+                self.idle_supported = True
+                if changed:
+                    self._wake()
+            except IdleNotSupported as e:
+                print(f"⚠️ {e} - falling back to adaptive polling")
+                self.idle_supported = False
+            except IMAPConnectionError as e:
+                # Pool is backing off; poll-wait instead of spinning
+                self.stats['last_error'] = str(e)
+                self._stop_event.wait(self.min_poll_interval)
+            except Exception as e:
+                self.stats['last_error'] = str(e)
+                print(f"❌ IDLE session failed, reconnecting: {e}")
+                self._stop_event.wait(self.min_poll_interval)
+
+        self.stats['mode'] = 'stopped'
+        print("🛑 Inbox watcher stopped")
+
+    def start(self) -> threading.Thread:
+        """Run the watch loop on a daemon thread"""
+        if self._thread and self._thread.is_alive():
+            return self._thread
+        # Cleared here, not in run(): a stop() issued right after start() must not be lost
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self.run, name='inbox-watcher', daemon=True)
+        self._thread.start()
+        return self._thread
+
+    def stop(self):
+        """Ask the watch loop to exit (within one read slice)"""
+        self._stop_event.set()
+
+    def join(self, timeout: Optional[float] = None):
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def is_running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def is_stopping(self) -> bool:
+        return self._stop_event.is_set() and self.is_running()
+
+    def get_status(self) -> Dict:
+        status = dict(self.stats)
+        status.update({
+            'idle_supported': self.idle_supported,
+            'poll_interval_s': self.poll_interval
+        })
+        return status
+
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Feature-2: IMAP Connection Pool
+Long-lived, health-checked IMAP sessions shared by the Gmail ticket system
+"""
+
+import time
+import imaplib
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class IMAPConnectionError(Exception):
+    """Raised when no healthy IMAP connection can be obtained"""
+
+
+class _PooledConnection:
+    """A logged-in IMAP session plus bookkeeping"""
+
+    def __init__(self, imap: imaplib.IMAP4_SSL):
+        self.imap = imap
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+    def touch(self):
+        self.last_used = time.monotonic()
+
+    def idle_seconds(self) -> float:
+        return time.monotonic() - self.last_used
+
+
+class IMAPConnectionPool:
+    """Small pool of authenticated IMAP connections with NOOP keepalive and reconnect backoff"""
+
+    def __init__(self, host: str, username: str, password: str, mailbox: str = 'inbox',
+                 max_size: int = 2, keepalive_interval: float = 60.0,
+                 acquire_timeout: float = 30.0, initial_backoff: float = 1.0,
+                 max_backoff: float = 60.0):
+        self.host = host
+        self.username = username
+        self.password = password
+        self.mailbox = mailbox
+        self.max_size = max(1, max_size)
+        self.keepalive_interval = keepalive_interval
+        self.acquire_timeout = acquire_timeout
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+        self._idle: List[_PooledConnection] = []
+        self._in_use = 0
+        self._condition = threading.Condition()
+
+        # Reconnect backoff state
+        self._consecutive_failures = 0
+        self._next_attempt_at = 0.0
+        self._last_error: Optional[str] = None
+
+        # Keepalive thread
+        self._keepalive_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # Metrics
+        self.metrics = {
+            'connections_opened': 0,
+            'reconnects': 0,
+            'connect_failures': 0,
+            'health_check_failures': 0,
+            'noop_keepalives': 0,
+            'acquisitions': 0,
+            'last_handshake_ms': None,
+            'avg_handshake_ms': None,
+            'last_connected_at': None
+        }
+
+    # ------------------------------------------------------------------
+    # Connection lifecycle
+    # ------------------------------------------------------------------
+
+    def _open_connection(self) -> _PooledConnection:
+        """Open, authenticate and select mailbox, honouring reconnect backoff"""
+        now = time.monotonic()
+        if now < self._next_attempt_at:
+            wait = self._next_attempt_at - now
+            raise IMAPConnectionError(
+                f"IMAP reconnect backing off for {wait:.1f}s after error: {self._last_error}"
+            )
+
+        started = time.perf_counter()
+        try:
+            imap = imaplib.IMAP4_SSL(self.host)
+            imap.login(self.username, self.password)
+            imap.select(self.mailbox)
+        except Exception as e:
+            self._record_failure(e)
+            raise IMAPConnectionError(f"IMAP connection failed: {e}") from e
+
+        handshake_ms = (time.perf_counter() - started) * 1000
+        self._record_success(handshake_ms)
+        return _PooledConnection(imap)
+
+    def _record_success(self, handshake_ms: float):
+        with self._condition:
+            if self.metrics['connections_opened'] > 0:
+                self.metrics['reconnects'] += 1
+            self.metrics['connections_opened'] += 1
+            self.metrics['last_handshake_ms'] = round(handshake_ms, 1)
+            previous = self.metrics['avg_handshake_ms']
+            self.metrics['avg_handshake_ms'] = round(
+                handshake_ms if previous is None else previous * 0.8 + handshake_ms * 0.2, 1
+            )
+            self.metrics['last_connected_at'] = datetime.now().isoformat()
+            self._consecutive_failures = 0
+            self._next_attempt_at = 0.0
+            self._last_error = None
+
+    def _record_failure(self, error: Exception):
+        with self._condition:
+            self.metrics['connect_failures'] += 1
+            self._consecutive_failures += 1
+            backoff = min(self.max_backoff, self.initial_backoff * (2 ** (self._consecutive_failures - 1)))
+            self._next_attempt_at = time.monotonic() + backoff
+            self._last_error = str(error)
+        print(f"❌ IMAP connection failed ({self._consecutive_failures}x), retrying in {backoff:.0f}s: {error}")
+
+    def _is_healthy(self, conn: _PooledConnection) -> bool:
+        """Cheap liveness check: NOOP only when the session has been idle a while"""
+        if conn.idle_seconds() < self.keepalive_interval:
+            return True
+        try:
+            status, _ = conn.imap.noop()
+            with self._condition:
+                self.metrics['noop_keepalives'] += 1
+            if status == 'OK':
+                conn.touch()
+                return True
+        except Exception:
+            pass
+        with self._condition:
+            self.metrics['health_check_failures'] += 1
+        return False
+
+    @staticmethod
+    def _discard(conn: _PooledConnection):
+        try:
+            conn.imap.logout()
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def acquire(self) -> _PooledConnection:
+        """Borrow a healthy connection, opening a new one if the pool has room"""
+        deadline = time.monotonic() + self.acquire_timeout
+        while True:
+            with self._condition:
+                conn = self._idle.pop() if self._idle else None
+                if conn is None:
+                    if self._in_use < self.max_size:
+                        self._in_use += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise IMAPConnectionError("Timed out waiting for a free IMAP connection")
+                    self._condition.wait(remaining)
+                    continue
+                self._in_use += 1
+
+            # Health check outside the lock so other callers aren't blocked by NOOP
+            if self._is_healthy(conn):
+                with self._condition:
+                    self.metrics['acquisitions'] += 1
+                return conn
+            self._discard(conn)
+            with self._condition:
+                self._in_use -= 1
+
+        try:
+            conn = self._open_connection()
+        except Exception:
+            with self._condition:
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self.metrics['acquisitions'] += 1
+        return conn
+
+    def release(self, conn: _PooledConnection, broken: bool = False):
+        """Return a connection to the pool, or drop it if it failed mid-use"""
+        if broken:
+            self._discard(conn)
+        else:
+            conn.touch()
+        with self._condition:
+            self._in_use -= 1
+            if not broken:
+                self._idle.append(conn)
+            self._condition.notify()
+
+    @contextmanager
+    def connection(self):
+        """Context manager yielding a ready-to-use imaplib session"""
+        conn = self.acquire()
+        try:
+            yield conn.imap
+        except (imaplib.IMAP4.abort, OSError):
+            self.release(conn, broken=True)
+            raise
+        except Exception:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def keepalive(self):
+        """Send NOOP on idle connections so the server doesn't drop them"""
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._in_use += len(idle)
+        for conn in idle:
+            self.release(conn, broken=not self._is_healthy(conn))
+
+    def start_keepalive(self):
+        """Start a daemon thread that periodically keeps idle sessions alive"""
+        if self._keepalive_thread and self._keepalive_thread.is_alive():
+            return
+        self._stop_event.clear()
+
+        def _run():
+            while not self._stop_event.wait(self.keepalive_interval):
+                self.keepalive()
+
+        self._keepalive_thread = threading.Thread(target=_run, name='imap-keepalive', daemon=True)
+        self._keepalive_thread.start()
+
+    def close_all(self):
+        """Log out every idle connection and stop the keepalive thread"""
+        self._stop_event.set()
+        with self._condition:
+            idle = list(self._idle)
+            self._idle.clear()
+        for conn in idle:
+            self._discard(conn)
+
+    def get_metrics(self) -> Dict:
+        """Snapshot of pool metrics for stats and health endpoints"""
+        with self._condition:
+            metrics = dict(self.metrics)
+            metrics.update({
+                'pool_size': self.max_size,
+                'idle_connections': len(self._idle),
+                'in_use_connections': self._in_use,
+                'consecutive_failures': self._consecutive_failures,
+                'backoff_remaining_s': round(max(0.0, self._next_attempt_at - time.monotonic()), 1),
+                'last_error': self._last_error
+            })
+        return metrics
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Ingest Coordinator
+Single-flight inbox cycles and at most one monitor loop per process
+"""
+
+import time
+import asyncio
+import threading
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from imap_idle import InboxWatcher
+from ingest_worker import IngestWorker
+
+
+class IngestCoordinator:
+    """Callers that ask for a cycle while one is running join it instead of starting another"""
+
+    def __init__(self, worker: IngestWorker, cycle: Callable[[], List[Dict]]):
+        self.worker = worker
+        self.cycle = cycle
+
+        self._lock = threading.Lock()
+        self._inflight: Optional[Future] = None
+        self._current: Optional[Dict] = None
+        self._watcher: Optional[InboxWatcher] = None
+        # Serialises start_monitor/stop_monitor (held while joining, so never taken by a cycle)
+        self._monitor_lock = threading.Lock()
+        self.stats = {
+            'cycles_started': 0,
+            'cycles_completed': 0,
+            'cycles_failed': 0,
+            'joined_callers': 0,
+            'last_trigger': None,
+            'last_started_at': None,
+            'last_finished_at': None,
+            'last_duration_s': None,
+            'last_new_tickets': None,
+            'last_error': None
+        }
+
+    # ------------------------------------------------------------------
+    # Single-flight cycles
+    # ------------------------------------------------------------------
+
+    def _run_cycle(self, trigger: str) -> List[Dict]:
+        started = time.monotonic()
+        try:
+            new_tickets = self.cycle()
+        except Exception as e:
+            with self._lock:
+                self.stats['cycles_failed'] += 1
+                self.stats['last_error'] = str(e)
+            raise
+        else:
+            with self._lock:
+                self.stats['cycles_completed'] += 1
+                self.stats['last_new_tickets'] = len(new_tickets)
+            return new_tickets
+        finally:
+            with self._lock:
+                self._current = None
+                self.stats['last_finished_at'] = datetime.now().isoformat()
+                self.stats['last_duration_s'] = round(time.monotonic() - started, 3)
+
+    def submit(self, trigger: str = 'manual') -> Future:
+        """Start a cycle, or return the one already in flight"""
+        with self._lock:
+            if self._inflight is not None and not self._inflight.done():
+                self.stats['joined_callers'] += 1
+                if self._current:
+                    self._current['joined'] += 1
+                return self._inflight
+            self.stats['cycles_started'] += 1
+            self.stats['last_trigger'] = trigger
+            self.stats['last_started_at'] = datetime.now().isoformat()
+            self._current = {'trigger': trigger, 'started_at': self.stats['last_started_at'], 'joined': 0}
+            self._inflight = self.worker.submit(self._run_cycle, trigger)
+            return self._inflight
+
+    async def run(self, trigger: str = 'manual') -> List[Dict]:
+        """Await a (possibly shared) cycle without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(trigger))
+
+    def run_blocking(self, trigger: str = 'monitor') -> List[Dict]:
+        """Blocking variant for the monitor thread"""
+        return self.submit(trigger).result()
+
+    # ------------------------------------------------------------------
+    # Monitor loop
+    # ------------------------------------------------------------------
+
+    def start_monitor(self, create_watcher: Callable[[Callable[[], List[Dict]]], InboxWatcher],
+                      stop_timeout: float = 30.0) -> bool:
+        """Start the inbox watcher unless one is already running; returns True if started"""
+        with self._monitor_lock:
+            with self._lock:
+                watcher = self._watcher
+            if watcher is not None and watcher.is_running():
+                if not watcher.is_stopping():
+                    return False
+                # An earlier stop timed out: the old loop must exit before another one starts
+                watcher.join(stop_timeout)
+                if watcher.is_running():
+                    print("⚠️ Previous inbox watcher is still stopping; not starting another")
+                    return False
+            watcher = create_watcher(self.run_blocking)
+            watcher.start()
+            with self._lock:
+                self._watcher = watcher
+            return True
+
+    def stop_monitor(self, timeout: float = 30.0) -> bool:
+        """Stop the inbox watcher and wait for its loop to exit; returns True if one was running"""
+        with self._monitor_lock:
+            with self._lock:
+                watcher = self._watcher
+            running = watcher is not None and watcher.is_running()
+            if watcher is not None:
+                watcher.stop()
+                # Bounded by the cycle in flight (its time budget) plus one IDLE read slice
+                watcher.join(timeout)
+            return running
+
+    def is_monitoring(self) -> bool:
+        with self._lock:
+            return self._watcher is not None and self._watcher.is_running()
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            status = dict(self.stats)
+            status['state'] = 'running' if self._current else 'idle'
+            status['current_cycle'] = dict(self._current) if self._current else None
+            watcher = self._watcher
+        status['monitoring'] = bool(watcher and watcher.is_running())
+        status['watcher'] = watcher.get_status() if watcher else None
+        status['worker'] = self.worker.get_status()
+        return status
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Ingest Leases
+One ingest owner per mailbox across processes, via expiring leases in the shared ticket store
+"""
+
+import os
+import math
+import uuid
+import time
+import socket
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from ticket_store import TicketRepository
+
+MEMBER_PREFIX = 'member:'
+
+
+class LeaseManager:
+    """Holds this process's share of mailbox leases, renewing them before they expire
+
+    Every live process also holds a 'member:<owner>' lease, so each can compute a fair share
+    (mailboxes / live processes) and hand extra mailboxes to newcomers between cycles.
+    """
+
+    def __init__(self, store: TicketRepository, names: List[str], owner: Optional[str] = None,
+                 ttl_seconds: float = 30.0, renew_interval: float = 10.0,
+                 on_acquired: Optional[Callable[[str], None]] = None,
+                 on_lost: Optional[Callable[[str], None]] = None,
+                 busy: Optional[Callable[[], bool]] = None):
+        self.store = store
+        self.names = list(names)
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.ttl_seconds = ttl_seconds
+        self.renew_interval = renew_interval
+        self.on_acquired = on_acquired
+        self.on_lost = on_lost
+        self.busy = busy
+
+        self._lock = threading.Lock()
+        self._held: set = set()
+        # name -> monotonic time until which writes for it are still safe (see holds())
+        self._safe_until: Dict[str, float] = {}
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {
+            'acquired': 0,
+            'lost': 0,
+            'handed_off': 0,
+            'last_renewed_at': None,
+            'last_error': None
+        }
+
+    def _fair_share(self, leases: Dict[str, Dict]) -> int:
+        members = sum(1 for name in leases if name.startswith(MEMBER_PREFIX))
+        return math.ceil(len(self.names) / max(1, members))
+
+    def tick(self):
+        """Renew held leases, hand off extras above the fair share, then claim free ones up to it"""
+        started = time.monotonic()
+        self.store.acquire_lease(f"{MEMBER_PREFIX}{self.owner}", self.owner, self.ttl_seconds)
+        leases = self.store.list_leases()
+        share = self._fair_share(leases)
+
+        with self._lock:
+            previous = set(self._held)
+        held = {name for name in sorted(previous) if self.store.acquire_lease(name, self.owner, self.ttl_seconds)}
+        lost = previous - held
+
+        # Only between cycles, so a mailbox never changes owner with its messages in flight
+        handed_off = set()
+        if len(held) > share and not (self.busy and self.busy()):
+            for name in sorted(held, reverse=True)[:len(held) - share]:
+                self.store.release_lease(name, self.owner)
+                handed_off.add(name)
+            held -= handed_off
+
+        acquired = set()
+        for name in self.names:
+            if len(held) >= share:
+                break
+            lease = leases.get(name)
+            if name in held or (lease and lease['owner'] != self.owner):
+                continue
+            if self.store.acquire_lease(name, self.owner, self.ttl_seconds):
+                held.add(name)
+                acquired.add(name)
+
+        with self._lock:
+            self._held = held
+            # Every lease in `held` was written after `started`; a third of the TTL is kept in reserve
+            # for a write already under way when the fence was checked
+            self._safe_until = {name: started + self.ttl_seconds * 2 / 3 for name in held}
+            self.stats['acquired'] += len(acquired)
+            self.stats['lost'] += len(lost)
+            self.stats['handed_off'] += len(handed_off)
+            self.stats['last_renewed_at'] = datetime.now().isoformat()
+
+        for name in sorted(acquired):
+            print(f"🔑 Ingest lease acquired: {name} ({self.owner})")
+            if self.on_acquired:
+                self.on_acquired(name)
+        for name in sorted(lost | handed_off):
+            print(f"🔓 Ingest lease {'lost' if name in lost else 'handed off'}: {name}")
+            if self.on_lost:
+                self.on_lost(name)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                self.tick()
+            except Exception as e:
+                with self._lock:
+                    self.stats['last_error'] = str(e)
+                print(f"⚠️ Ingest lease renewal failed: {e}")
+            self._stop_event.wait(self.renew_interval)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='ingest-leases', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop renewing and release everything so another process can take over at once"""
+        self._stop_event.set()
+        # A tick still running would re-acquire what is released below
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        with self._lock:
+            held, self._held = self._held, set()
+            self._safe_until = {}
+        for name in held:
+            self.store.release_lease(name, self.owner)
+        self.store.release_lease(f"{MEMBER_PREFIX}{self.owner}", self.owner)
+
+    def holds(self, name: str) -> bool:
+        """Fence for ingest writes: False once the lease is lost, or could have expired unrenewed"""
+        with self._lock:
+            return name in self._held and time.monotonic() < self._safe_until.get(name, 0.0)
+
+    def live_owners(self) -> set:
+        """Owners of every process currently holding a member lease (this one included)"""
+        return {lease['owner'] for name, lease in self.store.list_leases().items()
+                if name.startswith(MEMBER_PREFIX)}
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            status = dict(self.stats)
+            status['held'] = sorted(self._held)
+        status['owner'] = self.owner
+        status['leases'] = {name: lease for name, lease in self.store.list_leases().items()
+                            if not name.startswith(MEMBER_PREFIX)}
+        return status
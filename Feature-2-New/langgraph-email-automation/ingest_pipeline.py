@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Ingest Pipeline
+Fetch → parse → classify → write → notify as stages joined by bounded queues
+"""
+
+import time
+import queue
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+
+class PipelineBatch:
+    """One ingest cycle's items in flight; finished once every item has left the pipeline"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # Per-cycle scratch space shared by stages (e.g. leader email id -> ticket id)
+        self.context: Dict[str, Any] = {}
+        self.results: List[Any] = []
+        self.errors = 0
+        self._in_flight = 0
+        self._done = threading.Event()
+        self._done.set()
+
+    def _adjust(self, delta: int):
+        with self.lock:
+            self._in_flight += delta
+            if self._in_flight > 0:
+                self._done.clear()
+            else:
+                self._done.set()
+
+    def wait(self, timeout: Optional[float] = None) -> List[Any]:
+        """Block until every submitted item has been written out (or dropped on error)"""
+        self._done.wait(timeout)
+        with self.lock:
+            return list(self.results)
+
+    def done(self) -> bool:
+        return self._done.is_set()
+
+
+class PipelineStage:
+    """A handler run by `workers` threads; each call gets up to `batch_size` queued items of one batch"""
+
+    def __init__(self, name: str, handler: Callable[[PipelineBatch, List[Any]], List[Any]],
+                 workers: int = 1, queue_size: int = 100, batch_size: int = 1):
+        self.name = name
+        self.handler = handler
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, queue_size))
+
+        self._lock = threading.Lock()
+        self._busy = 0
+        self.stats = {
+            'items_in': 0,
+            'items_out': 0,
+            'errors': 0,
+            'calls': 0,
+            'busy_seconds': 0.0,
+            'blocked_seconds': 0.0,
+            'max_queue_depth': 0,
+            'last_call_ms': None
+        }
+
+    def _record(self, items: int, outputs: int, seconds: float, failed: bool):
+        with self._lock:
+            self.stats['calls'] += 1
+            self.stats['items_in'] += items
+            self.stats['items_out'] += outputs
+            self.stats['busy_seconds'] += seconds
+            self.stats['last_call_ms'] = round(seconds * 1000, 1)
+            if failed:
+                self.stats['errors'] += items
+
+    def get_stats(self) -> Dict:
+        depth = self.queue.qsize()
+        with self._lock:
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], depth)
+            stats = dict(self.stats)
+            stats['busy_workers'] = self._busy
+        items = stats['items_in']
+        stats.update({
+            'workers': self.workers,
+            'batch_size': self.batch_size,
+            'queue_depth': depth,
+            'queue_capacity': self.queue.maxsize,
+            'avg_item_ms': round(stats['busy_seconds'] * 1000 / items, 1) if items else None,
+            'busy_seconds': round(stats['busy_seconds'], 3),
+            'blocked_seconds': round(stats['blocked_seconds'], 3)
+        })
+        return stats
+
+
+class StagedPipeline:
+    """Stages run concurrently; a full downstream queue blocks the stage feeding it (backpressure)"""
+
+    def __init__(self, stages: List[PipelineStage], poll_interval: float = 0.5):
+        self.stages = stages
+        self.poll_interval = poll_interval
+        self._running = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    def start(self):
+        if self._running.is_set():
+            return
+        self._running.set()
+        for index, stage in enumerate(self.stages):
+            for worker in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._work, args=(index,),
+                    name=f"ingest-{stage.name}-{worker}", daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self):
+        self._running.clear()
+        for thread in self._threads:
+            thread.join(timeout=self.poll_interval * 2)
+        self._threads = []
+
+    def submit(self, item: Any, batch: PipelineBatch, timeout: Optional[float] = None) -> bool:
+        """Feed the first stage; blocks while it is full, at most `timeout` seconds (False if it stayed full)"""
+        batch._adjust(1)
+        if not self._put(self.stages[0], (batch, item), None, timeout):
+            batch._adjust(-1)
+            return False
+        return True
+
+    def _put(self, stage: PipelineStage, entry, upstream: Optional[PipelineStage],
+             timeout: Optional[float] = None) -> bool:
+        started = time.monotonic()
+        if timeout is not None:
+            try:
+                stage.queue.put(entry, timeout=timeout)
+            except queue.Full:
+                return False
+        else:
+            # Stage-to-stage handoff: wait as long as the pipeline runs, but let stop() end the wait
+            while True:
+                try:
+                    stage.queue.put(entry, timeout=self.poll_interval)
+                    break
+                except queue.Full:
+                    if not self._running.is_set():
+                        return False
+        if upstream is not None:
+            waited = time.monotonic() - started
+            with upstream._lock:
+                upstream.stats['blocked_seconds'] += waited
+        depth = stage.queue.qsize()
+        with stage._lock:
+            if depth > stage.stats['max_queue_depth']:
+                stage.stats['max_queue_depth'] = depth
+        return True
+
+    def _take(self, stage: PipelineStage) -> Optional[List]:
+        try:
+            entries = [stage.queue.get(timeout=self.poll_interval)]
+        except queue.Empty:
+            return None
+        # Opportunistic micro-batch: whatever else is already waiting, up to batch_size
+        while len(entries) < stage.batch_size:
+            try:
+                entries.append(stage.queue.get_nowait())
+            except queue.Empty:
+                break
+        return entries
+
+    def _work(self, index: int):
+        stage = self.stages[index]
+        downstream = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while self._running.is_set():
+            entries = self._take(stage)
+            if not entries:
+                continue
+
+            groups: "OrderedDict[int, tuple]" = OrderedDict()
+            for batch, payload in entries:
+                groups.setdefault(id(batch), (batch, []))[1].append(payload)
+
+            with stage._lock:
+                stage._busy += 1
+            try:
+                for batch, payloads in groups.values():
+                    started = time.monotonic()
+                    failed = False
+                    try:
+                        outputs = stage.handler(batch, payloads) or []
+                    except Exception as e:
+                        print(f"❌ Ingest stage '{stage.name}' failed on {len(payloads)} item(s): {e}")
+                        outputs, failed = [], True
+                        with batch.lock:
+                            batch.errors += len(payloads)
+                    stage._record(len(payloads), len(outputs), time.monotonic() - started, failed)
+
+                    # Count outputs in before the inputs leave so the batch never looks finished early
+                    batch._adjust(len(outputs))
+                    if downstream is not None:
+                        for output in outputs:
+                            if not self._put(downstream, (batch, output), stage):
+                                # Stopped with the next stage full: the item is dropped (its UID stays unprocessed)
+                                with batch.lock:
+                                    batch.errors += 1
+                                batch._adjust(-1)
+                    else:
+                        with batch.lock:
+                            batch.results.extend(outputs)
+                        batch._adjust(-len(outputs))
+                    batch._adjust(-len(payloads))
+            finally:
+                with stage._lock:
+                    stage._busy -= 1
+
+    def get_stats(self) -> Dict:
+        return {
+            'running': self._running.is_set(),
+            'stages': {stage.name: stage.get_stats() for stage in self.stages}
+        }
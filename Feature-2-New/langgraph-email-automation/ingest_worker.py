@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Ingest Worker
+Runs the blocking email pipeline (IMAP, AI, SMTP) off the FastAPI event loop
+"""
+
+import time
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict
+
+
+class IngestWorker:
+    """Dedicated worker thread for ingest jobs, with status the API can report"""
+
+    def __init__(self, max_workers: int = 1):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='email-ingest')
+        self._lock = threading.Lock()
+        self._running: Dict[int, Dict] = {}
+        self._next_job_id = 0
+        self.status = {
+            'jobs_submitted': 0,
+            'jobs_completed': 0,
+            'jobs_failed': 0,
+            'last_job': None,
+            'last_started_at': None,
+            'last_finished_at': None,
+            'last_duration_s': None,
+            'last_result_count': None,
+            'last_error': None
+        }
+
+    def _run_job(self, job_id: int, name: str, fn: Callable, args, kwargs):
+        started = time.monotonic()
+        with self._lock:
+            self._running[job_id] = {'job': name, 'started_at': datetime.now().isoformat()}
+            self.status['last_job'] = name
+            self.status['last_started_at'] = self._running[job_id]['started_at']
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            with self._lock:
+                self.status['jobs_failed'] += 1
+                self.status['last_error'] = f"{name}: {e}"
+            raise
+        else:
+            with self._lock:
+                self.status['jobs_completed'] += 1
+                self.status['last_result_count'] = len(result) if isinstance(result, (list, tuple)) else None
+            return result
+        finally:
+            with self._lock:
+                self._running.pop(job_id, None)
+                self.status['last_finished_at'] = datetime.now().isoformat()
+                self.status['last_duration_s'] = round(time.monotonic() - started, 3)
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Queue a blocking job on the ingest thread"""
+        with self._lock:
+            self._next_job_id += 1
+            job_id = self._next_job_id
+            self.status['jobs_submitted'] += 1
+        name = getattr(fn, '__name__', 'job')
+        return self._executor.submit(self._run_job, job_id, name, fn, args, kwargs)
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Await a blocking job without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            status = dict(self.status)
+            status['state'] = 'running' if self._running else 'idle'
+            status['running_jobs'] = list(self._running.values())
+        return status
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
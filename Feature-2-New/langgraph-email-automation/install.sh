@@ -18,7 +18,7 @@ echo "📦 Installing required Python packages..."
 pip3 install --upgrade pip
 
 # Core packages
-pip3 install requests groq fastapi uvicorn python-dotenv email-mime-fix
+pip3 install requests httpx groq fastapi uvicorn python-dotenv email-mime-fix
 
 echo "✅ Python packages installed"
 
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Local Ticket Model
+Small CPU classifier (TF-IDF + linear model) trained offline from historical tickets
+"""
+
+import os
+import sys
+import json
+import pickle
+from datetime import datetime
+from typing import Dict, List, Optional
+
+try:
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.pipeline import Pipeline
+    SKLEARN_AVAILABLE = True
+except ImportError:
+    SKLEARN_AVAILABLE = False
+
+# Same issue_type/urgency_reason wording the rule engine and fallback use
+LABEL_DETAILS = {
+    'security': ("Security or access issue", "Security-related issues require immediate attention"),
+    'access': ("Employee lifecycle management", "Standard employee onboarding/offboarding process"),
+    'network': ("Network connectivity issue", "Network issues affect productivity"),
+    'hardware': ("Hardware support request", "Hardware issues affect daily work"),
+    'software': ("Software or license request", "Standard procurement process"),
+    'general': ("General IT support request", "Standard IT support ticket")
+}
+
+
+def ticket_text(subject: str, body: str) -> str:
+    return f"{subject or ''}\n{body or ''}"
+
+
+class LocalTicketModel:
+    """Predicts category|priority|route_to as one joint label with a probability"""
+
+    def __init__(self, pipeline=None, trained_at: Optional[str] = None, samples: int = 0):
+        self.pipeline = pipeline
+        self.trained_at = trained_at
+        self.samples = samples
+
+    @classmethod
+    def load(cls, path: str) -> Optional['LocalTicketModel']:
+        """Load a trained model; None if missing or scikit-learn isn't installed"""
+        if not SKLEARN_AVAILABLE:
+            print("⚠️ scikit-learn not installed - local model tier disabled")
+            return None
+        if not os.path.exists(path):
+            print(f"⚠️ No local model at {path} - train one with 'python local_model.py <tickets.json> {path}' to enable that tier")
+            return None
+        try:
+            with open(path, 'rb') as f:
+                saved = pickle.load(f)
+            model = cls(saved['pipeline'], saved.get('trained_at'), saved.get('samples', 0))
+            print(f"🧠 Local model loaded ({model.samples} training tickets, trained {model.trained_at})")
+            return model
+        except Exception as e:
+            print(f"❌ Failed to load local model {path}: {e}")
+            return None
+
+    def save(self, path: str):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'wb') as f:
+            pickle.dump({'pipeline': self.pipeline, 'trained_at': self.trained_at, 'samples': self.samples}, f)
+
+    @classmethod
+    def train(cls, tickets: List[Dict]) -> 'LocalTicketModel':
+        """Fit TF-IDF + logistic regression on historical tickets"""
+        if not SKLEARN_AVAILABLE:
+            raise RuntimeError("scikit-learn is required to train the local model")
+
+        texts, labels = [], []
+        for ticket in tickets:
+            route = ticket.get('assigned_role') or ticket.get('route_to')
+            if not (ticket.get('category') and ticket.get('priority') and route):
+                continue
+            texts.append(ticket_text(ticket.get('subject', ''), ticket.get('description') or ticket.get('body', '')))
+            labels.append(f"{ticket['category']}|{ticket['priority']}|{route}")
+
+        if len(set(labels)) < 2:
+            raise ValueError("Need tickets from at least two distinct categories to train")
+
+        pipeline = Pipeline([
+            ('tfidf', TfidfVectorizer(ngram_range=(1, 2), min_df=1, sublinear_tf=True, max_features=50000)),
+            ('clf', LogisticRegression(max_iter=1000, class_weight='balanced'))
+        ])
+        pipeline.fit(texts, labels)
+        return cls(pipeline, datetime.now().isoformat(), len(texts))
+
+    def predict_many(self, emails: List[Dict]) -> List[Dict]:
+        """Analysis dicts with a 'confidence' equal to the winning class probability"""
+        texts = [ticket_text(email_data.get('subject', ''), email_data.get('body', '')) for email_data in emails]
+        probabilities = self.pipeline.predict_proba(texts)
+        classes = self.pipeline.classes_
+
+        results = []
+        for row in probabilities:
+            best = row.argmax()
+            category, priority, route_to = classes[best].split('|')
+            issue_type, urgency_reason = LABEL_DETAILS.get(category, LABEL_DETAILS['general'])
+            results.append({
+                'category': category,
+                'priority': priority,
+                'route_to': route_to,
+                'issue_type': issue_type,
+                'urgency_reason': urgency_reason,
+                'confidence': round(float(row[best]), 3)
+            })
+        return results
+
+
+def load_ticket_history(path: str) -> List[Dict]:
+    """Read tickets from a JSON export (a list, or the /api/dashboard payload)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('tickets', []) if isinstance(data, dict) else data
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python local_model.py <tickets.json> [output_model.pkl]")
+        sys.exit(1)
+
+    output = sys.argv[2] if len(sys.argv) > 2 else os.path.join(
+        os.getenv('TICKET_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')),
+        'local_model.pkl'
+    )
+    history = load_ticket_history(sys.argv[1])
+    print(f"🧠 Training local model on {len(history)} tickets...")
+    model = LocalTicketModel.train(history)
+    model.save(output)
+    print(f"✅ Saved local model ({model.samples} samples) to {output}")
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Mailboxes
+Per-mailbox IMAP state (credentials, sync marks, staff routing, duplicate index) for multi-mailbox monitoring
+"""
+
+import os
+import json
+import time
+import threading
+from typing import Callable, Dict, List, Optional
+
+from imap_pool import IMAPConnectionPool
+from imap_idle import InboxWatcher
+from uid_sync import UIDSyncState, UIDSyncEngine
+from duplicate_detector import DuplicateDetector
+
+# Tickets from before multi-mailbox mode (and the single-mailbox setup) belong to this mailbox
+DEFAULT_MAILBOX = 'default'
+
+
+def load_mailbox_configs(path: str) -> List[Dict]:
+    """Read a mailboxes file: a JSON list of {name, email, app_password | app_password_env, routing}"""
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+    if not isinstance(entries, list) or not entries:
+        raise ValueError(f"{path}: expected a non-empty list of mailboxes")
+
+    configs, seen = [], set()
+    for entry in entries:
+        name = entry.get('name')
+        if not name or not entry.get('email'):
+            raise ValueError(f"{path}: every mailbox needs a name and an email")
+        if name in seen:
+            raise ValueError(f"{path}: duplicate mailbox name '{name}'")
+        seen.add(name)
+        password = entry.get('app_password')
+        if not password and entry.get('app_password_env'):
+            password = os.getenv(entry['app_password_env'])
+        configs.append({
+            'name': name,
+            'email': entry['email'],
+            'app_password': password,
+            'routing': entry.get('routing') or {}
+        })
+    return configs
+
+
+class Mailbox:
+    """One monitored inbox; shares the classifier, caches, store and outbox with the others"""
+
+    def __init__(self, name: str, email_address: str, app_password: Optional[str], staff_routing: Dict[str, str],
+                 imap_server: str, sync_state: UIDSyncState, pool_size: int = 2, keepalive_interval: float = 60.0,
+                 max_attempts: int = 3):
+        self.name = name
+        self.email_address = email_address
+        self.app_password = app_password
+        self.staff_routing = staff_routing
+        self.imap_server = imap_server
+        self.imap_pool = IMAPConnectionPool(
+            imap_server,
+            email_address,
+            app_password,
+            max_size=pool_size,
+            keepalive_interval=keepalive_interval
+        )
+        self.uid_sync = UIDSyncEngine(sync_state, email_address, max_attempts=max_attempts)
+        self.duplicate_detector: Optional[DuplicateDetector] = None
+
+    def email_id(self, uid: int) -> str:
+        """Processed-email key; UIDs are only unique within a mailbox"""
+        return str(uid) if self.name == DEFAULT_MAILBOX else f"{self.name}:{uid}"
+
+    def has_valid_password(self) -> bool:
+        return bool(self.app_password) and len(self.app_password) == 16
+
+    def create_idle_pool(self) -> IMAPConnectionPool:
+        # IDLE holds its session for the whole wait, so it gets its own connection
+        return IMAPConnectionPool(self.imap_server, self.email_address, self.app_password, max_size=1)
+
+    def get_status(self) -> Dict:
+        return {
+            'name': self.name,
+            'email': self.email_address,
+            'sync': self.uid_sync.get_status(),
+            'imap_pool': self.imap_pool.get_metrics(),
+            'duplicates': self.duplicate_detector.get_stats() if self.duplicate_detector else {}
+        }
+
+
+class MailboxWatcher:
+    """One InboxWatcher per mailbox behind the single-watcher interface the coordinator expects
+
+    With `active`, only mailboxes it accepts are watched; resume()/pause() follow later changes
+    (scale-out: the mailboxes whose lease this process holds).
+    """
+
+    def __init__(self, watchers: Dict[str, InboxWatcher], active: Optional[Callable[[str], bool]] = None,
+                 restart_timeout: float = 15.0):
+        self.watchers = watchers
+        self.active = active
+        self.restart_timeout = restart_timeout
+        self._lock = threading.Lock()
+        self._started = False
+        self._stop_event = threading.Event()
+
+    def start(self):
+        with self._lock:
+            self._started = True
+            self._stop_event.clear()
+            for name, watcher in self.watchers.items():
+                if self.active is None or self.active(name):
+                    watcher.start()
+
+    def stop(self):
+        with self._lock:
+            self._started = False
+            self._stop_event.set()
+            for watcher in self.watchers.values():
+                watcher.stop()
+
+    def run(self):
+        """Blocking variant for the CLI: watch until stop() is called"""
+        self.start()
+        # Short waits keep the main thread responsive to Ctrl+C
+        while not self._stop_event.wait(1.0):
+            pass
+        self.join(self.restart_timeout)
+
+    def resume(self, name: str):
+        """Start watching one mailbox (if the monitor is on)"""
+        with self._lock:
+            watcher = self.watchers.get(name)
+            if not self._started or watcher is None:
+                return
+            if watcher.is_stopping():
+                # start() would return the exiting thread; let it finish first
+                watcher.join(self.restart_timeout)
+            watcher.start()
+
+    def pause(self, name: str):
+        """Stop watching one mailbox; the monitor as a whole keeps running"""
+        with self._lock:
+            watcher = self.watchers.get(name)
+            if watcher is not None:
+                watcher.stop()
+
+    def join(self, timeout: Optional[float] = None):
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        for watcher in self.watchers.values():
+            watcher.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+
+    def is_running(self) -> bool:
+        # On with no mailbox currently held still counts as running
+        return self._started or any(watcher.is_running() for watcher in self.watchers.values())
+
+    def is_stopping(self) -> bool:
+        return not self._started and any(watcher.is_running() for watcher in self.watchers.values())
+
+    def get_status(self) -> Dict:
+        return {name: watcher.get_status() for name, watcher in self.watchers.items()}
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Feature-2: MIME Parser
+Decodes fetched messages into compact records, in a process pool when a batch is worth it
+"""
+
+import os
+import re
+import html
+import base64
+import quopri
+import email
+import threading
+import multiprocessing
+from email import policy
+from html.parser import HTMLParser
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+# Labels mail clients commonly get wrong, mapped to the codec that actually decodes them (WHATWG style)
+CHARSET_ALIASES = {
+    'iso-8859-1': 'cp1252',
+    'latin1': 'cp1252',
+    'us-ascii': 'cp1252',
+    'ascii': 'cp1252',
+    'gb2312': 'gb18030',
+    'gbk': 'gb18030',
+    'ks_c_5601-1987': 'cp949',
+    'euc-kr': 'cp949',
+    'x-sjis': 'shift_jis',
+    'unicode-1-1-utf-7': 'utf-7'
+}
+
+_BLOCK_TAGS = {'p', 'div', 'br', 'tr', 'li', 'ul', 'ol', 'table', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+               'blockquote', 'pre', 'hr', 'section', 'article', 'header', 'footer'}
+_SKIP_TAGS = {'script', 'style', 'head', 'title', 'noscript'}
+
+
+# ----------------------------------------------------------------------
+# Decoding helpers (run in worker processes, so stdlib only)
+# ----------------------------------------------------------------------
+
+def decode_bytes(payload: bytes, charset: Optional[str]) -> str:
+    """Decode with the declared charset; undeclared or bogus charsets try UTF-8, then Windows-1252"""
+    charset = (charset or '').strip().strip('"').lower()
+    if charset:
+        try:
+            return payload.decode(CHARSET_ALIASES.get(charset, charset), errors='replace')
+        except LookupError:
+            pass
+    try:
+        return payload.decode('utf-8')
+    except UnicodeDecodeError:
+        return payload.decode('cp1252', errors='replace')
+
+
+def decode_part(payload: bytes, encoding: str, charset: Optional[str]) -> str:
+    """Undo the transfer encoding and decode with the part's declared charset"""
+    if encoding == 'base64':
+        compact = re.sub(rb'[^A-Za-z0-9+/=]', b'', payload)
+        # Payload may be truncated by the size cap; decode whole 4-byte groups only
+        compact = compact[:len(compact) - len(compact) % 4]
+        try:
+            payload = base64.b64decode(compact)
+        except ValueError:
+            payload = b''
+    elif encoding == 'quoted-printable':
+        payload = quopri.decodestring(payload)
+    return decode_bytes(payload, charset)
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag in _BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def html_to_text(markup: str) -> str:
+    """Readable text from an HTML body: scripts/styles dropped, blocks on their own lines"""
+    extractor = _TextExtractor()
+    try:
+        extractor.feed(markup)
+        extractor.close()
+        text = ''.join(extractor.parts)
+    except Exception:
+        # Badly broken markup: strip tags the blunt way
+        text = html.unescape(re.sub(r'<[^>]+>', ' ', markup))
+    lines = (re.sub(r'[ \t\r\f\v\xa0]+', ' ', line).strip() for line in text.split('\n'))
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
+
+
+def _text_from_message(message, max_body_chars: int) -> Dict[str, str]:
+    """First inline text/plain part, else the first text/html part converted to text"""
+    plain, markup = None, None
+    for part in message.walk():
+        if part.is_multipart() or part.get_content_disposition() == 'attachment':
+            continue
+        content_type = part.get_content_type()
+        if content_type not in ('text/plain', 'text/html'):
+            continue
+        payload = part.get_payload(decode=True) or b''
+        text = decode_bytes(payload, part.get_content_charset())
+        if content_type == 'text/plain' and plain is None:
+            plain = text
+            break
+        if content_type == 'text/html' and markup is None:
+            markup = text
+    if plain is not None:
+        return {'body': plain.strip(), 'body_source': 'text/plain'}
+    if markup is not None:
+        # Markup is mostly tags; bound the input so one huge newsletter cannot stall a worker
+        return {'body': html_to_text(markup[:max_body_chars * 8]), 'body_source': 'text/html'}
+    return {'body': '', 'body_source': ''}
+
+
+def parse_fetched(message: Dict, max_body_chars: int = 16384) -> Dict:
+    """Compact record for one fetched message: headers plus decoded text body, no bytes
+
+    Accepts either a whole message ('raw') or one pre-selected part ('payload' + 'part').
+    """
+    record = {key: value for key, value in message.items() if key not in ('raw', 'payload', 'part')}
+
+    if message.get('raw') is not None:
+        parsed = email.message_from_bytes(message['raw'], policy=policy.default)
+        record.update({
+            'sender': str(parsed.get('From', '') or ''),
+            'subject': str(parsed.get('Subject', '') or ''),
+            'message_id': str(parsed.get('Message-ID', '') or ''),
+            'date': str(parsed.get('Date', '') or '')
+        })
+        record.update(_text_from_message(parsed, max_body_chars))
+    elif message.get('payload') is not None:
+        part = message.get('part') or {}
+        text = decode_part(message['payload'], part.get('encoding', '7bit'), part.get('charset'))
+        if part.get('subtype') == 'html':
+            record.update({'body': html_to_text(text), 'body_source': 'text/html'})
+        else:
+            record.update({'body': text.strip(), 'body_source': 'text/plain'})
+
+    if isinstance(record.get('body'), str):
+        record['body'] = record['body'][:max_body_chars]
+    return record
+
+
+def _parse_or_flag(message: Dict, max_body_chars: int) -> Dict:
+    """One malformed message must not fail its whole batch; it comes back flagged with 'parse_error'"""
+    try:
+        return parse_fetched(message, max_body_chars)
+    except Exception as e:
+        record = {key: value for key, value in message.items() if key not in ('raw', 'payload', 'part')}
+        record['parse_error'] = f"{type(e).__name__}: {e}"
+        return record
+
+
+def parse_fetched_batch(messages: List[Dict], max_body_chars: int = 16384) -> List[Dict]:
+    """Worker-process entry point: one round trip per batch instead of per message"""
+    return [_parse_or_flag(message, max_body_chars) for message in messages]
+
+
+def needs_parsing(message: Dict) -> bool:
+    return message.get('raw') is not None or message.get('payload') is not None
+
+
+# ----------------------------------------------------------------------
+# Pool
+# ----------------------------------------------------------------------
+
+class MimeParserPool:
+    """Spreads MIME decoding over worker processes; small batches stay in-process (pickling costs more)"""
+
+    def __init__(self, workers: Optional[int] = None, min_pool_batch: int = 8,
+                 batch_size: int = 16, max_body_chars: int = 16384):
+        self.workers = (os.cpu_count() or 1) if workers is None else max(0, workers)
+        self.min_pool_batch = max(1, min_pool_batch)
+        self.batch_size = max(1, batch_size)
+        self.max_body_chars = max_body_chars
+
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.stats = {
+            'parsed_inline': 0,
+            'parsed_in_pool': 0,
+            'pool_batches': 0,
+            'pool_restarts': 0,
+            'html_fallbacks': 0,
+            'full_messages': 0,
+            'parse_errors': 0
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the parent has IMAP, SMTP and SQLite threads running
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def _restart(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self.stats['pool_restarts'] += 1
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _parse_in_pool(self, messages: List[Dict]) -> List[Dict]:
+        executor = self._get_executor()
+        groups = [messages[i:i + self.batch_size] for i in range(0, len(messages), self.batch_size)]
+        futures = [executor.submit(parse_fetched_batch, group, self.max_body_chars) for group in groups]
+        records = []
+        for future in futures:
+            records.extend(future.result())
+        with self._lock:
+            self.stats['pool_batches'] += len(groups)
+            self.stats['parsed_in_pool'] += len(messages)
+        return records
+
+    def parse_many(self, messages: List[Dict]) -> List[Dict]:
+        """Records in input order; messages with nothing to decode pass straight through"""
+        pending = [index for index, message in enumerate(messages) if needs_parsing(message)]
+        if not pending:
+            return list(messages)
+        work = [messages[index] for index in pending]
+
+        records = None
+        if self.workers > 1 and len(work) >= self.min_pool_batch:
+            try:
+                records = self._parse_in_pool(work)
+            except BrokenProcessPool as e:
+                # A worker died (e.g. OOM on a huge message): start a fresh pool next time, parse here now
+                print(f"⚠️ MIME parser pool broke ({e}), parsing this batch in-process")
+                self._restart()
+        if records is None:
+            records = parse_fetched_batch(work, self.max_body_chars)
+            with self._lock:
+                self.stats['parsed_inline'] += len(work)
+
+        with self._lock:
+            self.stats['full_messages'] += sum(1 for message in work if message.get('raw') is not None)
+            self.stats['html_fallbacks'] += sum(1 for record in records if record.get('body_source') == 'text/html')
+            self.stats['parse_errors'] += sum(1 for record in records if record.get('parse_error'))
+        result = list(messages)
+        for index, record in zip(pending, records):
+            result[index] = record
+        return result
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['pool_running'] = self._executor is not None
+        stats.update({'workers': self.workers, 'min_pool_batch': self.min_pool_batch})
+        return stats
+
+    def shutdown(self, wait: bool = False):
+        """Stop the worker processes (wait=True blocks until they have exited)"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
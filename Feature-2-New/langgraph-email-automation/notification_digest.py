@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Notification Digest
+Coalesces staff notifications per recipient and priority into time-windowed digests
+"""
+
+import time
+import itertools
+import threading
+from datetime import datetime
+from email.message import Message
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class RecipientRateLimiter:
+    """Token bucket per recipient: at most max_per_hour emails, with a small burst"""
+
+    def __init__(self, max_per_hour: float = 20.0, burst: int = 5):
+        self.rate_per_sec = max_per_hour / 3600.0
+        self.burst = max(1, burst)
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def _tokens(self, recipient: str, now: float) -> float:
+        tokens, updated = self._buckets.get(recipient, (float(self.burst), now))
+        return min(float(self.burst), tokens + (now - updated) * self.rate_per_sec)
+
+    def try_acquire(self, recipient: str) -> bool:
+        now = time.monotonic()
+        tokens = self._tokens(recipient, now)
+        if tokens < 1.0:
+            self._buckets[recipient] = (tokens, now)
+            return False
+        self._buckets[recipient] = (tokens - 1.0, now)
+        return True
+
+    def seconds_until_available(self, recipient: str) -> float:
+        tokens = self._tokens(recipient, time.monotonic())
+        if tokens >= 1.0 or self.rate_per_sec <= 0:
+            return 0.0
+        return (1.0 - tokens) / self.rate_per_sec
+
+    def available(self, recipient: str) -> float:
+        return self._tokens(recipient, time.monotonic())
+
+    def recipients(self) -> List[str]:
+        return list(self._buckets)
+
+
+class NotificationDigest:
+    """Holds tickets per (recipient, priority) until their window closes, then sends one email"""
+
+    def __init__(self, send: Callable[[Message, str], bool],
+                 build_single: Callable[[Dict], Message],
+                 build_digest: Callable[[str, str, List[Dict]], Message],
+                 windows: Optional[Dict[str, float]] = None,
+                 max_per_hour: float = 20.0, burst: int = 5, max_digest_size: int = 50,
+                 tick_seconds: float = 1.0):
+        self.send = send
+        self.build_single = build_single
+        self.build_digest = build_digest
+        # Seconds a ticket may wait for company; 0 sends as soon as the rate limit allows
+        self.windows = windows or {'high': 0.0, 'medium': 300.0, 'low': 900.0}
+        self.max_digest_size = max(1, max_digest_size)
+        self.tick_seconds = tick_seconds
+        self.rate_limiter = RecipientRateLimiter(max_per_hour, burst)
+
+        # (recipient, priority) -> {'tickets': [...], 'first_at': monotonic}
+        self._pending: Dict[Tuple[str, str], Dict] = {}
+        # outbox key -> ticket ids it carries
+        self._keys: Dict[str, List[str]] = {}
+        self._seq = itertools.count(1)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.stats = {
+            'tickets_received': 0,
+            'emails_sent': 0,
+            'digests_sent': 0,
+            'tickets_coalesced': 0,
+            'rate_limited': 0,
+            'last_flush_at': None
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='notification-digest', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> int:
+        """Stop the timer and send everything still held; returns emails queued
+
+        Windows and the rate limit are waived; held tickets are still coalesced per recipient and priority.
+        """
+        self._stop_event.set()
+        self._wake.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        queued = 0
+        while True:
+            flushed = self.flush(force=True, rate_limit=False)
+            if not flushed:
+                return queued
+            queued += flushed
+
+    def add(self, ticket: Dict) -> bool:
+        """Hold a ticket for its recipient/priority window; returns immediately"""
+        self.start()
+        key = (ticket['assigned_to'], ticket.get('priority', 'medium'))
+        with self._lock:
+            bucket = self._pending.setdefault(key, {'tickets': [], 'first_at': time.monotonic()})
+            bucket['tickets'].append(ticket)
+            self.stats['tickets_received'] += 1
+        if self.windows.get(key[1], 0.0) <= 0:
+            self._wake.set()
+        return True
+
+    def ticket_ids_for(self, key: str) -> List[str]:
+        """Ticket ids carried by an outbox key (consumed once its result is known)"""
+        with self._lock:
+            return self._keys.pop(key, [key])
+
+    def flush(self, force: bool = False, rate_limit: bool = True) -> int:
+        """Send every due bucket whose recipient has rate budget; returns emails queued"""
+        now = time.monotonic()
+        batches: List[Tuple[str, str, List[Dict]]] = []
+        with self._lock:
+            for (recipient, priority), bucket in list(self._pending.items()):
+                window = self.windows.get(priority, 0.0)
+                if not force and now - bucket['first_at'] < window:
+                    continue
+                if rate_limit and not self.rate_limiter.try_acquire(recipient):
+                    if not bucket.get('rate_limited'):
+                        bucket['rate_limited'] = True
+                        self.stats['rate_limited'] += 1
+                    continue
+                tickets = bucket['tickets'][:self.max_digest_size]
+                rest = bucket['tickets'][self.max_digest_size:]
+                if rest:
+                    bucket['tickets'] = rest
+                else:
+                    del self._pending[(recipient, priority)]
+                batches.append((recipient, priority, tickets))
+
+        for recipient, priority, tickets in batches:
+            self._send(recipient, priority, tickets)
+        if batches:
+            with self._lock:
+                self.stats['last_flush_at'] = datetime.now().isoformat()
+        return len(batches)
+
+    def get_stats(self) -> Dict:
+        """Pending backlog per recipient/priority plus each recipient's remaining rate budget"""
+        now = time.monotonic()
+        with self._lock:
+            stats = dict(self.stats)
+            backlog = []
+            recipients = set(self.rate_limiter.recipients())
+            for (recipient, priority), bucket in self._pending.items():
+                recipients.add(recipient)
+                window = self.windows.get(priority, 0.0)
+                backlog.append({
+                    'recipient': recipient,
+                    'priority': priority,
+                    'pending': len(bucket['tickets']),
+                    'oldest_age_s': round(now - bucket['first_at'], 1),
+                    'due_in_s': round(max(0.0, window - (now - bucket['first_at'])), 1)
+                })
+            rate_limits = {
+                recipient: {
+                    'tokens': round(self.rate_limiter.available(recipient), 2),
+                    'next_send_in_s': round(self.rate_limiter.seconds_until_available(recipient), 1)
+                }
+                for recipient in recipients
+            }
+        stats['pending_tickets'] = sum(entry['pending'] for entry in backlog)
+        stats['backlog'] = sorted(backlog, key=lambda entry: -entry['oldest_age_s'])
+        stats['rate_limits'] = rate_limits
+        stats['windows_s'] = dict(self.windows)
+        stats['max_per_hour'] = round(self.rate_limiter.rate_per_sec * 3600, 2)
+        return stats
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _send(self, recipient: str, priority: str, tickets: List[Dict]):
+        try:
+            if len(tickets) == 1:
+                key = tickets[0]['ticket_id']
+                message = self.build_single(tickets[0])
+            else:
+                key = f"DIGEST-{next(self._seq)}"
+                message = self.build_digest(recipient, priority, tickets)
+            with self._lock:
+                self._keys[key] = [ticket['ticket_id'] for ticket in tickets]
+                self.stats['emails_sent'] += 1
+                if len(tickets) > 1:
+                    self.stats['digests_sent'] += 1
+                    self.stats['tickets_coalesced'] += len(tickets)
+            self.send(message, key)
+            print(f"📬 Queued notification for {recipient} ({priority}, {len(tickets)} ticket(s))")
+        except Exception as e:
+            print(f"❌ Failed to build notification for {recipient}: {e}")
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wake.wait(self.tick_seconds)
+            self._wake.clear()
+            self.flush()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Notification Outbox
+Queued staff notifications sent by a background thread over one reused SMTP session
+"""
+
+import time
+import heapq
+import queue
+import smtplib
+import itertools
+import threading
+from datetime import datetime
+from email.message import Message
+from typing import Callable, Dict, List, Optional, Tuple
+
+SMTP_TIMEOUT = 30
+
+
+class NotificationOutbox:
+    """Background SMTP sender with connection reuse and retry/backoff"""
+
+    def __init__(self, host: str, port: int, username: str, password: str,
+                 on_result: Optional[Callable[[str, bool], None]] = None,
+                 max_attempts: int = 5, initial_backoff: float = 2.0, max_backoff: float = 300.0,
+                 idle_timeout: float = 60.0, max_messages_per_session: int = 100):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.on_result = on_result
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.idle_timeout = idle_timeout
+        self.max_messages_per_session = max_messages_per_session
+
+        self._queue: "queue.Queue[Dict]" = queue.Queue()
+        # (due_time, seq, job) for messages waiting to be retried
+        self._retries: List[Tuple[float, int, Dict]] = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._drain_until = 0.0
+        self._thread: Optional[threading.Thread] = None
+
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._session_messages = 0
+        self._last_used = 0.0
+
+        self.stats = {
+            'queued': 0,
+            'sent': 0,
+            'failed': 0,
+            'retries': 0,
+            'sessions_opened': 0,
+            'last_sent_at': None,
+            'last_error': None
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='notification-outbox', daemon=True)
+        self._thread.start()
+
+    def stop(self, drain_timeout: float = 0.0) -> int:
+        """Stop the worker, first delivering what is queued for up to drain_timeout seconds
+
+        Returns the number of messages left undelivered.
+        """
+        self._drain_until = time.monotonic() + drain_timeout
+        self._stop_event.set()
+        if self._thread and self._thread.is_alive() and self._thread is not threading.current_thread():
+            self._queue.put(None)  # Wake the worker if it is waiting on an empty queue
+            # A send already in progress is bounded by the SMTP socket timeout
+            self._thread.join(drain_timeout + SMTP_TIMEOUT)
+        return self.pending()
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._queue.qsize() + len(self._retries)
+
+    def enqueue(self, message: Message, key: str) -> bool:
+        """Queue a message for delivery; returns immediately"""
+        self.start()
+        with self._lock:
+            self.stats['queued'] += 1
+        self._queue.put({'message': message, 'key': key, 'attempts': 0, 'queued_at': time.time()})
+        return True
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['retry_backlog'] = len(self._retries)
+        stats['queue_depth'] = self._queue.qsize()
+        stats['session_open'] = self._smtp is not None
+        return stats
+
+    # ------------------------------------------------------------------
+    # SMTP session
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.port == 465:
+            smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=SMTP_TIMEOUT)
+        else:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=SMTP_TIMEOUT)
+            smtp.starttls()
+        smtp.login(self.username, self.password)
+        with self._lock:
+            self.stats['sessions_opened'] += 1
+        self._session_messages = 0
+        return smtp
+
+    def _close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+        self._smtp = None
+
+    def _session(self) -> smtplib.SMTP:
+        """Reuse the open session unless it has been idle too long or hit its message cap"""
+        if self._smtp is not None:
+            idle = time.monotonic() - self._last_used
+            if idle > self.idle_timeout or self._session_messages >= self.max_messages_per_session:
+                self._close()
+            elif idle > self.idle_timeout / 2:
+                try:
+                    if self._smtp.noop()[0] != 250:
+                        self._close()
+                except (smtplib.SMTPException, OSError):
+                    self._close()
+        if self._smtp is None:
+            self._smtp = self._connect()
+        return self._smtp
+
+    # ------------------------------------------------------------------
+    # Worker loop
+    # ------------------------------------------------------------------
+
+    def _next_job(self) -> Optional[Dict]:
+        with self._lock:
+            if self._retries and self._retries[0][0] <= time.monotonic():
+                return heapq.heappop(self._retries)[2]
+            wait = self._retries[0][0] - time.monotonic() if self._retries else None
+        try:
+            # Drop an idle session rather than hold it open while nothing is queued
+            timeout = min(wait, self.idle_timeout) if wait is not None else self.idle_timeout
+            return self._queue.get(timeout=max(0.05, timeout))
+        except queue.Empty:
+            if self._smtp is not None and time.monotonic() - self._last_used > self.idle_timeout:
+                self._close()
+            return None
+
+    def _deliver(self, job: Dict):
+        job['attempts'] += 1
+        try:
+            self._session().send_message(job['message'])
+            self._session_messages += 1
+            self._last_used = time.monotonic()
+        except Exception as e:
+            self._close()
+            with self._lock:
+                self.stats['last_error'] = str(e)
+            if job['attempts'] >= self.max_attempts or isinstance(e, smtplib.SMTPAuthenticationError):
+                with self._lock:
+                    self.stats['failed'] += 1
+                print(f"❌ Failed to send notification for {job['key']} after {job['attempts']} attempts: {e}")
+                self._report(job['key'], False)
+                return
+            backoff = min(self.max_backoff, self.initial_backoff * (2 ** (job['attempts'] - 1)))
+            with self._lock:
+                self.stats['retries'] += 1
+                heapq.heappush(self._retries, (time.monotonic() + backoff, next(self._seq), job))
+            print(f"⚠️ Notification for {job['key']} failed ({e}), retrying in {backoff:.0f}s")
+            return
+
+        with self._lock:
+            self.stats['sent'] += 1
+            self.stats['last_sent_at'] = datetime.now().isoformat()
+        print(f"✅ Notification sent to {job['message']['To']} for {job['key']}")
+        self._report(job['key'], True)
+
+    def _report(self, key: str, sent: bool):
+        if self.on_result:
+            try:
+                self.on_result(key, sent)
+            except Exception as e:
+                print(f"❌ Notification result callback failed: {e}")
+
+    def _drain(self):
+        """On stop: deliver the queue, and retries falling due, until the drain deadline"""
+        while time.monotonic() < self._drain_until:
+            try:
+                job = self._queue.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    if not self._retries or self._retries[0][0] > self._drain_until:
+                        return
+                    due, _, job = heapq.heappop(self._retries)
+                time.sleep(max(0.0, due - time.monotonic()))
+            if job is not None:
+                self._deliver(job)
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            job = self._next_job()
+            if job is not None:
+                self._deliver(job)
+        self._drain()
+        self._close()
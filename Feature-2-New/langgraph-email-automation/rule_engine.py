@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Rule Engine
+Data-driven keyword/phrase/regex rules compiled into one regex, scored in a single pass
+"""
+
+import os
+import re
+import json
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'classification_rules.json')
+
+ANALYSIS_FIELDS = ('category', 'priority', 'route_to', 'issue_type', 'urgency_reason')
+
+
+class RuleEngine:
+    """Scores every rule in one scan of the text and reports a confidence"""
+
+    def __init__(self, rules_file: str = DEFAULT_RULES_FILE):
+        self.rules_file = rules_file
+        with open(rules_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+
+        self.strong_score = float(config.get('strong_score', 3.0))
+        self.default = {field: config['default'][field] for field in ANALYSIS_FIELDS}
+        self.rules: List[Dict] = config['rules']
+
+        # pattern index -> (rule index, weight, label)
+        self._patterns: List[Tuple[int, float, str]] = []
+        self._regex = self._compile()
+
+    def _compile(self) -> Optional['re.Pattern']:
+        """Combine every rule's patterns into one alternation of named groups"""
+        alternatives = []
+        for rule_index, rule in enumerate(self.rules):
+            entries = []
+            # Keywords match at word start ("password" also hits "passwords")
+            for keyword in rule.get('keywords', []):
+                entries.append((rf"\b{re.escape(keyword.lower())}", 1.0, keyword))
+            for phrase in rule.get('phrases', []):
+                words = [re.escape(word) for word in phrase['text'].lower().split()]
+                entries.append((r"\b" + r"\s+".join(words) + r"\b", float(phrase.get('weight', 2.0)), phrase['text']))
+            for regex in rule.get('regexes', []):
+                re.compile(regex['pattern'])  # fail fast on a bad rule file
+                entries.append((f"(?:{regex['pattern']})", float(regex.get('weight', 2.0)), regex['pattern']))
+
+            for pattern, weight, label in entries:
+                group = f"p{len(self._patterns)}"
+                self._patterns.append((rule_index, weight, label))
+                alternatives.append(f"(?P<{group}>{pattern})")
+
+        if not alternatives:
+            return None
+        # Longer alternatives first so phrases win over the keywords they contain
+        alternatives.sort(key=len, reverse=True)
+        return re.compile('|'.join(alternatives), re.IGNORECASE)
+
+    def score(self, text: str) -> Tuple[List[float], Dict[int, List[str]]]:
+        """Single pass over the text; each distinct pattern counts once"""
+        scores = [0.0] * len(self.rules)
+        matched: Dict[int, List[str]] = {}
+        if not self._regex:
+            return scores, matched
+
+        seen = set()
+        for match in self._regex.finditer(text):
+            pattern_index = int(match.lastgroup[1:])
+            if pattern_index in seen:
+                continue
+            seen.add(pattern_index)
+            rule_index, weight, label = self._patterns[pattern_index]
+            scores[rule_index] += weight
+            matched.setdefault(rule_index, []).append(label)
+        return scores, matched
+
+    def classify(self, email_data: Dict) -> Dict:
+        """Best rule (ties go to the rule listed first) plus a 0-1 confidence"""
+        text = f"{email_data.get('subject', '')} {email_data.get('body', '')}"
+        scores, matched = self.score(text)
+
+        ranked = sorted(range(len(scores)), key=lambda index: (-scores[index], index))
+        if not ranked or scores[ranked[0]] <= 0:
+            result = dict(self.default)
+            result.update({'confidence': 0.0, 'matched_rule': None, 'matched_terms': []})
+            return result
+
+        best = ranked[0]
+        top = scores[best]
+        runner_up = scores[ranked[1]] if len(ranked) > 1 else 0.0
+
+        # Confident when the winner is both strong and clearly ahead of the next rule
+        dominance = top / (top + runner_up)
+        strength = min(1.0, top / self.strong_score)
+        rule = self.rules[best]
+
+        result = {field: rule[field] for field in ANALYSIS_FIELDS}
+        result.update({
+            'confidence': round(dominance * strength, 3),
+            'matched_rule': rule.get('id', str(best)),
+            'matched_terms': matched.get(best, [])
+        })
+        return result
@@ -11,7 +11,7 @@ fi
 
 # Check if Python packages are installed
 echo "📋 Checking dependencies..."
-python3 -c "import requests, fastapi, uvicorn" 2>/dev/null
+python3 -c "import requests, httpx, fastapi, uvicorn" 2>/dev/null
 if [ $? -ne 0 ]; then
     echo "❌ Required packages not installed. Run ./install.sh first"
     exit 1
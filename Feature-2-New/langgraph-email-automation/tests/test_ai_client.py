@@ -0,0 +1,95 @@
+"""Circuit-breaker attribution when a request deadline expires."""
+
+import asyncio
+
+import pytest
+
+from ai_client import AsyncClassificationClient
+
+
+def _client(**kwargs) -> AsyncClassificationClient:
+    return AsyncClassificationClient(
+        'groq-key', secondary_api_key='gemini-key', request_deadline=0.3,
+        hedge_min_delay=0.05, hedge_default_delay=0.05, **kwargs
+    )
+
+
+def _failures(breaker):
+    return sum(1 for ok, _ in breaker._window if not ok)
+
+
+def _fake(delay):
+    async def send(prompt, max_tokens):
+        await asyncio.sleep(delay)
+        return '{}'
+    return send
+
+
+def test_slow_primary_is_charged_for_the_deadline():
+    client = _client()
+    client._post_groq = _fake(delay=5)
+    client._post_gemini = _fake(delay=5)
+
+    with pytest.raises(asyncio.TimeoutError):
+        client.run(client.chat('prompt'))
+
+    assert _failures(client.breaker) == 1
+    assert _failures(client.secondary_breaker) == 0
+    client.close()
+
+
+def test_slow_hedged_secondary_is_charged_not_the_primary():
+    client = _client(hedge_enabled=True)
+    client._post_gemini = _fake(delay=5)
+
+    async def hedge_then_fail(prompt, max_tokens):
+        # Primary outlives the hedge delay, then fails while the secondary is still out
+        await asyncio.sleep(0.1)
+        raise RuntimeError('groq 500')
+    client._post_groq = hedge_then_fail
+
+    with pytest.raises(asyncio.TimeoutError):
+        client.run(client.chat('prompt'))
+
+    assert client.get_stats()['hedged_requests'] == 1
+    # Groq only carries its own error; the blown deadline belongs to Gemini
+    assert _failures(client.breaker) == 1
+    assert _failures(client.secondary_breaker) == 1
+    client.close()
+
+
+def test_secondary_only_call_does_not_trip_the_primary():
+    client = _client(breaker_options={'min_calls': 1, 'failure_rate_threshold': 0.5})
+    client.breaker._trip()
+    client._post_groq = _fake(delay=0)
+    client._post_gemini = _fake(delay=5)
+
+    with pytest.raises(asyncio.TimeoutError):
+        client.run(client.chat('prompt'))
+
+    assert client.get_stats()['secondary_requests'] == 1
+    assert _failures(client.breaker) == 0
+    assert _failures(client.secondary_breaker) == 1
+    client.close()
+
+
+def test_fast_answer_charges_nobody():
+    client = _client(hedge_enabled=True)
+    client._post_groq = _fake(delay=0.01)
+    client._post_gemini = _fake(delay=5)
+
+    assert client.run(client.chat('prompt')) == '{}'
+    assert _failures(client.breaker) == 0
+    assert _failures(client.secondary_breaker) == 0
+    client.close()
+
+
+def test_close_stops_the_loop_thread_and_the_http_pool():
+    client = _client()
+    client._ensure_loop()
+    thread, http = client._thread, client._client
+
+    client.close()
+    assert not thread.is_alive()
+    assert http.is_closed
+    client.close()  # idempotent
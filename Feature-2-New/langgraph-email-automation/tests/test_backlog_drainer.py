@@ -0,0 +1,46 @@
+"""BacklogDrainer budget handling and carry-over."""
+
+import time
+
+from backlog_drainer import BacklogDrainer
+
+
+def test_finish_gets_the_rest_of_the_budget_and_unfinished_uids_carry_over():
+    drainer = BacklogDrainer(chunk_size=2, cycle_budget_seconds=0.5)
+    submitted, budgets = [], []
+
+    def submit(key, chunk):
+        submitted.append((key, chunk))
+        time.sleep(0.1)
+        return []
+
+    def finish(remaining):
+        budgets.append(remaining)
+        return [{'ticket_id': 'TK-1'}], {'a': [3, 4]}
+
+    results = drainer.drain_many(lambda: {'a': [1, 2, 3, 4]}, submit, finish=finish)
+
+    assert results == [{'ticket_id': 'TK-1'}]
+    assert 0 < budgets[0] <= 0.5 - 0.2 + 0.05
+    assert drainer.get_status()['carry_over'] == 2
+    assert drainer.has_backlog()
+
+    # Carried UIDs are still owned by the pipeline: not resubmitted next cycle
+    submitted.clear()
+    drainer.drain_many(lambda: {'a': [3, 4, 5]}, submit, finish=lambda remaining: ([], {}))
+    assert submitted == [('a', [5])]
+    assert not drainer.has_backlog()
+
+
+def test_budget_stops_submissions_and_leaves_the_rest_queued():
+    drainer = BacklogDrainer(chunk_size=1, cycle_budget_seconds=0.15)
+
+    def submit(key, chunk):
+        time.sleep(0.1)
+        return [chunk[0]]
+
+    results = drainer.drain(lambda: [1, 2, 3, 4, 5], lambda chunk: submit(None, chunk))
+
+    assert results == [1, 2]
+    assert drainer.queue_depth == 3
+    assert drainer.get_status()['budget_exhausted_cycles'] == 1
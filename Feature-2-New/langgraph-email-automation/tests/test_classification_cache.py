@@ -0,0 +1,60 @@
+"""ClassificationCache persistence under concurrent saves."""
+
+import json
+import threading
+
+from classification_cache import ClassificationCache
+from rule_engine import RuleEngine
+from tiered_classifier import TieredClassifier
+
+
+def _email(n):
+    return {'subject': f'Laptop {n} will not boot', 'body': f'Machine number {n} shows a black screen'}
+
+
+def test_concurrent_saves_never_fail_and_leave_a_complete_file(tmp_path):
+    path = tmp_path / 'cache.json'
+    cache = ClassificationCache(persist_path=str(path))
+    errors = []
+
+    def worker(offset):
+        for n in range(offset, offset + 50):
+            cache.put(_email(n), {'priority': 'low'})
+            try:
+                cache.save()
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i * 50,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    cache.save()
+
+    assert errors == []
+    assert len(json.loads(path.read_text())) == 400
+    assert [p.name for p in tmp_path.iterdir()] == ['cache.json']
+
+
+def test_failed_save_keeps_the_llm_results(tmp_path, monkeypatch):
+    cache = ClassificationCache(persist_path=str(tmp_path / 'cache.json'))
+    rules = RuleEngine()
+    analysis = {'priority': 'high', 'category': 'hardware', 'issue_type': 'Boot failure',
+                'urgency_reason': 'Cannot work', 'route_to': 'IT_HELPDESK_MANAGER', 'confidence': 0.9}
+    classifier = TieredClassifier(rules, cache, lambda emails: [dict(analysis) for _ in emails],
+                                  rule_threshold=1.1)
+
+    def broken_replace(src, dst):
+        raise OSError('disk full')
+    monkeypatch.setattr('classification_cache.os.replace', broken_replace)
+
+    results = classifier.classify_many([_email(1)])
+    assert results[0]['tier'] == 'llm' and results[0]['priority'] == 'high'
+    assert cache.get(_email(1))['priority'] == 'high'
+    assert [p.name for p in tmp_path.iterdir()] == []
+
+    # Next save retries the write
+    monkeypatch.undo()
+    cache.save()
+    assert (tmp_path / 'cache.json').exists()
@@ -0,0 +1,91 @@
+"""InboxWatcher IDLE wait loop against a fake IMAP server."""
+
+import time
+import socket
+import imaplib
+import threading
+
+from imap_idle import InboxWatcher
+
+
+class FakeIdleServer:
+    """Minimal IMAP server: CAPABILITY, NOOP, LOGOUT and one scripted IDLE per connection"""
+
+    def __init__(self, quiet_seconds: float, untagged: bytes = b'* 3 EXISTS\r\n'):
+        self.quiet_seconds = quiet_seconds
+        self.untagged = untagged
+        self.done_received = threading.Event()
+        self._listener = socket.socket()
+        self._listener.bind(('127.0.0.1', 0))
+        self._listener.listen(1)
+        self.port = self._listener.getsockname()[1]
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self):
+        conn, _ = self._listener.accept()
+        reader = conn.makefile('rb')
+        conn.sendall(b'* OK fake IMAP ready\r\n')
+        while True:
+            line = reader.readline()
+            if not line:
+                break
+            tag, command = line.split(b' ', 1)[0], line.split(b' ', 1)[1].strip().upper()
+            if command == b'CAPABILITY':
+                conn.sendall(b'* CAPABILITY IMAP4rev1 IDLE\r\n' + tag + b' OK CAPABILITY completed\r\n')
+            elif command == b'NOOP':
+                conn.sendall(tag + b' OK NOOP completed\r\n')
+            elif command == b'IDLE':
+                conn.sendall(b'+ idling\r\n')
+                # Quiet for several read slices, then report new mail (if scripted)
+                if self.untagged is not None:
+                    time.sleep(self.quiet_seconds)
+                    conn.sendall(self.untagged)
+                if reader.readline().strip().upper() == b'DONE':
+                    self.done_received.set()
+                conn.sendall(tag + b' OK IDLE terminated\r\n')
+            elif command == b'LOGOUT':
+                conn.sendall(b'* BYE\r\n' + tag + b' OK LOGOUT completed\r\n')
+                break
+        conn.close()
+        self._listener.close()
+
+
+def _watcher(**kwargs) -> InboxWatcher:
+    return InboxWatcher(None, lambda: 0, read_slice=0.05, **kwargs)
+
+
+def test_idle_survives_quiet_read_slices_and_sees_exists():
+    server = FakeIdleServer(quiet_seconds=0.4)
+    mail = imaplib.IMAP4('127.0.0.1', server.port)
+
+    started = time.monotonic()
+    changed = _watcher()._wait_for_changes(mail)
+
+    assert changed is True
+    assert time.monotonic() - started >= 0.4
+    assert server.done_received.is_set()
+    # Session is still usable afterwards: no "cannot read from timed out object"
+    assert mail.noop()[0] == 'OK'
+    mail.logout()
+
+
+def test_idle_returns_false_when_stopped():
+    server = FakeIdleServer(quiet_seconds=0, untagged=None)
+    mail = imaplib.IMAP4('127.0.0.1', server.port)
+    watcher = _watcher()
+    threading.Timer(0.3, watcher.stop).start()
+
+    assert watcher._wait_for_changes(mail) is False
+    assert server.done_received.is_set()
+    assert mail.noop()[0] == 'OK'
+    mail.logout()
+
+
+def test_idle_returns_false_at_idle_timeout():
+    server = FakeIdleServer(quiet_seconds=0, untagged=None)
+    mail = imaplib.IMAP4('127.0.0.1', server.port)
+
+    assert _watcher(idle_timeout=0.3)._wait_for_changes(mail) is False
+    assert mail.noop()[0] == 'OK'
+    mail.logout()
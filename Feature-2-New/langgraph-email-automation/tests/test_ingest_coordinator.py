@@ -0,0 +1,73 @@
+"""IngestCoordinator keeps at most one monitor loop across racing start/stop calls."""
+
+import threading
+import time
+
+from imap_idle import InboxWatcher
+from imap_pool import IMAPConnectionError
+from ingest_coordinator import IngestCoordinator
+from ingest_worker import IngestWorker
+
+
+class DownPool:
+    """Every connection attempt fails, so the watcher waits on its stop event between tries"""
+
+    def connection(self):
+        raise IMAPConnectionError('backing off')
+
+
+def _coordinator():
+    coordinator = IngestCoordinator(IngestWorker(), lambda: [])
+    watchers = []
+
+    def create_watcher(run_cycle):
+        watcher = InboxWatcher(DownPool(), lambda: len(run_cycle()), min_poll_interval=0.05)
+        watchers.append(watcher)
+        return watcher
+
+    return coordinator, watchers, create_watcher
+
+
+def test_stop_right_after_start_is_not_lost():
+    watcher = InboxWatcher(DownPool(), lambda: 0, min_poll_interval=0.05)
+    watcher.start()
+    watcher.stop()
+    watcher.join(2)
+    assert not watcher.is_running()
+
+
+def test_stop_waits_for_the_loop_and_restart_gets_a_fresh_one():
+    coordinator, watchers, create_watcher = _coordinator()
+    assert coordinator.start_monitor(create_watcher)
+    assert coordinator.stop_monitor(timeout=2)
+    assert not watchers[0].is_running()
+
+    assert coordinator.start_monitor(create_watcher)
+    assert len(watchers) == 2 and watchers[1].is_running()
+    coordinator.stop_monitor(timeout=2)
+
+
+def test_concurrent_starts_and_stops_leave_one_loop_at_most():
+    coordinator, watchers, create_watcher = _coordinator()
+    started = []
+
+    def start():
+        started.append(coordinator.start_monitor(create_watcher))
+
+    threads = [threading.Thread(target=start) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert started.count(True) == 1
+
+    for _ in range(5):
+        stopper = threading.Thread(target=coordinator.stop_monitor, kwargs={'timeout': 2})
+        stopper.start()
+        coordinator.start_monitor(create_watcher)
+        stopper.join()
+        time.sleep(0.01)
+        assert sum(watcher.is_running() for watcher in watchers) <= 1
+
+    coordinator.stop_monitor(timeout=2)
+    assert not any(watcher.is_running() for watcher in watchers)
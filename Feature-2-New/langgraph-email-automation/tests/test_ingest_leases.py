@@ -0,0 +1,150 @@
+"""Lease hand-off between processes and the ingest fence built on it."""
+
+import threading
+import time
+
+from ingest_leases import LeaseManager
+from mailboxes import MailboxWatcher
+from ticket_store import SQLiteTicketStore
+from uid_sync import UIDSyncEngine, UIDSyncState, StoreSyncState
+from test_uid_sync import FakeMailbox
+
+
+def _store(tmp_path):
+    return SQLiteTicketStore(str(tmp_path / 'tickets.db'))
+
+
+def test_mailboxes_are_handed_to_a_new_process_and_fenced_off_the_old_one(tmp_path):
+    store = _store(tmp_path)
+    first = LeaseManager(store, ['a', 'b'], owner='first')
+    second = LeaseManager(store, ['a', 'b'], owner='second')
+
+    first.tick()
+    assert first.holds('a') and first.holds('b')
+    second.tick()
+    assert not second.holds('a') and not second.holds('b')
+
+    first.tick()
+    second.tick()
+    assert first.holds('a') and not first.holds('b')
+    assert second.holds('b')
+    assert first.live_owners() == {'first', 'second'}
+
+
+def test_lease_handoff_waits_while_ingest_is_busy(tmp_path):
+    store = _store(tmp_path)
+    first = LeaseManager(store, ['a', 'b'], owner='first', busy=lambda: True)
+    second = LeaseManager(store, ['a', 'b'], owner='second')
+    first.tick()
+    second.tick()
+    first.tick()
+    assert first.holds('a') and first.holds('b')
+
+
+def test_fence_closes_when_renewals_stop(tmp_path):
+    manager = LeaseManager(_store(tmp_path), ['a'], owner='first', ttl_seconds=0.3)
+    manager.tick()
+    assert manager.holds('a')
+    time.sleep(0.25)
+    assert not manager.holds('a')
+    manager.tick()
+    assert manager.holds('a')
+
+
+def test_fenced_engine_does_not_advance_the_shared_mark(tmp_path):
+    store = _store(tmp_path)
+    manager = LeaseManager(store, ['a'], owner='first')
+    manager.tick()
+    state = StoreSyncState(store, fallback=UIDSyncState(str(tmp_path / 'sync.json')))
+    engine = UIDSyncEngine(state, 'it@example.com', fence=lambda: manager.holds('a'))
+    mail = FakeMailbox(range(1, 11))
+    engine.find_new_uids(mail)
+    mail.deliver(11)
+    mail.deliver(12)
+    uids = engine.find_new_uids(mail)
+    assert uids == [11, 12]
+
+    engine.begin_batch(uids)
+    engine.complete(11)
+    assert state.get(engine.key)['last_uid'] == 11
+
+    manager.stop()
+    engine.complete(12)
+    assert state.get(engine.key)['last_uid'] == 11
+
+
+class FakeWatcher:
+    def __init__(self):
+        self.running = False
+
+    def start(self):
+        self.running = True
+
+    def stop(self):
+        self.running = False
+
+    def join(self, timeout=None):
+        pass
+
+    def is_running(self):
+        return self.running
+
+    def is_stopping(self):
+        return False
+
+    def get_status(self):
+        return {}
+
+
+def test_idle_watchers_only_run_for_held_mailboxes():
+    held = {'a'}
+    watchers = {'a': FakeWatcher(), 'b': FakeWatcher()}
+    watcher = MailboxWatcher(watchers, active=lambda name: name in held)
+
+    watcher.start()
+    assert watchers['a'].running and not watchers['b'].running
+
+    held.add('b')
+    watcher.resume('b')
+    watcher.pause('a')
+    assert watchers['b'].running and not watchers['a'].running
+
+    watcher.stop()
+    watcher.resume('a')
+    assert not any(w.running for w in watchers.values())
+
+
+def test_mailbox_watcher_run_blocks_until_stopped():
+    watchers = {'a': FakeWatcher(), 'b': FakeWatcher()}
+    watcher = MailboxWatcher(watchers)
+    runner = threading.Thread(target=watcher.run)
+    runner.start()
+    time.sleep(0.1)
+    assert runner.is_alive() and all(w.running for w in watchers.values())
+
+    watcher.stop()
+    runner.join(3)
+    assert not runner.is_alive()
+    assert not any(w.running for w in watchers.values())
+
+
+def test_stop_waits_for_a_running_tick_before_releasing(tmp_path):
+    store = _store(tmp_path)
+    in_tick = threading.Event()
+
+    class SlowStore:
+        def __getattr__(self, name):
+            return getattr(store, name)
+
+        def acquire_lease(self, name, owner, ttl_seconds):
+            in_tick.set()
+            time.sleep(0.2)
+            return store.acquire_lease(name, owner, ttl_seconds)
+
+    manager = LeaseManager(SlowStore(), ['a'], owner='first', renew_interval=60)
+    manager.start()
+    assert in_tick.wait(2)
+    manager.stop()
+
+    assert not manager._thread.is_alive()
+    assert store.list_leases() == {}
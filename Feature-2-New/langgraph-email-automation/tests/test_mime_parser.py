@@ -0,0 +1,38 @@
+"""mime_parser decoding and per-message error isolation."""
+
+from mime_parser import MimeParserPool, parse_fetched_batch
+
+PLAIN = (b'From: Ann <ann@example.com>\r\nSubject: VPN down\r\n'
+         b'Content-Type: text/plain; charset=iso-8859-1\r\n\r\nCaf\xe9 VPN is down since this morning\r\n')
+HTML_ONLY = (b'From: Bob <bob@example.com>\r\nSubject: Printer\r\nContent-Type: text/html\r\n\r\n'
+             b'<html><style>p{}</style><p>Printer on floor 3</p><p>is jammed again</p></html>')
+
+
+def test_plain_and_html_bodies_are_decoded():
+    plain, html_only = parse_fetched_batch([{'uid': 1, 'raw': PLAIN}, {'uid': 2, 'raw': HTML_ONLY}])
+
+    assert plain['body'] == 'Café VPN is down since this morning'
+    assert plain['sender'] == 'Ann <ann@example.com>'
+    assert html_only['body'] == 'Printer on floor 3\n\nis jammed again'
+    assert html_only['body_source'] == 'text/html'
+
+
+def test_one_malformed_message_does_not_fail_the_batch():
+    pool = MimeParserPool(workers=0)
+    records = pool.parse_many([{'uid': 1, 'raw': PLAIN}, {'uid': 2, 'raw': 12345}, {'uid': 3, 'raw': HTML_ONLY}])
+
+    assert [record['uid'] for record in records] == [1, 2, 3]
+    assert 'parse_error' in records[1] and 'raw' not in records[1]
+    assert 'parse_error' not in records[0] and 'parse_error' not in records[2]
+    assert pool.get_stats()['parse_errors'] == 1
+
+
+def test_shutdown_waits_for_the_worker_processes():
+    pool = MimeParserPool(workers=2, min_pool_batch=1)
+    records = pool.parse_many([{'uid': uid, 'raw': PLAIN} for uid in range(4)])
+    assert pool.get_stats()['parsed_in_pool'] == 4 and len(records) == 4
+    processes = list(pool._executor._processes.values())
+
+    pool.shutdown(wait=True)
+    assert not pool.get_stats()['pool_running']
+    assert processes and not any(process.is_alive() for process in processes)
@@ -0,0 +1,39 @@
+"""NotificationDigest sends held buckets on stop instead of losing them."""
+
+from notification_digest import NotificationDigest
+
+
+def _digest(sent, **kwargs):
+    return NotificationDigest(
+        lambda message, key: sent.append((message, key)) or True,
+        lambda ticket: ('single', ticket['ticket_id']),
+        lambda recipient, priority, tickets: ('digest', recipient, priority, len(tickets)),
+        **kwargs
+    )
+
+
+def _ticket(n, priority='low', assigned_to='staff@company.com'):
+    return {'ticket_id': f'TICKET-{n}', 'priority': priority, 'assigned_to': assigned_to}
+
+
+def test_stop_sends_buckets_whose_window_is_still_open():
+    sent = []
+    digest = _digest(sent)
+    for n in range(3):
+        digest.add(_ticket(n))
+
+    assert digest.stop() == 1
+    assert [message for message, _ in sent] == [('digest', 'staff@company.com', 'low', 3)]
+    assert sorted(digest.ticket_ids_for(sent[0][1])) == ['TICKET-0', 'TICKET-1', 'TICKET-2']
+    assert digest.get_stats()['pending_tickets'] == 0
+
+
+def test_stop_waives_the_recipient_rate_limit():
+    sent = []
+    digest = _digest(sent, burst=1, max_per_hour=1)
+    digest.rate_limiter.try_acquire('staff@company.com')
+    digest.add(_ticket(1, 'medium'))
+    digest.add(_ticket(2, 'low'))
+
+    assert digest.stop() == 2
+    assert sorted(message for message, _ in sent) == [('single', 'TICKET-1'), ('single', 'TICKET-2')]
@@ -0,0 +1,70 @@
+"""NotificationOutbox drains its queue on stop instead of dropping it."""
+
+import time
+from email.message import Message
+
+from notification_outbox import NotificationOutbox
+
+
+class FakeSMTP:
+    def __init__(self, fail=False, delay=0.0):
+        self.fail = fail
+        self.delay = delay
+        self.sent = []
+
+    def send_message(self, message):
+        time.sleep(self.delay)
+        if self.fail:
+            raise OSError('connection refused')
+        self.sent.append(message['To'])
+
+    def noop(self):
+        return (250, b'ok')
+
+    def quit(self):
+        pass
+
+
+def _outbox(smtp, results, **kwargs):
+    outbox = NotificationOutbox('smtp.test', 465, 'user', 'secret',
+                                on_result=lambda key, sent: results.append((key, sent)), **kwargs)
+    outbox._connect = lambda: smtp
+    return outbox
+
+
+def _message(to):
+    message = Message()
+    message['To'] = to
+    return message
+
+
+def test_stop_delivers_everything_still_queued():
+    smtp, results = FakeSMTP(delay=0.02), []
+    outbox = _outbox(smtp, results)
+    for n in range(5):
+        outbox.enqueue(_message(f'staff{n}@company.com'), f'TICKET-{n}')
+
+    assert outbox.stop(drain_timeout=5) == 0
+    assert len(smtp.sent) == 5
+    assert sorted(results) == [(f'TICKET-{n}', True) for n in range(5)]
+
+
+def test_stop_returns_promptly_with_an_idle_worker():
+    outbox = _outbox(FakeSMTP(), [])
+    outbox.start()
+    time.sleep(0.05)
+
+    started = time.monotonic()
+    assert outbox.stop(drain_timeout=5) == 0
+    assert time.monotonic() - started < 1
+
+
+def test_retries_not_due_before_the_deadline_are_left_pending():
+    results = []
+    outbox = _outbox(FakeSMTP(fail=True), results, initial_backoff=60)
+    outbox.enqueue(_message('staff@company.com'), 'TICKET-1')
+
+    started = time.monotonic()
+    assert outbox.stop(drain_timeout=0.5) == 1
+    assert time.monotonic() - started < 2
+    assert results == []
@@ -0,0 +1,151 @@
+"""process_new_emails budget and carry-over, the write stage, and simulated emails."""
+
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from backlog_drainer import BacklogDrainer
+from duplicate_detector import DuplicateDetector
+from enhanced_gmail_system import EnhancedGmailTicketSystem
+from ingest_pipeline import PipelineBatch, PipelineStage, StagedPipeline
+
+
+def _system(inbox, gate):
+    def write(batch, chunks):
+        gate.wait(5)
+        return [{'ticket_id': f'TICKET-{uid}'} for _, uids in chunks for uid in uids]
+
+    system = EnhancedGmailTicketSystem.__new__(EnhancedGmailTicketSystem)
+    system.mailboxes = {'default': SimpleNamespace(uid_sync=SimpleNamespace(begin_batch=lambda uids: None),
+                                                   duplicate_detector=None)}
+    system.lease_manager = None
+    system.backlog_drainer = BacklogDrainer(chunk_size=2, cycle_budget_seconds=0.3)
+    system.ingest_pipeline = StagedPipeline([PipelineStage('write', write)], poll_interval=0.05)
+    system.ingest_pipeline.start()
+    system._carried_batches = []
+    system._ingest_active = False
+    system.find_new_email_uids = lambda mailbox: list(inbox)
+    return system
+
+
+def test_slow_batch_carries_over_and_is_collected_by_the_next_cycle():
+    inbox, gate = [1, 2], threading.Event()
+    system = _system(inbox, gate)
+    try:
+        started = time.monotonic()
+        assert system.process_new_emails() == []
+        assert time.monotonic() - started < 1.5
+        assert system.backlog_drainer.carry_over == {'default': [1, 2]}
+        assert len(system._carried_batches) == 1
+
+        gate.set()
+        inbox.append(3)
+        tickets = system.process_new_emails()
+        assert sorted(ticket['ticket_id'] for ticket in tickets) == ['TICKET-1', 'TICKET-2', 'TICKET-3']
+        assert system.backlog_drainer.carry_over == {}
+        assert system._carried_batches == []
+    finally:
+        gate.set()
+        system.ingest_pipeline.stop()
+
+
+def test_full_pipeline_leaves_unsubmitted_chunks_for_the_next_cycle():
+    inbox, gate = [1, 2, 3, 4, 5, 6], threading.Event()
+    system = _system(inbox, gate)
+    # One chunk in the stalled stage, one in its queue; the third cannot be handed over
+    system.ingest_pipeline.stages[0].queue = queue.Queue(maxsize=1)
+    try:
+        started = time.monotonic()
+        assert system.process_new_emails() == []
+        assert time.monotonic() - started < 1.5
+        assert system.backlog_drainer.carry_over == {'default': [1, 2, 3, 4]}
+        assert system.backlog_drainer.queue_depth == 6
+
+        gate.set()
+        tickets = system.process_new_emails()
+        assert sorted(ticket['ticket_id'] for ticket in tickets) == [f'TICKET-{uid}' for uid in range(1, 7)]
+        assert system.backlog_drainer.carry_over == {}
+    finally:
+        gate.set()
+        system.ingest_pipeline.stop()
+
+
+class FakeIMAP:
+    def __init__(self, stored):
+        self.stored = stored
+
+    def uid(self, command, uid_set, *args):
+        self.stored.append((command, uid_set))
+        return 'OK', [b'']
+
+
+class FakePool:
+    def __init__(self, stored):
+        self.stored = stored
+
+    @contextmanager
+    def connection(self):
+        yield FakeIMAP(self.stored)
+
+
+def _writer(stored, store_tickets):
+    system = EnhancedGmailTicketSystem.__new__(EnhancedGmailTicketSystem)
+    completed = []
+    mailbox = SimpleNamespace(name='default', imap_pool=FakePool(stored), duplicate_detector=None,
+                              uid_sync=SimpleNamespace(complete=completed.append, fail=lambda uid, e: None))
+    system.mailboxes = {'default': mailbox}
+    system.primary_mailbox = mailbox
+    system.lease_manager = None
+    system.create_ticket = lambda email_data, analysis: {'ticket_id': f"TICKET-{email_data['uid']}"}
+    system._store_tickets = store_tickets
+    return system, completed
+
+
+def _item(uid):
+    return {'email': {'id': str(uid), 'uid': uid, 'mailbox': 'default', 'subject': 'VPN down', 'sender': 'a@b.c'},
+            'duplicate_of': None, 'analysis': {}}
+
+
+def test_messages_are_marked_read_only_after_their_tickets_are_stored():
+    stored = []
+    system, completed = _writer(stored, lambda tickets: None)
+    system._write_stage(PipelineBatch(), [_item(7), _item(8)])
+    assert completed == [7, 8]
+    assert stored == [('STORE', '7,8')]
+
+    def failing_store(tickets):
+        raise OSError('database is locked')
+
+    stored.clear()
+    system, completed = _writer(stored, failing_store)
+    with pytest.raises(OSError):
+        system._write_stage(PipelineBatch(), [_item(9)])
+    assert completed == [] and stored == []
+
+
+def test_simulated_repeat_attaches_and_a_failed_simulation_leaves_no_claim():
+    system = EnhancedGmailTicketSystem.__new__(EnhancedGmailTicketSystem)
+    system.duplicate_detector = DuplicateDetector()
+    stored, attached = [], []
+    system.analyze_email_with_ai = lambda email_data: {}
+    system.create_ticket = lambda email_data, analysis: {'ticket_id': f'TICKET-{len(stored) + 1}'}
+    system.send_notification_to_staff = lambda ticket: True
+    system._attach_duplicate = lambda parent_id, email_data: attached.append(parent_id) or {'ticket_id': parent_id}
+    body = 'The VPN has been down for the whole third floor since nine this morning'
+
+    def failing_store(ticket):
+        raise OSError('database is locked')
+
+    system._store_ticket = failing_store
+    with pytest.raises(OSError):
+        system.simulate_employee_email('a@company.com', 'VPN down', body)
+    assert system.duplicate_detector.get_stats()['indexed'] == 0
+
+    system._store_ticket = stored.append
+    assert system.simulate_employee_email('a@company.com', 'VPN down', body)['ticket_id'] == 'TICKET-1'
+    assert system.simulate_employee_email('b@company.com', 'VPN down', body) == {'ticket_id': 'TICKET-1'}
+    assert attached == ['TICKET-1'] and len(stored) == 1
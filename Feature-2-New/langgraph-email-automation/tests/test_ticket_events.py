@@ -0,0 +1,40 @@
+"""TicketEventBus replays missed events only for ids it issued itself."""
+
+from ticket_events import TicketEventBus
+
+
+def _drain(queue):
+    events = []
+    while not queue.empty():
+        events.append(queue.get_nowait())
+    return events
+
+
+def test_reconnect_within_history_replays_the_missed_events():
+    bus = TicketEventBus()
+    for n in range(3):
+        bus.publish('ticket_created', {'n': n})
+
+    events = _drain(bus.subscribe(f'{bus.epoch}-1'))
+    assert [event['data']['n'] for event in events] == [1, 2]
+
+
+def test_id_from_another_process_gets_a_resync():
+    bus, other = TicketEventBus(), TicketEventBus()
+    for n in range(5):
+        other.publish('ticket_created', {'n': n})
+    bus.publish('ticket_created', {'n': 0})
+
+    assert [event['type'] for event in _drain(bus.subscribe(f'{other.epoch}-5'))] == ['resync']
+    assert [event['type'] for event in _drain(bus.subscribe(f'{bus.epoch}-5'))] == ['resync']
+    assert [event['type'] for event in _drain(bus.subscribe('3'))] == ['resync']
+    assert _drain(bus.subscribe(f'{bus.epoch}-1')) == []
+
+
+def test_store_reload_reaches_subscribers_as_one_resync():
+    bus = TicketEventBus()
+    bus.publish('ticket_created', {'n': 0})
+    bus.publish('tickets_reloaded', {'count': 2, 'tickets': [{'ticket_id': 'TICKET-1'}, {'ticket_id': 'TICKET-2'}]})
+
+    events = _drain(bus.subscribe(f'{bus.epoch}-1'))
+    assert [(event['type'], event['data']) for event in events] == [('resync', {})]
@@ -0,0 +1,59 @@
+"""TicketStats escalation counting and store resync replays."""
+
+from ticket_stats import TicketStats
+
+
+def _ticket(n, **changes):
+    ticket = {'ticket_id': f'TICKET-{n}', 'category': 'hardware', 'priority': 'high', 'status': 'open',
+              'assigned_role': 'IT_HELPDESK_MANAGER', 'assigned_to': 'it@company.com',
+              'created_at': '2026-10-16T09:00:00'}
+    ticket.update(changes)
+    return ticket
+
+
+def test_escalating_a_high_priority_ticket_counts():
+    stats = TicketStats()
+    stats.on_event('ticket_created', _ticket(1))
+    stats.on_event('ticket_updated', _ticket(1, escalated=True, escalated_at='2026-10-16T09:05:00'))
+    assert stats.snapshot()['escalations'] == 1
+
+    # An unrelated update of the escalated ticket is not another escalation; escalating again is
+    stats.on_event('ticket_updated', _ticket(1, escalated=True, escalated_at='2026-10-16T09:05:00', status='resolved'))
+    stats.on_event('ticket_updated', _ticket(1, escalated=True, escalated_at='2026-10-16T09:10:00', status='resolved'))
+    assert stats.snapshot()['escalations'] == 2
+
+
+def test_resync_replay_is_not_counted_as_new_arrivals():
+    stats = TicketStats()
+    for n in range(3):
+        stats.on_event('ticket_created', _ticket(n))
+    stats.on_event('ticket_updated', _ticket(0, escalated=True, escalated_at='2026-10-16T09:05:00'))
+
+    # What SQLiteTicketStore._reload emits after falling behind the change log
+    tickets = [_ticket(n, **({'escalated': True, 'escalated_at': '2026-10-16T09:05:00'} if n == 0 else {})) for n in range(3)]
+    stats.on_event('tickets_reloaded', {'count': 3, 'tickets': tickets})
+    stats.on_event('ticket_created', _ticket(3))
+
+    snapshot = stats.snapshot()
+    assert snapshot['total_tickets'] == 4
+    assert snapshot['high_priority'] == 4
+    assert snapshot['escalations'] == 1
+    assert sum(bucket['created'] for bucket in snapshot['timeseries']['per_minute']) == 4
+
+
+def test_duplicate_create_events_count_once():
+    stats = TicketStats()
+    stats.on_event('ticket_created', _ticket(1))
+    stats.on_event('ticket_created', _ticket(1))
+    snapshot = stats.snapshot()
+    assert snapshot['total_tickets'] == 1
+    assert sum(bucket['created'] for bucket in snapshot['timeseries']['per_minute']) == 1
+
+
+def test_a_real_clear_resets_everything():
+    stats = TicketStats()
+    stats.on_event('ticket_created', _ticket(1, escalated=True, escalated_at='2026-10-16T09:05:00'))
+    stats.on_event('tickets_cleared', {'count': 1})
+    snapshot = stats.snapshot()
+    assert snapshot['total_tickets'] == 0 and snapshot['escalations'] == 0
+    assert snapshot['timeseries']['per_minute'] == []
@@ -0,0 +1,186 @@
+"""UIDSyncEngine high-water-mark seeding and advance."""
+
+from uid_sync import UIDSyncEngine, UIDSyncState
+
+
+class FakeMailbox:
+    """Just enough of imaplib for SELECT (+ response codes) and UID SEARCH"""
+
+    def __init__(self, uids, unseen=(), uidvalidity=7, report_uidnext=True):
+        self.uids = sorted(uids)
+        self.unseen = set(unseen)
+        self.uidvalidity = uidvalidity
+        self.report_uidnext = report_uidnext
+        self.searches = []
+        self._codes = {}
+
+    def deliver(self, uid):
+        self.uids.append(uid)
+        self.unseen.add(uid)
+
+    def select(self, mailbox):
+        self._codes = {'UIDVALIDITY': [str(self.uidvalidity).encode()]}
+        if self.report_uidnext:
+            self._codes['UIDNEXT'] = [str(max(self.uids, default=0) + 1).encode()]
+        return 'OK', [str(len(self.uids)).encode()]
+
+    def response(self, code):
+        return code, self._codes.pop(code, [None])
+
+    def uid(self, command, charset, criteria):
+        assert command == 'SEARCH'
+        self.searches.append(criteria)
+        if criteria == 'ALL':
+            found = self.uids
+        elif criteria == 'UNSEEN':
+            found = [uid for uid in self.uids if uid in self.unseen]
+        else:
+            low = int(criteria.split()[1].split(':')[0])
+            # Like a real server, "n:*" also matches the newest message when it is below n
+            found = [uid for uid in self.uids if uid >= low] or self.uids[-1:]
+        return 'OK', [' '.join(str(uid) for uid in found).encode()]
+
+
+def _engine(tmp_path):
+    state = UIDSyncState(str(tmp_path / 'sync.json'))
+    return UIDSyncEngine(state, 'it@example.com'), state
+
+
+def _process(engine, uids):
+    engine.begin_batch(uids)
+    for uid in uids:
+        engine.complete(uid)
+
+
+def test_first_sync_without_unread_mail_does_not_return_history(tmp_path):
+    engine, state = _engine(tmp_path)
+    mail = FakeMailbox(range(1, 501))
+
+    assert engine.find_new_uids(mail) == []
+    assert state.get(engine.key)['last_uid'] == 500
+    # Next cycle only sees mail that arrived after the first sync
+    assert engine.find_new_uids(mail) == []
+    mail.deliver(501)
+    assert engine.find_new_uids(mail) == [501]
+
+
+def test_unseen_mail_is_a_one_off_backlog_not_the_mark(tmp_path):
+    engine, state = _engine(tmp_path)
+    mail = FakeMailbox(range(1, 501), unseen=[10, 250, 499])
+
+    assert engine.find_new_uids(mail) == [10, 250, 499]
+    assert engine.last_uid == 500
+    # Read mail between the unseen UIDs is never returned
+    assert engine.find_new_uids(mail) == [10, 250, 499]
+    # Mark is only persisted once the backlog is done (a restart re-reads UNSEEN meanwhile)
+    assert state.get(engine.key) is None
+
+    _process(engine, [10, 250, 499])
+    assert state.get(engine.key)['last_uid'] == 500
+    assert engine.find_new_uids(mail) == []
+
+
+def test_backlog_does_not_hold_back_new_mail(tmp_path):
+    engine, state = _engine(tmp_path)
+    mail = FakeMailbox(range(1, 11), unseen=[4])
+    assert engine.find_new_uids(mail) == [4]
+
+    mail.deliver(11)
+    uids = engine.find_new_uids(mail)
+    assert uids == [4, 11]
+    _process(engine, [11])
+    assert engine.last_uid == 11
+    assert state.get(engine.key) is None
+    _process(engine, [4])
+    assert state.get(engine.key)['last_uid'] == 11
+
+
+def test_mark_advances_only_over_contiguous_completions(tmp_path):
+    engine, state = _engine(tmp_path)
+    mail = FakeMailbox(range(1, 101))
+    engine.find_new_uids(mail)
+    for uid in (101, 102, 103):
+        mail.deliver(uid)
+
+    uids = engine.find_new_uids(mail)
+    assert uids == [101, 102, 103]
+    engine.begin_batch(uids)
+    engine.complete(102)
+    assert engine.last_uid == 100
+    engine.complete(101)
+    assert engine.last_uid == 102
+    assert state.get(engine.key)['last_uid'] == 102
+    engine.complete(103)
+    assert state.get(engine.key)['last_uid'] == 103
+    assert engine.find_new_uids(mail) == []
+
+
+def test_seed_falls_back_to_max_uid_without_uidnext(tmp_path):
+    engine, state = _engine(tmp_path)
+    mail = FakeMailbox([3, 9, 42], report_uidnext=False)
+
+    assert engine.find_new_uids(mail) == []
+    assert 'ALL' in mail.searches
+    assert state.get(engine.key)['last_uid'] == 42
+
+
+def test_uidvalidity_change_reseeds_from_the_new_mailbox(tmp_path):
+    engine, state = _engine(tmp_path)
+    engine.find_new_uids(FakeMailbox(range(1, 51)))
+
+    rebuilt = FakeMailbox(range(1, 21), unseen=[20], uidvalidity=8)
+    assert engine.find_new_uids(rebuilt) == [20]
+    assert engine.uidvalidity == 8
+    assert engine.last_uid == 20
+
+
+def test_mark_survives_a_restart(tmp_path):
+    engine, _ = _engine(tmp_path)
+    mail = FakeMailbox(range(1, 31))
+    engine.find_new_uids(mail)
+    mail.deliver(31)
+    _process(engine, engine.find_new_uids(mail))
+
+    restarted, _ = _engine(tmp_path)
+    assert restarted.last_uid == 31
+    assert restarted.find_new_uids(mail) == []
+
+
+def test_failing_uid_holds_the_mark_until_it_succeeds(tmp_path):
+    engine, _ = _engine(tmp_path)
+    mail = FakeMailbox(range(1, 11))
+    engine.find_new_uids(mail)
+    mail.deliver(11)
+    mail.deliver(12)
+
+    engine.begin_batch([11, 12])
+    assert engine.fail(11, 'boom') is False
+    engine.complete(12)
+    assert engine.last_uid == 10
+    # Retried next cycle and succeeds this time
+    assert engine.find_new_uids(mail) == [11, 12]
+    engine.begin_batch([11, 12])
+    engine.complete(11)
+    assert engine.last_uid == 12
+    assert engine.get_status()['failing_uids'] == 0
+
+
+def test_poison_uid_is_dead_lettered_after_max_attempts(tmp_path):
+    state = UIDSyncState(str(tmp_path / 'sync.json'))
+    engine = UIDSyncEngine(state, 'it@example.com', max_attempts=3)
+    mail = FakeMailbox(range(1, 11))
+    engine.find_new_uids(mail)
+    mail.deliver(11)
+    mail.deliver(12)
+
+    for attempt in range(3):
+        uids = engine.find_new_uids(mail)
+        assert uids == [11, 12]
+        engine.begin_batch(uids)
+        engine.complete(12)
+        dead = engine.fail(11, 'unparseable')
+    assert dead is True
+    assert engine.last_uid == 12
+    assert state.get(engine.key)['last_uid'] == 12
+    assert engine.get_status()['dead_letters'] == [11]
+    assert engine.find_new_uids(mail) == []
@@ -6,15 +6,19 @@ Shows tickets created from real Gmail inbox monitoring
 
 import os
 import json
+import asyncio
 from datetime import datetime
-from typing import Dict, List
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import HTMLResponse
+from typing import Dict, List, Optional
+from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import HTMLResponse, StreamingResponse
 from pydantic import BaseModel
 import uvicorn
 
 # Import our enhanced ticket system
 from enhanced_gmail_system import initialize_system
+from ingest_worker import IngestWorker
+from ingest_coordinator import IngestCoordinator
 
 # FastAPI app
 app = FastAPI(
@@ -26,21 +30,52 @@ app = FastAPI(
 # Global ticket system
 ticket_system = None
 
+# Blocking IMAP/AI/SMTP work runs here so the event loop keeps serving dashboard reads
+ingest_worker = IngestWorker()
+
+# Single-flight inbox cycles + the one monitor loop (created once the ticket system is up)
+ingest_coordinator = None
+
 class EmailRequest(BaseModel):
     sender: str
     subject: str
     body: str
 
+def start_monitor() -> bool:
+    """Start this process's monitor loop unless it is already running"""
+    def report_new_tickets(new_tickets):
+        if new_tickets:
+            print(f"🔄 Real-time monitoring: {len(new_tickets)} new tickets created")
+    
+    # IMAP IDLE wakes the pipeline only when mail arrives; cycles go through the single-flight coordinator
+    return ingest_coordinator.start_monitor(
+        lambda run_cycle: ticket_system.create_inbox_watcher(on_tickets=report_new_tickets, run_cycle=run_cycle)
+    )
+
 @app.on_event("startup")
 async def startup():
     """Initialize enhanced ticket system"""
-    global ticket_system
+    global ticket_system, ingest_coordinator
     try:
         ticket_system = initialize_system()
+        ticket_system.events.attach_loop(asyncio.get_running_loop())
+        ingest_coordinator = IngestCoordinator(ingest_worker, ticket_system.process_new_emails)
         print("✅ Enhanced Gmail Ticket System initialized for dashboard")
+        if ticket_system.lease_manager:
+            # Scale-out: every worker monitors, but only ingests the mailboxes it holds leases for
+            start_monitor()
     except Exception as e:
         print(f"❌ Failed to initialize: {e}")
 
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop monitoring, hand this worker's mailbox leases to the others and close IMAP sessions"""
+    if ingest_coordinator:
+        await run_in_threadpool(ingest_coordinator.stop_monitor)
+    if ticket_system:
+        # IMAP logouts and lease writes block; keep them off the event loop
+        await run_in_threadpool(ticket_system.shutdown)
+
 @app.get("/", response_class=HTMLResponse)
 async def dashboard():
     """Serve ticket dashboard"""
@@ -245,17 +280,37 @@ async def dashboard():
                 <div id="ticketsList" class="divide-y divide-gray-100">
                     <!-- Tickets will be populated here -->
                 </div>
+                <div class="p-4 text-center">
+                    <button id="loadMoreBtn" class="px-6 py-2 bg-gray-100 text-gray-700 rounded-lg hover:bg-gray-200 hidden">
+                        <i class="fas fa-chevron-down mr-2"></i>Load More
+                    </button>
+                </div>
             </div>
         </div>
 
         <script>
             let tickets = [];
             let systemData = {};
+            let nextCursor = null;
+            
+            // Only the fields the ticket cards use; full details come from /api/ticket/{id}
+            const TICKET_FIELDS = 'ticket_id,subject,sender_name,sender_email,priority,category,issue_type,urgency_reason,description,assigned_role,assigned_to,created_at,status,notification_sent,notification_status,duplicate_count';
+            
+            function dashboardQuery(cursor) {
+                const params = new URLSearchParams({ limit: 50, fields: TICKET_FIELDS });
+                const priorityFilter = document.getElementById('priorityFilter').value;
+                const categoryFilter = document.getElementById('categoryFilter').value;
+                if (priorityFilter !== 'all') params.set('priority', priorityFilter);
+                if (categoryFilter !== 'all') params.set('category', categoryFilter);
+                if (cursor) params.set('cursor', cursor);
+                return '/api/dashboard?' + params.toString();
+            }
 
             // Initialize dashboard
             document.addEventListener('DOMContentLoaded', function() {
                 loadDashboardData();
-                setInterval(loadDashboardData, 30000); // Refresh every 30 seconds
+                connectEvents(); // Deltas are pushed by the server; no polling
+                syncMonitoringState();
                 
                 // Event listeners
                 document.getElementById('refreshBtn').addEventListener('click', () => checkInboxNow(true));
@@ -263,16 +318,18 @@ async def dashboard():
                 document.getElementById('clearTicketsBtn').addEventListener('click', clearAllTickets);
                 document.getElementById('priorityFilter').addEventListener('change', filterTickets);
                 document.getElementById('categoryFilter').addEventListener('change', filterTickets);
+                document.getElementById('loadMoreBtn').addEventListener('click', loadMoreTickets);
             });
 
             async function loadDashboardData() {
                 try {
                     showProcessing(true);
-                    const response = await fetch('/api/dashboard');
+                    const response = await fetch(dashboardQuery(null));
                     if (response.ok) {
                         const data = await response.json();
                         systemData = data;
                         tickets = data.tickets || [];
+                        nextCursor = data.page?.next_cursor || null;
                         updateUI();
                     }
                 } catch (error) {
@@ -282,50 +339,112 @@ async def dashboard():
                 }
             }
 
+            let statsTimer = null;
+
+            function connectEvents() {
+                const source = new EventSource('/api/events');
+                source.addEventListener('ticket_created', e => applyTicketDelta(JSON.parse(e.data), true));
+                source.addEventListener('ticket_updated', e => applyTicketDelta(JSON.parse(e.data), false));
+                source.addEventListener('tickets_cleared', () => {
+                    tickets = [];
+                    nextCursor = null;
+                    renderTickets();
+                    scheduleStatsRefresh();
+                });
+                source.addEventListener('resync', () => loadDashboardData());
+            }
+
+            function matchesFilters(ticket) {
+                const priorityFilter = document.getElementById('priorityFilter').value;
+                const categoryFilter = document.getElementById('categoryFilter').value;
+                return (priorityFilter === 'all' || ticket.priority === priorityFilter) &&
+                       (categoryFilter === 'all' || ticket.category === categoryFilter);
+            }
+
+            function applyTicketDelta(ticket, created) {
+                const index = tickets.findIndex(t => t.ticket_id === ticket.ticket_id);
+                if (index >= 0) {
+                    if (matchesFilters(ticket)) {
+                        tickets[index] = ticket;
+                    } else {
+                        tickets.splice(index, 1);
+                    }
+                } else if (created && matchesFilters(ticket)) {
+                    tickets.unshift(ticket); // Newest first, same as the server's default sort
+                }
+                renderTickets();
+                scheduleStatsRefresh();
+            }
+
+            function scheduleStatsRefresh() {
+                // A burst of deltas triggers one counters refresh
+                if (statsTimer) return;
+                statsTimer = setTimeout(async () => {
+                    statsTimer = null;
+                    try {
+                        const response = await fetch('/api/stats');
+                        if (response.ok) {
+                            const data = await response.json();
+                            systemData.stats = data.stats;
+                            systemData.system_info = data.system_info;
+                            updateStats();
+                        }
+                    } catch (error) {
+                        console.error('Error refreshing stats:', error);
+                    }
+                }, 1000);
+            }
+
+            async function loadMoreTickets() {
+                if (!nextCursor) return;
+                try {
+                    const response = await fetch(dashboardQuery(nextCursor));
+                    if (response.ok) {
+                        const data = await response.json();
+                        tickets = tickets.concat(data.tickets || []);
+                        nextCursor = data.page?.next_cursor || null;
+                        renderTickets();
+                    }
+                } catch (error) {
+                    console.error('Error loading more tickets:', error);
+                }
+            }
+
             function updateUI() {
+                updateStats();
+                renderTickets();
+            }
+
+            function updateStats() {
+                const stats = systemData.stats || {};
+                
                 // Update stats
-                document.getElementById('totalTickets').textContent = tickets.length;
+                document.getElementById('totalTickets').textContent = stats.total_tickets || 0;
                 document.getElementById('emailsProcessed').textContent = systemData.system_info?.total_processed || 0;
                 document.getElementById('uptime').textContent = systemData.system_info?.uptime || '--';
                 document.getElementById('lastCheck').textContent = new Date().toLocaleTimeString();
 
-                // Update priority counts
-                const priorityCounts = { high: 0, medium: 0, low: 0 };
-                tickets.forEach(ticket => priorityCounts[ticket.priority]++);
-                
-                document.getElementById('highPriorityTickets').textContent = priorityCounts.high;
-                document.getElementById('mediumPriorityTickets').textContent = priorityCounts.medium;
-                document.getElementById('lowPriorityTickets').textContent = priorityCounts.low;
+                // Update priority counts (server-side totals, not just the loaded page)
+                document.getElementById('highPriorityTickets').textContent = stats.high_priority || 0;
+                document.getElementById('mediumPriorityTickets').textContent = stats.medium_priority || 0;
+                document.getElementById('lowPriorityTickets').textContent = stats.low_priority || 0;
 
                 // Update staff assignment counts
-                const staffCounts = {};
-                tickets.forEach(ticket => {
-                    const role = ticket.assigned_role;
-                    staffCounts[role] = (staffCounts[role] || 0) + 1;
-                });
+                const staffCounts = stats.tickets_by_role || {};
 
                 document.getElementById('securityTickets').textContent = (staffCounts.SOFTWARE_SECURITY_OFFICER || 0) + ' tickets';
                 document.getElementById('itManagerTickets').textContent = (staffCounts.IT_HELPDESK_MANAGER || 0) + ' tickets';
                 document.getElementById('networkTickets').textContent = (staffCounts.NETWORK_ADMIN || 0) + ' tickets';
                 document.getElementById('hrTickets').textContent = (staffCounts.HR_COORDINATOR || 0) + ' tickets';
                 document.getElementById('procurementTickets').textContent = (staffCounts.PROCUREMENT_OFFICER || 0) + ' tickets';
-
-                // Render tickets
-                renderTickets();
             }
 
             function renderTickets() {
                 const ticketsList = document.getElementById('ticketsList');
-                const priorityFilter = document.getElementById('priorityFilter').value;
-                const categoryFilter = document.getElementById('categoryFilter').value;
+                document.getElementById('loadMoreBtn').classList.toggle('hidden', !nextCursor);
 
-                let filteredTickets = tickets;
-                if (priorityFilter !== 'all') {
-                    filteredTickets = filteredTickets.filter(t => t.priority === priorityFilter);
-                }
-                if (categoryFilter !== 'all') {
-                    filteredTickets = filteredTickets.filter(t => t.category === categoryFilter);
-                }
+                // Filtering happens server-side; this is already the filtered page
+                const filteredTickets = tickets;
 
                 if (filteredTickets.length === 0) {
                     ticketsList.innerHTML = `
@@ -345,6 +464,7 @@ async def dashboard():
                                     <span class="px-3 py-1 rounded-full text-xs font-bold ${getPriorityClass(ticket.priority)}">${ticket.priority.toUpperCase()}</span>
                                     <span class="px-3 py-1 rounded-full text-xs font-semibold ${getCategoryClass(ticket.category)}">${ticket.category.toUpperCase()}</span>
                                     <span class="text-xs text-gray-500">#{ticket.ticket_id}</span>
+                                    ${ticket.duplicate_count ? `<span class="px-3 py-1 rounded-full text-xs font-semibold bg-indigo-100 text-indigo-800"><i class="fas fa-link mr-1"></i>+${ticket.duplicate_count} related</span>` : ''}
                                 </div>
                                 <h3 class="text-lg font-semibold text-gray-800 mb-2">${ticket.subject}</h3>
                                 <div class="grid grid-cols-1 md:grid-cols-2 gap-4 text-sm">
@@ -355,7 +475,7 @@ async def dashboard():
                                     <div>
                                         <p class="text-gray-600"><i class="fas fa-user-tag mr-1"></i><strong>Assigned to:</strong> ${formatRole(ticket.assigned_role)}</p>
                                         <p class="text-gray-600"><i class="fas fa-clock mr-1"></i>${formatDateTime(ticket.created_at)}</p>
-                                        <p class="text-gray-600"><i class="fas fa-${ticket.notification_sent ? 'check-circle text-green-500' : 'exclamation-circle text-red-500'} mr-1"></i><strong>Notification:</strong> ${ticket.notification_sent ? 'Sent to staff' : 'Failed to send'}</p>
+                                        <p class="text-gray-600"><i class="fas fa-${ticket.notification_sent ? 'check-circle text-green-500' : ticket.notification_status === 'queued' ? 'clock text-yellow-500' : 'exclamation-circle text-red-500'} mr-1"></i><strong>Notification:</strong> ${ticket.notification_sent ? 'Sent to staff' : ticket.notification_status === 'queued' ? 'Queued for delivery' : 'Failed to send'}</p>
                                     </div>
                                 </div>
                             </div>
@@ -417,7 +537,7 @@ async def dashboard():
             }
 
             function filterTickets() {
-                renderTickets();
+                loadDashboardData();
             }
 
             async function checkInboxNow(showAlert = true) {
@@ -432,7 +552,6 @@ async def dashboard():
                             // Show subtle notification for real-time monitoring
                             console.log(`🔄 Real-time: ${result.new_tickets} new tickets created`);
                         }
-                        loadDashboardData();
                     }
                 } catch (error) {
                     if (showAlert) {
@@ -515,7 +634,6 @@ async def dashboard():
                     if (response.ok) {
                         const result = await response.json();
                         alert(`Simulated employee email processed! Ticket created: ${result.ticket_id}`);
-                        loadDashboardData();
                     }
                 } catch (error) {
                     alert('Error simulating email: ' + error.message);
@@ -524,8 +642,9 @@ async def dashboard():
                 }
             }
 
-            function viewTicket(ticketId) {
-                const ticket = tickets.find(t => t.ticket_id === ticketId);
+            async function viewTicket(ticketId) {
+                const response = await fetch(`/api/ticket/${ticketId}`);
+                const ticket = response.ok ? await response.json() : null;
                 if (ticket) {
                     alert(`Ticket Details:\\n\\nID: ${ticket.ticket_id}\\nFrom: ${ticket.sender_name}\\nPriority: ${ticket.priority}\\nAssigned to: ${formatRole(ticket.assigned_role)}\\n\\nDescription:\\n${ticket.description}`);
                 }
@@ -537,7 +656,6 @@ async def dashboard():
                     if (response.ok) {
                         const result = await response.json();
                         alert(`✅ Ticket ${ticketId} marked as resolved!`);
-                        loadDashboardData();
                     }
                 } catch (error) {
                     alert('Error resolving ticket: ' + error.message);
@@ -550,7 +668,6 @@ async def dashboard():
                     if (response.ok) {
                         const result = await response.json();
                         alert(`⚠️ Ticket ${ticketId} escalated to manager!`);
-                        loadDashboardData();
                     }
                 } catch (error) {
                     alert('Error escalating ticket: ' + error.message);
@@ -573,7 +690,6 @@ async def dashboard():
                         const response = await fetch('/api/tickets/clear', { method: 'POST' });
                         if (response.ok) {
                             alert('🗑️ All tickets cleared!');
-                            loadDashboardData();
                         }
                     } catch (error) {
                         alert('Error clearing tickets: ' + error.message);
@@ -582,51 +698,147 @@ async def dashboard():
             }
 
             let realTimeMonitoring = false;
-            let monitoringInterval;
 
-            function toggleRealTimeMonitoring() {
+            function setMonitoringButton(active) {
                 const btn = document.getElementById('realTimeToggle');
-                if (!realTimeMonitoring) {
-                    realTimeMonitoring = true;
+                realTimeMonitoring = active;
+                if (active) {
                     btn.innerHTML = '<i class="fas fa-stop mr-2"></i>Stop Real-Time Monitoring';
                     btn.classList.remove('bg-red-600', 'hover:bg-red-700');
                     btn.classList.add('bg-orange-600', 'hover:bg-orange-700');
-                    
-                    // Start real-time monitoring every 10 seconds
-                    monitoringInterval = setInterval(() => {
-                        checkInboxNow(false); // Silent check
-                    }, 10000);
-                    
-                    alert('🚀 Real-time monitoring started! Checking inbox every 10 seconds.');
                 } else {
-                    realTimeMonitoring = false;
                     btn.innerHTML = '<i class="fas fa-play mr-2"></i>Start Real-Time Monitoring';
                     btn.classList.remove('bg-orange-600', 'hover:bg-orange-700');
                     btn.classList.add('bg-red-600', 'hover:bg-red-700');
-                    
-                    if (monitoringInterval) {
-                        clearInterval(monitoringInterval);
+                }
+            }
+
+            async function syncMonitoringState() {
+                // The monitor loop is shared by every tab, so reflect the server's state
+                try {
+                    const response = await fetch('/api/ingest-status');
+                    if (response.ok) {
+                        const status = await response.json();
+                        setMonitoringButton(!!status.monitoring);
                     }
+                } catch (error) {
+                    console.error('Error loading monitoring state:', error);
+                }
+            }
+
+            async function toggleRealTimeMonitoring() {
+                // One server-side monitor loop watches the inbox; new tickets arrive over /api/events
+                if (!realTimeMonitoring) {
+                    await fetch('/api/start-monitoring', { method: 'POST' });
+                    setMonitoringButton(true);
+                    
+                    alert('🚀 Real-time monitoring started! New tickets appear as soon as mail arrives.');
+                } else {
+                    await fetch('/api/stop-monitoring', { method: 'POST' });
+                    setMonitoringButton(false);
                     
                     alert('⏸️ Real-time monitoring stopped.');
                 }
             }
-
-            // Load initial data
-            loadDashboardData();
         </script>
     </body>
     </html>
     """)
 
 @app.get("/api/dashboard")
-async def get_dashboard_data():
-    """Get dashboard data"""
+async def get_dashboard_data(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    priority: Optional[str] = None,
+    category: Optional[str] = None,
+    assigned_role: Optional[str] = None,
+    assignee: Optional[str] = None,
+    created_after: Optional[str] = None,
+    created_before: Optional[str] = None,
+    sort: str = "created_at",
+    order: str = "desc",
+    fields: Optional[str] = None
+):
+    """Get one page of tickets (cursor pagination, filters, sorting, field projection) plus stats"""
+    global ticket_system
+    if not ticket_system:
+        return {"tickets": [], "page": {}, "stats": {}, "system_info": {}}
+    
+    filters = {
+        "status": status,
+        "priority": priority,
+        "category": category,
+        "assigned_role": assigned_role,
+        "assigned_to": assignee,
+        "created_after": created_after,
+        "created_before": created_before
+    }
+    try:
+        # Store reads take the store lock, which an ingest write may hold; keep them off the event loop
+        return await run_in_threadpool(
+            ticket_system.get_dashboard_data,
+            filters,
+            sort=sort,
+            order=order,
+            limit=limit,
+            cursor=cursor,
+            fields=[field.strip() for field in fields.split(',') if field.strip()] if fields else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@app.get("/api/stats")
+async def get_stats():
+    """Ticket counters and system info only (no tickets)"""
+    global ticket_system
+    if not ticket_system:
+        return {"stats": {}, "system_info": {}}
+    
+    return await run_in_threadpool(ticket_system.get_summary)
+
+@app.get("/api/events")
+async def ticket_events(request: Request):
+    """Server-sent events: ticket_created / ticket_updated / tickets_cleared deltas (resync = reload snapshot)"""
     global ticket_system
     if not ticket_system:
-        return {"tickets": [], "stats": {}, "system_info": {}}
+        raise HTTPException(status_code=503, detail="Ticket system not available")
+    
+    last_event_id = request.headers.get("last-event-id")
+    queue = ticket_system.events.subscribe(last_event_id or None)
+    
+    async def stream():
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+                    continue
+                yield ticket_system.events.format_sse(event)
+        finally:
+            ticket_system.events.unsubscribe(queue)
+    
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/ticket/{ticket_id}")
+async def get_ticket(ticket_id: str):
+    """Get a single ticket with all of its fields"""
+    global ticket_system
+    if not ticket_system:
+        raise HTTPException(status_code=503, detail="Ticket system not available")
     
-    return ticket_system.get_dashboard_data()
+    ticket = await run_in_threadpool(ticket_system.ticket_store.get, ticket_id)
+    if not ticket:
+        raise HTTPException(status_code=404, detail="Ticket not found")
+    return ticket
 
 @app.post("/api/check-inbox")
 async def check_inbox():
@@ -635,13 +847,21 @@ async def check_inbox():
     if not ticket_system:
         raise HTTPException(status_code=503, detail="Ticket system not available")
     
-    new_tickets = ticket_system.process_new_emails()
+    # Joins the cycle already in flight (monitor, another tab) instead of starting a second one
+    new_tickets = await ingest_coordinator.run('manual')
     return {
         "message": "Inbox checked successfully",
         "new_tickets": len(new_tickets),
         "tickets": new_tickets
     }
 
+@app.get("/api/ingest-status")
+async def get_ingest_status():
+    """State of the ingest cycle, the monitor loop and the worker thread"""
+    if not ingest_coordinator:
+        return ingest_worker.get_status()
+    return ingest_coordinator.get_status()
+
 @app.post("/api/simulate-email")
 async def simulate_employee_email(email_request: EmailRequest):
     """Simulate an employee email for testing"""
@@ -649,17 +869,9 @@ async def simulate_employee_email(email_request: EmailRequest):
     if not ticket_system:
         raise HTTPException(status_code=503, detail="Ticket system not available")
     
-    # Create simulated email data
-    email_data = {
-        'id': f"sim_{datetime.now().strftime('%H%M%S')}",
-        'sender': email_request.sender,
-        'subject': email_request.subject,
-        'body': email_request.body,
-        'timestamp': datetime.now().isoformat()
-    }
-    
     # Use enhanced simulation method
-    ticket = ticket_system.simulate_employee_email(
+    ticket = await ingest_worker.run(
+        ticket_system.simulate_employee_email,
         email_request.sender,
         email_request.subject, 
         email_request.body
@@ -680,12 +892,10 @@ async def resolve_ticket(ticket_id: str):
     if not ticket_system:
         raise HTTPException(status_code=503, detail="Ticket system not available")
     
-    success = ticket_system.resolve_ticket(ticket_id)
-    if success:
-        # Find the updated ticket
-        for ticket in ticket_system.tickets:
-            if ticket['ticket_id'] == ticket_id:
-                return {"message": f"Ticket {ticket_id} marked as resolved", "ticket": ticket}
+    # BEGIN IMMEDIATE may wait out another writer (30s busy timeout)
+    ticket = await run_in_threadpool(ticket_system.resolve_ticket, ticket_id)
+    if ticket:
+        return {"message": f"Ticket {ticket_id} marked as resolved", "ticket": ticket}
     
     raise HTTPException(status_code=404, detail="Ticket not found")
 
@@ -696,12 +906,9 @@ async def escalate_ticket(ticket_id: str):
     if not ticket_system:
         raise HTTPException(status_code=503, detail="Ticket system not available")
     
-    success = ticket_system.escalate_ticket(ticket_id)
-    if success:
-        # Find the updated ticket
-        for ticket in ticket_system.tickets:
-            if ticket['ticket_id'] == ticket_id:
-                return {"message": f"Ticket {ticket_id} escalated to {ticket['priority']} priority", "ticket": ticket}
+    ticket = await run_in_threadpool(ticket_system.escalate_ticket, ticket_id)
+    if ticket:
+        return {"message": f"Ticket {ticket_id} escalated to {ticket['priority']} priority", "ticket": ticket}
     
     raise HTTPException(status_code=404, detail="Ticket not found")
 
@@ -712,45 +919,46 @@ async def clear_all_tickets():
     if not ticket_system:
         raise HTTPException(status_code=503, detail="Ticket system not available")
     
-    cleared_count = ticket_system.clear_all_tickets()
+    cleared_count = await run_in_threadpool(ticket_system.clear_all_tickets)
     return {"message": f"Cleared {cleared_count} tickets", "cleared_count": cleared_count}
 
 @app.post("/api/start-monitoring")
-async def start_real_time_monitoring(background_tasks: BackgroundTasks):
-    """Start real-time Gmail monitoring"""
+async def start_real_time_monitoring():
+    """Start real-time Gmail monitoring (one monitor loop no matter how often this is called)"""
     global ticket_system
     if not ticket_system:
         raise HTTPException(status_code=503, detail="Ticket system not available")
     
-    # Start background monitoring
-    background_tasks.add_task(monitor_gmail_continuously)
-    return {"message": "Real-time monitoring started", "status": "monitoring"}
+    # May wait for a previous watcher to finish stopping
+    started = await run_in_threadpool(start_monitor)
+    return {
+        "message": "Real-time monitoring started" if started else "Real-time monitoring already running",
+        "status": "monitoring"
+    }
 
 @app.post("/api/stop-monitoring")
 async def stop_real_time_monitoring():
     """Stop real-time Gmail monitoring"""
-    return {"message": "Real-time monitoring stopped", "status": "stopped"}
-
-async def monitor_gmail_continuously():
-    """Continuously monitor Gmail in background"""
-    global ticket_system
-    import asyncio
+    if not ingest_coordinator:
+        raise HTTPException(status_code=503, detail="Ticket system not available")
     
-    while True:
-        try:
-            if ticket_system:
-                new_tickets = ticket_system.process_new_emails()
-                if new_tickets:
-                    print(f"🔄 Real-time monitoring: {len(new_tickets)} new tickets created")
-        except Exception as e:
-            print(f"❌ Monitoring error: {e}")
-        
-        await asyncio.sleep(10)  # Check every 10 seconds
+    # Waits for the watcher loop (and any cycle it is running) to exit
+    was_running = await run_in_threadpool(ingest_coordinator.stop_monitor)
+    return {
+        "message": "Real-time monitoring stopped" if was_running else "Real-time monitoring was not running",
+        "status": "stopped"
+    }
 
 @app.get("/api/health")
 async def health_check():
     """System health check"""
     global ticket_system
+    leases, store_sync = {}, {}
+    if ticket_system:
+        # Both wait on the store lock, which a BEGIN IMMEDIATE lease or ticket write may hold for seconds
+        if ticket_system.lease_manager:
+            leases = await run_in_threadpool(ticket_system.lease_manager.get_status)
+        store_sync = await run_in_threadpool(ticket_system.ticket_store.get_sync_status)
     return {
         "status": "healthy",
         "message": "Feature-2 Gmail Ticket System",
@@ -761,6 +969,21 @@ async def health_check():
             "ai_processing": "ready",
             "email_notifications": "enabled"
         },
+        "imap_pool": ticket_system.imap_pool.get_metrics() if ticket_system else {},
+        "mailboxes": ticket_system.get_mailbox_status() if ticket_system else {},
+        "backlog": ticket_system.backlog_drainer.get_status() if ticket_system else {},
+        "pipeline": ticket_system.ingest_pipeline.get_stats() if ticket_system else {},
+        "mime_parser": ticket_system.mime_parser.get_stats() if ticket_system else {},
+        "ai_client": ticket_system.ai_client.get_stats() if ticket_system else {},
+        "classification_tiers": ticket_system.classifier.get_stats() if ticket_system else {},
+        "ingest": ingest_coordinator.get_status() if ingest_coordinator else ingest_worker.get_status(),
+        "notifications": ticket_system.notification_outbox.get_stats() if ticket_system else {},
+        "notification_digest": ticket_system.notification_digest.get_stats() if ticket_system else {},
+        "events": ticket_system.events.get_stats() if ticket_system else {},
+        "duplicates": ticket_system.duplicate_detector.get_stats() if ticket_system and ticket_system.duplicate_detector else {},
+        "leases": leases,
+        "store_sync": store_sync,
+        "pid": os.getpid(),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -775,11 +998,18 @@ def main():
     print("🔧 API Docs: http://localhost:8000/docs")
     print("=" * 50)
     
+    # Several API workers need INGEST_LEASES_ENABLED=true so ingest is partitioned, not repeated
+    workers = int(os.getenv('API_WORKERS', '1'))
+    if workers > 1 and os.getenv('INGEST_LEASES_ENABLED', 'false').lower() != 'true':
+        print("⚠️ API_WORKERS > 1 without INGEST_LEASES_ENABLED=true - running a single worker")
+        workers = 1
+    
     uvicorn.run(
         "ticket_dashboard:app",
         host="0.0.0.0",
         port=8000,
         reload=False,
+        workers=workers,
         log_level="info"
     )
 
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Ticket Events
+Fans ticket deltas out to every connected dashboard (server-sent events)
+"""
+
+import json
+import uuid
+import asyncio
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class TicketEventBus:
+    """Thread-safe publisher; each subscriber gets a bounded asyncio queue on the server loop"""
+
+    def __init__(self, history_size: int = 500, client_queue_size: int = 1000):
+        self.client_queue_size = client_queue_size
+        self._lock = threading.Lock()
+        self._history: deque = deque(maxlen=history_size)
+        self._next_id = 0
+        # Ids are only meaningful within this bus: SSE ids carry the epoch, so a Last-Event-ID from
+        # another worker or from before a restart is recognised as foreign and answered with a resync
+        self.epoch = uuid.uuid4().hex[:8]
+        self._subscribers: List[asyncio.Queue] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {
+            'events_published': 0,
+            'subscribers_total': 0,
+            'resyncs': 0
+        }
+
+    def attach_loop(self, loop: asyncio.AbstractEventLoop):
+        """Subscriber queues live on this loop; publish() may be called from any thread"""
+        self._loop = loop
+
+    def publish(self, event_type: str, data: Dict):
+        if event_type == 'tickets_reloaded':
+            # A store reload carries every ticket; clients just reload their snapshot
+            event_type, data = 'resync', {}
+        with self._lock:
+            self._next_id += 1
+            event = {
+                'id': self._next_id,
+                'type': event_type,
+                'data': data,
+                'at': datetime.now().isoformat()
+            }
+            self._history.append(event)
+            self.stats['events_published'] += 1
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._fan_out, event)
+
+    def _resync_event(self) -> Dict:
+        with self._lock:
+            last_id = self._next_id
+            self.stats['resyncs'] += 1
+        return {'id': last_id, 'type': 'resync', 'data': {}, 'at': datetime.now().isoformat()}
+
+    def _fan_out(self, event: Dict):
+        # Runs on the server loop, so queue operations need no extra locking
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Client fell too far behind: drop its backlog and tell it to reload a snapshot
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(self._resync_event())
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> asyncio.Queue:
+        """New subscriber queue; replays missed events after a reconnect when still in history"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.client_queue_size)
+        if last_event_id is not None:
+            epoch, _, number = last_event_id.rpartition('-')
+            complete = False
+            missed: List[Dict] = []
+            if epoch == self.epoch and number.isdigit():
+                seen = int(number)
+                with self._lock:
+                    missed = [event for event in self._history if event['id'] > seen]
+                    complete = seen == self._next_id or (
+                        seen < self._next_id and bool(self._history) and self._history[0]['id'] <= seen + 1
+                    )
+            if complete and len(missed) < self.client_queue_size:
+                for event in missed:
+                    queue.put_nowait(event)
+            else:
+                queue.put_nowait(self._resync_event())
+        self._subscribers.append(queue)
+        with self._lock:
+            self.stats['subscribers_total'] += 1
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def format_sse(self, event: Dict) -> str:
+        return f"id: {self.epoch}-{event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats['last_event_id'] = f"{self.epoch}-{self._next_id}"
+            stats['history_size'] = len(self._history)
+        stats['subscribers'] = len(self._subscribers)
+        return stats
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Ticket Index
+In-memory keyed index with secondary indexes by status, priority and assignee
+"""
+
+from typing import Dict, Iterable, List, Optional, Set
+
+SECONDARY_FIELDS = ('status', 'priority', 'assigned_to')
+
+
+class TicketIndex:
+    """ticket_id -> ticket plus field value -> ticket ids; not thread-safe (the store locks around it)"""
+
+    def __init__(self):
+        self._by_id: Dict[str, Dict] = {}
+        self._secondary: Dict[str, Dict[str, Set[str]]] = {field: {} for field in SECONDARY_FIELDS}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def _link(self, ticket: Dict):
+        for field in SECONDARY_FIELDS:
+            self._secondary[field].setdefault(ticket.get(field), set()).add(ticket['ticket_id'])
+
+    def _unlink(self, ticket: Dict):
+        for field in SECONDARY_FIELDS:
+            ids = self._secondary[field].get(ticket.get(field))
+            if ids is not None:
+                ids.discard(ticket['ticket_id'])
+                if not ids:
+                    del self._secondary[field][ticket.get(field)]
+
+    def put(self, ticket: Dict):
+        """Insert or replace a ticket, re-linking its secondary entries"""
+        previous = self._by_id.get(ticket['ticket_id'])
+        if previous is not None:
+            self._unlink(previous)
+        self._by_id[ticket['ticket_id']] = ticket
+        self._link(ticket)
+
+    def put_many(self, tickets: Iterable[Dict]):
+        for ticket in tickets:
+            self.put(ticket)
+
+    def get(self, ticket_id: str) -> Optional[Dict]:
+        return self._by_id.get(ticket_id)
+
+    def ids_where(self, field: str, value) -> Set[str]:
+        return set(self._secondary[field].get(value, ()))
+
+    def find(self, **filters) -> List[Dict]:
+        """Tickets matching every given secondary field (None values are ignored), oldest first"""
+        active = {field: value for field, value in filters.items() if value is not None}
+        if not active:
+            return list(self._by_id.values())
+        candidate_sets = sorted(
+            (self._secondary[field].get(value, set()) for field, value in active.items()),
+            key=len
+        )
+        # Intersect starting from the smallest set
+        ids = set(candidate_sets[0]).intersection(*candidate_sets[1:])
+        return sorted((self._by_id[ticket_id] for ticket_id in ids),
+                      key=lambda ticket: (ticket.get('created_at') or '', ticket['ticket_id']))
+
+    def counts(self, field: str) -> Dict[str, int]:
+        return {value: len(ids) for value, ids in self._secondary[field].items()}
+
+    def all(self) -> List[Dict]:
+        return list(self._by_id.values())
+
+    def clear(self):
+        self._by_id.clear()
+        for field in SECONDARY_FIELDS:
+            self._secondary[field].clear()
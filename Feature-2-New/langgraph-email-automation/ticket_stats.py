@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Ticket Stats
+Counters and rolling time-series maintained from ticket events, so serving stats never scans tickets
+"""
+
+import time
+import threading
+from collections import Counter, deque
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+PRIORITIES = ('high', 'medium', 'low')
+
+# Upper bounds (seconds) of the time-to-resolve histogram bins; the last bin is open-ended
+RESOLVE_BINS = (60, 300, 900, 1800, 3600, 7200, 14400, 28800, 86400, 172800, 604800, float('inf'))
+
+
+class _Window:
+    """Fixed number of time buckets; old buckets are recycled as time moves on"""
+
+    def __init__(self, bucket_seconds: int, size: int):
+        self.bucket_seconds = bucket_seconds
+        self.size = size
+        self._buckets: deque = deque(maxlen=size)
+
+    def _bucket(self, now: float) -> Dict:
+        start = int(now // self.bucket_seconds) * self.bucket_seconds
+        if not self._buckets or self._buckets[-1]['start'] != start:
+            self._buckets.append({'start': start, 'created': 0, 'resolved': 0, 'resolve_hist': [0] * len(RESOLVE_BINS)})
+        return self._buckets[-1]
+
+    def record_created(self, now: float):
+        self._bucket(now)['created'] += 1
+
+    def record_resolved(self, now: float, seconds_to_resolve: Optional[float]):
+        bucket = self._bucket(now)
+        bucket['resolved'] += 1
+        if seconds_to_resolve is not None:
+            for index, upper in enumerate(RESOLVE_BINS):
+                if seconds_to_resolve <= upper:
+                    bucket['resolve_hist'][index] += 1
+                    break
+
+    def recent(self, now: float) -> List[Dict]:
+        oldest = (int(now // self.bucket_seconds) - self.size + 1) * self.bucket_seconds
+        return [bucket for bucket in self._buckets if bucket['start'] >= oldest]
+
+    def series(self, now: float) -> List[Dict]:
+        return [
+            {
+                'start': datetime.fromtimestamp(bucket['start']).isoformat(),
+                'created': bucket['created'],
+                'resolved': bucket['resolved']
+            }
+            for bucket in self.recent(now)
+        ]
+
+    def clear(self):
+        self._buckets.clear()
+
+
+def histogram_percentile(histogram: List[int], percentile: float) -> Optional[float]:
+    """Upper bound of the bin holding the percentile (None without samples)"""
+    total = sum(histogram)
+    if not total:
+        return None
+    threshold = total * percentile / 100
+    running = 0
+    for count, upper in zip(histogram, RESOLVE_BINS):
+        running += count
+        if running >= threshold:
+            return upper if upper != float('inf') else None
+    return None
+
+
+class TicketStats:
+    """Listens to ticket_created/ticket_updated/tickets_cleared/tickets_reloaded and keeps every dashboard number current"""
+
+    def __init__(self, minute_buckets: int = 60, hour_buckets: int = 48):
+        self._lock = threading.Lock()
+        # ticket_id -> (category, priority, status, assigned_role, assigned_to)
+        self._tickets: Dict[str, Tuple] = {}
+        self._counts = {field: Counter() for field in ('category', 'priority', 'status', 'assigned_role', 'assigned_to')}
+        self._minutes = _Window(60, minute_buckets)
+        self._hours = _Window(3600, hour_buckets)
+        self.escalations = 0
+        # ticket_id -> escalated_at already counted (each escalate action counts once)
+        self._escalated: Dict[str, object] = {}
+
+    @staticmethod
+    def _key(ticket: Dict) -> Tuple:
+        return (ticket.get('category'), ticket.get('priority'), ticket.get('status'),
+                ticket.get('assigned_role'), ticket.get('assigned_to'))
+
+    def _apply(self, key: Tuple, delta: int):
+        for field, value in zip(('category', 'priority', 'status', 'assigned_role', 'assigned_to'), key):
+            counter = self._counts[field]
+            counter[value] += delta
+            if counter[value] <= 0:
+                del counter[value]
+
+    @staticmethod
+    def _seconds_to_resolve(ticket: Dict) -> Optional[float]:
+        try:
+            created = datetime.fromisoformat(ticket['created_at'])
+            resolved = datetime.fromisoformat(ticket['resolved_at'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        return max(0.0, (resolved - created).total_seconds())
+
+    def _load(self, tickets: Iterable[Dict]):
+        # Called with the lock held; escalations already counted stay counted once
+        for ticket in tickets:
+            key = self._key(ticket)
+            self._tickets[ticket['ticket_id']] = key
+            self._apply(key, 1)
+            if ticket.get('escalated'):
+                escalated_at = ticket.get('escalated_at') or True
+                if self._escalated.get(ticket['ticket_id']) != escalated_at:
+                    self._escalated[ticket['ticket_id']] = escalated_at
+                    self.escalations += 1
+
+    def seed(self, tickets: Iterable[Dict]):
+        """Load counters for tickets that already exist (time-series start empty)"""
+        with self._lock:
+            self._load(tickets)
+
+    def on_event(self, event_type: str, data: Dict):
+        now = time.time()
+        with self._lock:
+            if event_type in ('tickets_cleared', 'tickets_reloaded'):
+                for counter in self._counts.values():
+                    counter.clear()
+                self._tickets.clear()
+                if event_type == 'tickets_reloaded':
+                    # Store resync: rebuild the counters, keep the time-series and escalation history
+                    self._load(data['tickets'])
+                    return
+                self._minutes.clear()
+                self._hours.clear()
+                self.escalations = 0
+                self._escalated.clear()
+                return
+
+            ticket_id = data['ticket_id']
+            if data.get('escalated'):
+                escalated_at = data.get('escalated_at') or True
+                if self._escalated.get(ticket_id) != escalated_at:
+                    self._escalated[ticket_id] = escalated_at
+                    self.escalations += 1
+
+            key = self._key(data)
+            previous = self._tickets.get(ticket_id)
+            if previous == key:
+                return
+            if previous is not None:
+                self._apply(previous, -1)
+            self._apply(key, 1)
+            self._tickets[ticket_id] = key
+
+            if previous is None:
+                self._minutes.record_created(now)
+                self._hours.record_created(now)
+                return
+            if previous[2] != 'resolved' and key[2] == 'resolved':
+                seconds = self._seconds_to_resolve(data)
+                self._minutes.record_resolved(now, seconds)
+                self._hours.record_resolved(now, seconds)
+
+    def _resolve_percentiles(self, buckets: List[Dict]) -> Dict:
+        histogram = [sum(values) for values in zip(*(bucket['resolve_hist'] for bucket in buckets))] if buckets else []
+        return {
+            'resolved': sum(histogram),
+            'p50_s': histogram_percentile(histogram, 50),
+            'p90_s': histogram_percentile(histogram, 90),
+            'p99_s': histogram_percentile(histogram, 99)
+        }
+
+    def snapshot(self) -> Dict:
+        """Everything the dashboard shows; cost depends on bucket counts, not ticket counts"""
+        now = time.time()
+        with self._lock:
+            by_priority = dict(self._counts['priority'])
+            stats = {'total_tickets': len(self._tickets)}
+            for priority in PRIORITIES:
+                stats[f"{priority}_priority"] = by_priority.get(priority, 0)
+            stats.update({
+                'tickets_by_category': dict(self._counts['category']),
+                'tickets_by_status': dict(self._counts['status']),
+                'tickets_by_role': dict(self._counts['assigned_role']),
+                'tickets_by_assignee': dict(self._counts['assigned_to']),
+                'escalations': self.escalations
+            })
+            last_hour = self._minutes.recent(now)
+            last_day = self._hours.recent(now)[-24:]
+            stats['arrival_rate'] = {
+                'last_5m_per_min': round(sum(b['created'] for b in last_hour if b['start'] >= now - 300) / 5, 2),
+                'last_hour_per_min': round(sum(b['created'] for b in last_hour) / 60, 2),
+                'last_24h_per_hour': round(sum(b['created'] for b in last_day) / 24, 2)
+            }
+            stats['time_to_resolve'] = {
+                'last_hour': self._resolve_percentiles(last_hour),
+                'last_24h': self._resolve_percentiles(last_day)
+            }
+            stats['timeseries'] = {
+                'per_minute': self._minutes.series(now),
+                'per_hour': self._hours.series(now)
+            }
+        return stats
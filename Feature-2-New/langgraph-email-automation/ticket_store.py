@@ -0,0 +1,524 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Ticket Store
+Durable ticket repository backed by SQLite in WAL mode
+"""
+
+import os
+import json
+import time
+import uuid
+import base64
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+from ticket_index import TicketIndex
+
+PRIORITY_RANK = {'low': 1, 'medium': 2, 'high': 3}
+
+# Ticket fields mirrored into indexed columns; the full ticket is kept as JSON
+INDEXED_COLUMNS = ('status', 'priority', 'priority_rank', 'category', 'assigned_role', 'assigned_to', 'created_at')
+
+# Filters accepted by query() and the columns they compare against
+EQUALITY_FILTERS = ('status', 'priority', 'category', 'assigned_role', 'assigned_to')
+
+# Sort name -> keyset columns (ticket_id last so every key is unique)
+SORT_KEYS = {
+    'created_at': ('created_at', 'ticket_id'),
+    'priority': ('priority_rank', 'created_at', 'ticket_id')
+}
+
+# Change-log rows kept for processes tailing the database; one that falls further behind reloads
+CHANGE_RETENTION = 10000
+
+
+def encode_cursor(sort: str, order: str, key: List) -> str:
+    raw = json.dumps({'sort': sort, 'order': order, 'key': key}).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: str, sort: str, order: str) -> List:
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError("Malformed cursor")
+    if data.get('sort') != sort or data.get('order') != order or len(data.get('key', [])) != len(SORT_KEYS[sort]):
+        raise ValueError("Cursor does not match the requested sort")
+    return data['key']
+
+
+class TicketRepository:
+    """Storage interface the ticket system talks to"""
+
+    _listeners: List[Callable[[str, Dict], None]] = []
+
+    def add_listener(self, listener: Callable[[str, Dict], None]):
+        """Called with (event_type, data) after every committed change"""
+        self._listeners = self._listeners + [listener]
+
+    def _emit(self, event_type: str, data: Dict):
+        for listener in self._listeners:
+            try:
+                listener(event_type, data)
+            except Exception as e:
+                print(f"❌ Ticket listener failed: {e}")
+
+    def add(self, ticket: Dict, email_id: Optional[str] = None):
+        self.add_many([(ticket, email_id)])
+
+    def add_many(self, entries: Iterable[Tuple[Dict, Optional[str]]]):
+        raise NotImplementedError
+
+    def get(self, ticket_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def update(self, ticket_id: str, changes: Union[Dict, Callable[[Dict], Dict]],
+               email_id: Optional[str] = None) -> Optional[Dict]:
+        """Apply changes (or changes computed from the current ticket) and return the updated ticket;
+        email_id, if given, is marked processed in the same transaction"""
+        raise NotImplementedError
+
+    def list_tickets(self) -> List[Dict]:
+        raise NotImplementedError
+
+    def find(self, status: Optional[str] = None, priority: Optional[str] = None,
+             assigned_to: Optional[str] = None) -> List[Dict]:
+        raise NotImplementedError
+
+    def query(self, filters: Optional[Dict] = None, sort: str = 'created_at', order: str = 'desc',
+              limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """One page of tickets plus the cursor for the next page (None on the last page)"""
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+    def is_processed(self, email_id: str) -> bool:
+        raise NotImplementedError
+
+    def processed_count(self) -> int:
+        raise NotImplementedError
+
+    def clear(self) -> int:
+        """Delete every ticket and processed-email record; returns tickets removed"""
+        raise NotImplementedError
+
+    def sync(self) -> int:
+        """Apply changes other processes committed to shared storage; returns how many were applied"""
+        return 0
+
+    def acquire_lease(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        """Take or renew a named lease; False while another owner holds it unexpired"""
+        raise NotImplementedError
+
+    def release_lease(self, name: str, owner: str):
+        raise NotImplementedError
+
+    def list_leases(self) -> Dict[str, Dict]:
+        """Unexpired leases: name -> {owner, expires_in_s}"""
+        raise NotImplementedError
+
+    def get_sync_mark(self, key: str) -> Optional[Dict]:
+        """Persisted UIDVALIDITY / high-water mark for a mailbox"""
+        raise NotImplementedError
+
+    def set_sync_mark(self, key: str, uidvalidity: Optional[int], last_uid: int):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class SQLiteTicketStore(TicketRepository):
+    """SQLite is the source of truth; reads are served from an in-memory index kept in step with every write"""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._create_schema()
+        self._migrate()
+        self._create_indexes()
+
+        # Other processes sharing this file are followed through the change log (see sync())
+        self.origin = uuid.uuid4().hex[:12]
+        self._last_seq = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM ticket_changes").fetchone()[0]
+        self._sync_stop = threading.Event()
+        self._sync_thread: Optional[threading.Thread] = None
+        self.sync_stats = {
+            'changes_applied': 0,
+            'reloads': 0,
+            'last_sync_at': None
+        }
+
+        self._index = TicketIndex()
+        self._index.put_many(json.loads(row[0]) for row in self._conn.execute(
+            "SELECT data FROM tickets ORDER BY created_at, rowid"
+        ))
+        self._processed_count = self._conn.execute("SELECT COUNT(*) FROM processed_emails").fetchone()[0]
+
+    def _create_schema(self):
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS tickets (
+                    ticket_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    priority TEXT NOT NULL,
+                    priority_rank INTEGER,
+                    category TEXT,
+                    assigned_role TEXT,
+                    assigned_to TEXT,
+                    created_at TEXT NOT NULL,
+                    data TEXT NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS processed_emails (
+                    email_id TEXT PRIMARY KEY,
+                    processed_at TEXT NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS ticket_changes (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    ticket_id TEXT,
+                    event_type TEXT NOT NULL,
+                    origin TEXT NOT NULL,
+                    changed_at TEXT NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS ingest_leases (
+                    name TEXT PRIMARY KEY,
+                    owner TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS sync_marks (
+                    key TEXT PRIMARY KEY,
+                    uidvalidity INTEGER,
+                    last_uid INTEGER NOT NULL,
+                    updated_at TEXT NOT NULL
+                );
+            """)
+
+    def _migrate(self):
+        """Add columns introduced after a database was created and backfill them from the JSON"""
+        with self._lock, self._conn:
+            existing = {row[1] for row in self._conn.execute("PRAGMA table_info(tickets)")}
+            missing = [column for column in ('priority_rank', 'assigned_to') if column not in existing]
+            if not missing:
+                return
+            for column in missing:
+                column_type = 'INTEGER' if column == 'priority_rank' else 'TEXT'
+                self._conn.execute(f"ALTER TABLE tickets ADD COLUMN {column} {column_type}")
+            rows = self._conn.execute("SELECT ticket_id, data FROM tickets").fetchall()
+            self._conn.executemany(
+                "UPDATE tickets SET priority_rank = ?, assigned_to = ? WHERE ticket_id = ?",
+                [
+                    (PRIORITY_RANK.get(ticket.get('priority')), ticket.get('assigned_to'), ticket_id)
+                    for ticket_id, ticket in ((row[0], json.loads(row[1])) for row in rows)
+                ]
+            )
+            print(f"🗄️ Ticket store migrated ({', '.join(missing)} added to {len(rows)} tickets)")
+
+    def _create_indexes(self):
+        with self._lock, self._conn:
+            self._conn.executescript("""
+                CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets(status);
+                CREATE INDEX IF NOT EXISTS idx_tickets_priority ON tickets(priority);
+                CREATE INDEX IF NOT EXISTS idx_tickets_category ON tickets(category);
+                CREATE INDEX IF NOT EXISTS idx_tickets_assigned_role ON tickets(assigned_role);
+                CREATE INDEX IF NOT EXISTS idx_tickets_assigned_to ON tickets(assigned_to);
+                CREATE INDEX IF NOT EXISTS idx_tickets_created_at ON tickets(created_at, ticket_id);
+                CREATE INDEX IF NOT EXISTS idx_tickets_priority_rank ON tickets(priority_rank, created_at, ticket_id);
+            """)
+
+    @staticmethod
+    def _row(ticket: Dict) -> Tuple:
+        values = [
+            PRIORITY_RANK.get(ticket.get('priority')) if column == 'priority_rank' else ticket.get(column)
+            for column in INDEXED_COLUMNS
+        ]
+        return (ticket['ticket_id'], *values, json.dumps(ticket))
+
+    def _log_changes(self, changes: List[Tuple[Optional[str], str]]):
+        # Called inside the write transaction
+        now = datetime.now().isoformat()
+        cursor = self._conn.executemany(
+            "INSERT INTO ticket_changes (ticket_id, event_type, origin, changed_at) VALUES (?, ?, ?, ?)",
+            [(ticket_id, event_type, self.origin, now) for ticket_id, event_type in changes]
+        )
+        last_seq = self._conn.execute("SELECT MAX(seq) FROM ticket_changes").fetchone()[0]
+        if last_seq // 500 != (last_seq - cursor.rowcount) // 500:
+            self._conn.execute("DELETE FROM ticket_changes WHERE seq <= ?", (last_seq - CHANGE_RETENTION,))
+
+    def add_many(self, entries: Iterable[Tuple[Dict, Optional[str]]]):
+        """Insert a burst of tickets in one transaction"""
+        entries = list(entries)
+        if not entries:
+            return
+        now = datetime.now().isoformat()
+        ticket_rows = [self._row(ticket) for ticket, _ in entries]
+        email_rows = [(email_id, now) for _, email_id in entries if email_id]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO tickets (ticket_id, {', '.join(INDEXED_COLUMNS)}, data) "
+                f"VALUES ({', '.join('?' * (len(INDEXED_COLUMNS) + 2))})",
+                ticket_rows
+            )
+            if email_rows:
+                inserted = self._conn.executemany(
+                    "INSERT OR IGNORE INTO processed_emails (email_id, processed_at) VALUES (?, ?)",
+                    email_rows
+                ).rowcount
+                self._processed_count += max(0, inserted)
+            self._log_changes([(ticket['ticket_id'], 'ticket_created') for ticket, _ in entries])
+            self._index.put_many(dict(ticket) for ticket, _ in entries)
+            for ticket, _ in entries:
+                self._emit('ticket_created', dict(ticket))
+
+    def get(self, ticket_id: str) -> Optional[Dict]:
+        with self._lock:
+            ticket = self._index.get(ticket_id)
+            return dict(ticket) if ticket else None
+
+    def update(self, ticket_id: str, changes: Union[Dict, Callable[[Dict], Dict]],
+               email_id: Optional[str] = None) -> Optional[Dict]:
+        with self._lock, self._conn:
+            # Read-modify-write against the database, not the index: another process may have changed it
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute("SELECT data FROM tickets WHERE ticket_id = ?", (ticket_id,)).fetchone()
+            if row is None:
+                return None
+            current = json.loads(row[0])
+            ticket = dict(current)
+            ticket.update(changes(current) if callable(changes) else changes)
+            self._conn.execute(
+                f"UPDATE tickets SET {', '.join(f'{column} = ?' for column in INDEXED_COLUMNS)}, data = ? "
+                "WHERE ticket_id = ?",
+                (*self._row(ticket)[1:], ticket_id)
+            )
+            if email_id:
+                self._processed_count += max(0, self._conn.execute(
+                    "INSERT OR IGNORE INTO processed_emails (email_id, processed_at) VALUES (?, ?)",
+                    (email_id, datetime.now().isoformat())
+                ).rowcount)
+            self._log_changes([(ticket_id, 'ticket_updated')])
+            self._index.put(ticket)
+            self._emit('ticket_updated', dict(ticket))
+            return dict(ticket)
+
+    def list_tickets(self) -> List[Dict]:
+        with self._lock:
+            return [dict(ticket) for ticket in self._index.all()]
+
+    def find(self, status: Optional[str] = None, priority: Optional[str] = None,
+             assigned_to: Optional[str] = None) -> List[Dict]:
+        with self._lock:
+            tickets = self._index.find(status=status, priority=priority, assigned_to=assigned_to)
+            return [dict(ticket) for ticket in tickets]
+
+    def query(self, filters: Optional[Dict] = None, sort: str = 'created_at', order: str = 'desc',
+              limit: int = 50, cursor: Optional[str] = None) -> Tuple[List[Dict], Optional[str]]:
+        """Keyset pagination over the indexed columns; cost depends on the page size, not history"""
+        if sort not in SORT_KEYS:
+            raise ValueError(f"Unsupported sort '{sort}' (use one of: {', '.join(SORT_KEYS)})")
+        if order not in ('asc', 'desc'):
+            raise ValueError("order must be 'asc' or 'desc'")
+        filters = filters or {}
+        key_columns = SORT_KEYS[sort]
+
+        clauses, params = [], []
+        for column in EQUALITY_FILTERS:
+            if filters.get(column) is not None:
+                clauses.append(f"{column} = ?")
+                params.append(filters[column])
+        if filters.get('created_after'):
+            clauses.append("created_at >= ?")
+            params.append(filters['created_after'])
+        if filters.get('created_before'):
+            clauses.append("created_at < ?")
+            params.append(filters['created_before'])
+        if cursor:
+            key = decode_cursor(cursor, sort, order)
+            clauses.append(f"({', '.join(key_columns)}) {'<' if order == 'desc' else '>'} ({', '.join('?' * len(key))})")
+            params.extend(key)
+
+        sql = f"SELECT {', '.join(key_columns)}, data FROM tickets"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY " + ", ".join(f"{column} {order.upper()}" for column in key_columns)
+        sql += " LIMIT ?"
+        params.append(limit + 1)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(sort, order, list(rows[-1][:len(key_columns)]))
+        return [json.loads(row[-1]) for row in rows], next_cursor
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def is_processed(self, email_id: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM processed_emails WHERE email_id = ?", (email_id,)
+            ).fetchone() is not None
+
+    def processed_count(self) -> int:
+        with self._lock:
+            return self._processed_count
+
+    def clear(self) -> int:
+        with self._lock, self._conn:
+            count = self._conn.execute("SELECT COUNT(*) FROM tickets").fetchone()[0]
+            self._conn.execute("DELETE FROM tickets")
+            self._conn.execute("DELETE FROM processed_emails")
+            self._processed_count = 0
+            self._log_changes([(None, 'tickets_cleared')])
+            self._index.clear()
+            self._emit('tickets_cleared', {'count': count})
+        return count
+
+    # ------------------------------------------------------------------
+    # Shared-database mode (several processes on one file)
+    # ------------------------------------------------------------------
+
+    def sync(self) -> int:
+        """Replay other processes' committed changes into the index and listeners"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, ticket_id, event_type, origin FROM ticket_changes WHERE seq > ? ORDER BY seq",
+                (self._last_seq,)
+            ).fetchall()
+            if not rows:
+                return 0
+            # Sequence numbers only go missing when the log was pruned past us
+            fell_behind = rows[0][0] > self._last_seq + 1 and self._last_seq > 0
+            self._last_seq = rows[-1][0]
+            foreign = [row for row in rows if row[3] != self.origin]
+            if fell_behind:
+                self._reload()
+                return len(foreign)
+            if not foreign:
+                return 0
+
+            # Only the latest state matters: collapse to one entry per ticket after the last clear
+            latest: Dict[str, None] = {}
+            for _, ticket_id, event_type, _ in foreign:
+                if event_type == 'tickets_cleared':
+                    count = len(self._index)
+                    self._index.clear()
+                    latest.clear()
+                    self._emit('tickets_cleared', {'count': count})
+                else:
+                    latest.pop(ticket_id, None)
+                    latest[ticket_id] = None
+            if latest:
+                placeholders = ', '.join('?' * len(latest))
+                data = dict(self._conn.execute(
+                    f"SELECT ticket_id, data FROM tickets WHERE ticket_id IN ({placeholders})", list(latest)
+                ).fetchall())
+                for ticket_id in latest:
+                    if ticket_id not in data:
+                        continue
+                    ticket = json.loads(data[ticket_id])
+                    event_type = 'ticket_updated' if self._index.get(ticket_id) else 'ticket_created'
+                    self._index.put(ticket)
+                    self._emit(event_type, dict(ticket))
+            self._processed_count = self._conn.execute("SELECT COUNT(*) FROM processed_emails").fetchone()[0]
+            self.sync_stats['changes_applied'] += len(foreign)
+            self.sync_stats['last_sync_at'] = datetime.now().isoformat()
+            return len(foreign)
+
+    def _reload(self):
+        # Called with the lock held
+        tickets = [json.loads(row[0]) for row in self._conn.execute("SELECT data FROM tickets ORDER BY created_at, rowid")]
+        count = len(self._index)
+        self._index.clear()
+        self._index.put_many(dict(ticket) for ticket in tickets)
+        self._processed_count = self._conn.execute("SELECT COUNT(*) FROM processed_emails").fetchone()[0]
+        self.sync_stats['reloads'] += 1
+        self.sync_stats['last_sync_at'] = datetime.now().isoformat()
+        # One event carrying the full set: listeners rebuild in place, dashboards get a single resync
+        self._emit('tickets_reloaded', {'count': count, 'tickets': tickets})
+
+    def start_sync(self, interval: float = 1.0):
+        """Follow other processes' writes on a background thread"""
+        if self._sync_thread is not None:
+            return
+
+        def _loop():
+            while not self._sync_stop.wait(interval):
+                try:
+                    self.sync()
+                except sqlite3.Error as e:
+                    print(f"⚠️ Ticket store sync failed: {e}")
+
+        self._sync_thread = threading.Thread(target=_loop, name='ticket-store-sync', daemon=True)
+        self._sync_thread.start()
+
+    def get_sync_status(self) -> Dict:
+        with self._lock:
+            status = dict(self.sync_stats)
+            status['origin'] = self.origin
+            status['last_seq'] = self._last_seq
+        status['following'] = self._sync_thread is not None
+        return status
+
+    def acquire_lease(self, name: str, owner: str, ttl_seconds: float) -> bool:
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            row = self._conn.execute("SELECT owner, expires_at FROM ingest_leases WHERE name = ?", (name,)).fetchone()
+            if row and row[0] != owner and row[1] > now:
+                return False
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ingest_leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                (name, owner, now + ttl_seconds)
+            )
+            return True
+
+    def release_lease(self, name: str, owner: str):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM ingest_leases WHERE name = ? AND owner = ?", (name, owner))
+
+    def list_leases(self) -> Dict[str, Dict]:
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, owner, expires_at FROM ingest_leases WHERE expires_at > ?", (now,)
+            ).fetchall()
+        return {name: {'owner': owner, 'expires_in_s': round(expires_at - now, 1)} for name, owner, expires_at in rows}
+
+    def get_sync_mark(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT uidvalidity, last_uid, updated_at FROM sync_marks WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {'uidvalidity': row[0], 'last_uid': row[1], 'updated_at': row[2]}
+
+    def set_sync_mark(self, key: str, uidvalidity: Optional[int], last_uid: int):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_marks (key, uidvalidity, last_uid, updated_at) VALUES (?, ?, ?, ?)",
+                (key, uidvalidity, last_uid, datetime.now().isoformat())
+            )
+
+    def close(self):
+        self._sync_stop.set()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Feature-2: Tiered Classifier
+Rules → cache → local model → LLM, escalating only when the cheaper tier isn't confident
+"""
+
+import time
+import threading
+from typing import Callable, Dict, List, Optional
+
+from rule_engine import RuleEngine
+from local_model import LocalTicketModel
+from classification_cache import ClassificationCache, content_key
+
+TIERS = ('rules', 'cache', 'local_model', 'llm', 'fallback')
+
+
+class TieredClassifier:
+    """Runs each email through progressively more expensive classifiers"""
+
+    def __init__(self, rule_engine: RuleEngine, cache: ClassificationCache,
+                 llm_classify_many: Callable[[List[Dict]], List[Optional[Dict]]],
+                 local_model: Optional[LocalTicketModel] = None,
+                 rule_threshold: float = 0.8, local_model_threshold: float = 0.75):
+        self.rule_engine = rule_engine
+        self.cache = cache
+        self.llm_classify_many = llm_classify_many
+        self.local_model = local_model
+        self.rule_threshold = rule_threshold
+        self.local_model_threshold = local_model_threshold
+
+        self._lock = threading.Lock()
+        self.tier_stats = {
+            tier: {'attempts': 0, 'hits': 0, 'total_ms': 0.0}
+            for tier in TIERS
+        }
+
+    def _record(self, tier: str, attempts: int, hits: int, elapsed_ms: float):
+        with self._lock:
+            stats = self.tier_stats[tier]
+            stats['attempts'] += attempts
+            stats['hits'] += hits
+            stats['total_ms'] += elapsed_ms
+
+    @staticmethod
+    def _tag(analysis: Dict, tier: str) -> Dict:
+        tagged = dict(analysis)
+        tagged['tier'] = tier
+        return tagged
+
+    def classify_many(self, emails: List[Dict]) -> List[Dict]:
+        """Classify a batch; every result carries the tier that produced it"""
+        analyses: List[Optional[Dict]] = [None] * len(emails)
+        rule_results: List[Dict] = []
+
+        # Tier 1: compiled rules
+        started = time.perf_counter()
+        remaining = []
+        for index, email_data in enumerate(emails):
+            rule_analysis = self.rule_engine.classify(email_data)
+            rule_results.append(rule_analysis)
+            if rule_analysis['confidence'] >= self.rule_threshold:
+                analyses[index] = self._tag(rule_analysis, 'rules')
+            else:
+                remaining.append(index)
+        self._record('rules', len(emails), len(emails) - len(remaining), (time.perf_counter() - started) * 1000)
+
+        # Tier 2: cached LLM answers for identical content
+        if remaining:
+            started = time.perf_counter()
+            still_remaining = []
+            for index in remaining:
+                cached = self.cache.get(emails[index])
+                if cached:
+                    analyses[index] = self._tag(cached, 'cache')
+                else:
+                    still_remaining.append(index)
+            self._record('cache', len(remaining), len(remaining) - len(still_remaining), (time.perf_counter() - started) * 1000)
+            remaining = still_remaining
+
+        # Tier 3: local TF-IDF + linear model
+        if remaining and self.local_model:
+            started = time.perf_counter()
+            still_remaining = []
+            try:
+                predictions = self.local_model.predict_many([emails[index] for index in remaining])
+            except Exception as e:
+                print(f"❌ Local model prediction failed: {e}")
+                predictions = [None] * len(remaining)
+            for index, prediction in zip(remaining, predictions):
+                if prediction and prediction['confidence'] >= self.local_model_threshold:
+                    analyses[index] = self._tag(prediction, 'local_model')
+                else:
+                    still_remaining.append(index)
+            self._record('local_model', len(remaining), len(remaining) - len(still_remaining), (time.perf_counter() - started) * 1000)
+            remaining = still_remaining
+
+        # Tier 4: remote LLM; identical content within the batch shares one call
+        if remaining:
+            pending: Dict[str, List[int]] = {}
+            for index in remaining:
+                pending.setdefault(content_key(emails[index]), []).append(index)
+            unique_emails = [emails[indexes[0]] for indexes in pending.values()]
+
+            started = time.perf_counter()
+            try:
+                results = self.llm_classify_many(unique_emails)
+            except Exception as e:
+                print(f"❌ AI analysis failed: {e}")
+                results = [None] * len(unique_emails)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+
+            hits = 0
+            for email_data, indexes, result in zip(unique_emails, pending.values(), results):
+                if not result:
+                    continue
+                hits += len(indexes)
+                self.cache.put(email_data, result)
+                for index in indexes:
+                    analyses[index] = self._tag(result, 'llm')
+            self._record('llm', len(remaining), hits, elapsed_ms)
+            try:
+                self.cache.save()
+            except Exception as e:
+                # The answers are already cached in memory; a failed write must not throw them away
+                print(f"⚠️ Could not save classification cache: {e}")
+
+        # Anything still unclassified gets the best rule guess
+        fallbacks = [index for index, analysis in enumerate(analyses) if analysis is None]
+        for index in fallbacks:
+            analyses[index] = self._tag(rule_results[index], 'fallback')
+        if fallbacks:
+            self._record('fallback', len(fallbacks), len(fallbacks), 0.0)
+
+        return analyses
+
+    def get_stats(self) -> Dict:
+        """Per-tier attempts, hit rate and average latency (for threshold tuning)"""
+        with self._lock:
+            stats = {}
+            for tier, values in self.tier_stats.items():
+                attempts = values['attempts']
+                stats[tier] = {
+                    'attempts': attempts,
+                    'hits': values['hits'],
+                    'hit_rate': round(values['hits'] / attempts, 3) if attempts else None,
+                    'avg_latency_ms': round(values['total_ms'] / attempts, 2) if attempts else None
+                }
+        stats['thresholds'] = {
+            'rules': self.rule_threshold,
+            'local_model': self.local_model_threshold if self.local_model else None
+        }
+        return stats
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Feature-2: UID Incremental Sync
+Persists UIDVALIDITY and the last processed UID so each cycle only fetches new mail
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+
+class UIDSyncState:
+    """On-disk UIDVALIDITY / high-water mark per account and mailbox"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read sync state {self.path}: {e} - starting fresh")
+            return {}
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._data, f, indent=2)
+        # Atomic replace so a crash never leaves a half-written state file
+        os.replace(tmp_path, self.path)
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._data.get(key)
+            return dict(entry) if entry else None
+
+    def set(self, key: str, uidvalidity: int, last_uid: int):
+        with self._lock:
+            self._data[key] = {
+                'uidvalidity': uidvalidity,
+                'last_uid': last_uid,
+                'updated_at': datetime.now().isoformat()
+            }
+            self._save()
+
+
+class StoreSyncState:
+    """Same interface as UIDSyncState, kept in the shared ticket store so any process can take over a mailbox"""
+
+    def __init__(self, store, fallback: Optional[UIDSyncState] = None):
+        self.store = store
+        # Marks written before switching to shared state are picked up from the old file once
+        self.fallback = fallback
+
+    def get(self, key: str) -> Optional[Dict]:
+        mark = self.store.get_sync_mark(key)
+        if mark is None and self.fallback is not None:
+            return self.fallback.get(key)
+        return mark
+
+    def set(self, key: str, uidvalidity: int, last_uid: int):
+        self.store.set_sync_mark(key, uidvalidity, last_uid)
+
+
+class UIDSyncEngine:
+    """Computes the UID range to fetch and advances the high-water mark as messages complete"""
+
+    def __init__(self, state: UIDSyncState, account: str, mailbox: str = 'INBOX', max_attempts: int = 3,
+                 fence: Optional[Callable[[], bool]] = None):
+        """fence: in scale-out mode, True only while this process still owns the mailbox"""
+        self.state = state
+        self.account = account
+        self.mailbox = mailbox
+        self.key = f"{account}/{mailbox}"
+        self.max_attempts = max(1, max_attempts)
+        self.fence = fence
+
+        self.uidvalidity: Optional[int] = None
+        self.last_uid = 0
+        self._pending: List[int] = []
+        self._completed = set()
+        # Unread mail found at the first sync, below the mark; returned until it has been processed
+        self._backlog: List[int] = []
+        # Failed attempts per UID; a message that keeps failing is dead-lettered so the mark can pass it
+        self._failures: Dict[int, int] = {}
+        self.dead_letters: List[int] = []
+        self._lock = threading.Lock()
+
+        self.reload()
+
+    def reload(self):
+        """Re-read the persisted mark (another process may have advanced it) and drop in-flight UIDs"""
+        saved = self.state.get(self.key)
+        with self._lock:
+            self.uidvalidity = saved.get('uidvalidity') if saved else None
+            self.last_uid = saved.get('last_uid', 0) if saved else 0
+            self._pending = []
+            self._completed.clear()
+            self._backlog = []
+            self._failures.clear()
+
+    @staticmethod
+    def _parse_code(mail, code: str) -> Optional[int]:
+        _, data = mail.response(code)
+        if data and data[-1]:
+            try:
+                return int(data[-1])
+            except (TypeError, ValueError):
+                return None
+        return None
+
+    def _current_max_uid(self, mail) -> int:
+        """Highest UID in the mailbox: UIDNEXT - 1 from the SELECT response, else the largest UID"""
+        uidnext = self._parse_code(mail, 'UIDNEXT')
+        if uidnext:
+            return uidnext - 1
+        status, data = mail.uid('SEARCH', None, 'ALL')
+        if status == 'OK' and data and data[0]:
+            return max(int(u) for u in data[0].split())
+        return 0
+
+    def find_new_uids(self, mail) -> List[int]:
+        """Re-select the mailbox and return unprocessed UIDs, oldest first"""
+        status, _ = mail.select(self.mailbox)
+        if status != 'OK':
+            return []
+        uidvalidity = self._parse_code(mail, 'UIDVALIDITY')
+
+        if self.uidvalidity is None or uidvalidity != self.uidvalidity:
+            # First run or mailbox was rebuilt: old UIDs are meaningless. The mark starts at the
+            # newest message (never 0, or "UID 1:*" would return the whole mailbox) and the unread
+            # mail below it becomes a one-off backlog; UNSEEN is not contiguous, so it can't be a mark
+            if self.uidvalidity is not None:
+                print(f"⚠️ UIDVALIDITY changed for {self.key} ({self.uidvalidity} → {uidvalidity}), resyncing unread mail")
+            max_uid = self._current_max_uid(mail)
+            status, data = mail.uid('SEARCH', None, 'UNSEEN')
+            unseen = sorted(int(u) for u in data[0].split()) if status == 'OK' and data and data[0] else []
+            with self._lock:
+                self.uidvalidity = uidvalidity
+                self.last_uid = max_uid
+                self._pending = []
+                self._completed.clear()
+                self._backlog = [uid for uid in unseen if uid <= max_uid]
+                backlog = list(self._backlog)
+            if not backlog:
+                self.state.set(self.key, self.uidvalidity, self.last_uid)
+            # Otherwise the mark is persisted once the backlog is done, so a restart re-reads UNSEEN
+            return backlog
+
+        # "n+1:*" always matches the newest message, even when it is <= n, so filter
+        status, data = mail.uid('SEARCH', None, f"UID {self.last_uid + 1}:*")
+        new_uids = []
+        if status == 'OK' and data and data[0]:
+            new_uids = sorted(u for u in (int(x) for x in data[0].split()) if u > self.last_uid)
+        with self._lock:
+            return list(self._backlog) + new_uids
+
+    def begin_batch(self, uids: Iterable[int]):
+        """Register the UIDs about to be processed this cycle"""
+        with self._lock:
+            # Backlog UIDs sit below the mark and never hold it back
+            above = {uid for uid in uids if uid > self.last_uid}
+            self._pending = sorted(above | set(self._pending))
+            self._completed &= set(self._pending)
+
+    def complete(self, uid: int):
+        """Mark a UID done; persist the high-water mark once every lower UID is done too"""
+        with self._lock:
+            self._failures.pop(uid, None)
+            if uid <= self.last_uid:
+                if uid not in self._backlog:
+                    return
+                self._backlog.remove(uid)
+                # Backlog finished: the mark seeded at the first sync can be persisted now
+                advanced = not self._backlog
+            else:
+                self._completed.add(uid)
+                advanced = False
+                while self._pending and self._pending[0] in self._completed:
+                    done = self._pending.pop(0)
+                    self._completed.discard(done)
+                    self.last_uid = max(self.last_uid, done)
+                    advanced = True
+            last_uid = self.last_uid
+            persist = advanced and not self._backlog
+        if persist:
+            if self.fence is not None and not self.fence():
+                # Lease lost mid-batch: the new owner resumes from the last mark this process persisted
+                print(f"🔒 Not advancing {self.key} to UID {last_uid}: mailbox lease no longer held")
+                return
+            self.state.set(self.key, self.uidvalidity, last_uid)
+
+    def fail(self, uid: int, error: object = None) -> bool:
+        """Record a failed attempt; after max_attempts the UID is dead-lettered (completed unprocessed)
+
+        Returns True if it was dead-lettered. Until then it stays pending and is retried next cycle.
+        """
+        with self._lock:
+            attempts = self._failures.get(uid, 0) + 1
+            self._failures[uid] = attempts
+            if attempts < self.max_attempts:
+                return False
+            self.dead_letters = (self.dead_letters + [uid])[-50:]
+        print(f"☠️ UID {uid} in {self.key} failed {attempts} times ({error}), skipping it")
+        self.complete(uid)
+        return True
+
+    def get_status(self) -> Dict:
+        with self._lock:
+            return {
+                'mailbox': self.key,
+                'uidvalidity': self.uidvalidity,
+                'last_uid': self.last_uid,
+                'pending_uids': len(self._pending),
+                'initial_backlog': len(self._backlog),
+                'failing_uids': len(self._failures),
+                'dead_letters': list(self.dead_letters)
+            }